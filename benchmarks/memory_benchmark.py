@@ -0,0 +1,59 @@
+# Copyright 2018 Inap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the memory used by the switch configuration objects.
+
+    python benchmarks/memory_benchmark.py [count]
+
+Prints the number of bytes allocated per object, as seen by tracemalloc.
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from fake_switches.switch_configuration import Port, VlanPort, AggregatedPort, Vlan, VRRP, Route
+
+
+def measure(factory, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    allocated -= sys.getsizeof(objects)
+    return allocated / float(count)
+
+
+BENCHMARKS = [
+    ("Port", lambda i: Port("FastEthernet0/{}".format(i))),
+    ("VlanPort", lambda i: VlanPort(i, "vlan{}".format(i))),
+    ("AggregatedPort", lambda i: AggregatedPort("Port-channel{}".format(i))),
+    ("Vlan", lambda i: Vlan(i, "vlan{}".format(i))),
+    ("VRRP", lambda i: VRRP(i)),
+    ("Route", lambda i: Route("10.0.0.0", "255.255.255.0", "1.1.1.1")),
+]
+
+
+def main(count):
+    for name, factory in BENCHMARKS:
+        print("{:<16} {:>8.0f} bytes per object".format(name, measure(factory, count)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -24,6 +24,7 @@ from fake_switches.arista.command_processor.enabled import EnabledCommandProcess
 from fake_switches.arista.command_processor.terminal_display import TerminalDisplay
 from fake_switches.arista.eapi import EAPI
 from fake_switches.command_processing.piping_processor_base import NotPipingProcessor
+from fake_switches.command_processing.processor_stack_pool import ProcessorStackPool
 from fake_switches.command_processing.shell_session import ShellSession
 from fake_switches.switch_configuration import Port
 from fake_switches.switch_core import SwitchCore
@@ -37,22 +38,21 @@ class AristaSwitchCore(SwitchCore):
         self.switch_configuration.add_vlan(self.switch_configuration.new("Vlan", 1))
 
         self.logger = None
-        self.last_connection_id = 0
+        self.processor_stacks = {}
 
     def launch(self, protocol, terminal_controller):
-        self.last_connection_id += 1
+        self.logger = self.new_connection_logger("arista", protocol)
 
-        self.logger = logging.getLogger("fake_switches.arista.{}.{}.{}"
-                                        .format(self.switch_configuration.name, self.last_connection_id, protocol))
-
-        processor = self.processor_stack(display=TerminalDisplay())
+        processor_stacks = self.processor_stack_pool(TerminalDisplay)
+        processor = processor_stacks.acquire()
 
         processor.init(self.switch_configuration,
-                       LoggingTerminalController(self.logger, terminal_controller),
+                       LoggingTerminalController(self.logger, terminal_controller,
+                                                 self.switch_configuration.log_payload_limit),
                        self.logger,
                        NotPipingProcessor())
 
-        return AristaShellSession(processor)
+        return AristaShellSession(processor, on_close=processor_stacks.release)
 
     @staticmethod
     def get_default_ports():
@@ -72,6 +72,12 @@ class AristaSwitchCore(SwitchCore):
             )
         )
 
+    def processor_stack_pool(self, display_class):
+        if display_class not in self.processor_stacks:
+            self.processor_stacks[display_class] = ProcessorStackPool(
+                lambda: self.processor_stack(display=display_class()))
+        return self.processor_stacks[display_class]
+
     def get_netconf_protocol(self):
         return None
 
@@ -79,7 +85,7 @@ class AristaSwitchCore(SwitchCore):
         root = resource.Resource()
         root.putChild(b'command-api', EAPI(
             switch_configuration=self.switch_configuration,
-            processor_stack_factory=self.processor_stack,
+            processor_stack_pool=self.processor_stack_pool,
             logger=logging.getLogger("fake_switches.arista.{}.eapi".format(self.switch_configuration.name))
         ))
         return root
@@ -23,6 +23,10 @@ class AristaBaseCommandProcessor(BaseCommandProcessor):
     def __init__(self, display):
         self.display = display
 
+    def reset(self):
+        super(AristaBaseCommandProcessor, self).reset()
+        self.display.reset()
+
     def read_vlan_number(self, input):
         try:
             number = int(input)
@@ -16,6 +16,9 @@ from fake_switches.switch_configuration import split_port_name
 
 
 class TerminalDisplay(object):
+    def reset(self):
+        pass
+
     def invalid_command(self, processor, message, json_data=None):
         self._error(processor, message)
 
@@ -14,30 +14,32 @@
 
 import json
 
-from twisted.web import resource
+from twisted.internet import defer
+from twisted.web import resource, server
 
 from fake_switches.arista.command_processor.terminal_display import TerminalDisplay
 from fake_switches.command_processing.piping_processor_base import NotPipingProcessor
-from fake_switches.terminal import TerminalController
+from fake_switches.terminal import BufferingTerminalController
 
 
 class EAPI(resource.Resource, object):
     isLeaf = True
 
-    def __init__(self, switch_configuration, processor_stack_factory, logger):
+    def __init__(self, switch_configuration, processor_stack_pool, logger):
         super(EAPI, self).__init__()
 
         self.switch_configuration = switch_configuration
-        self.processor_stack_factory = processor_stack_factory
+        self.processor_stack_pool = processor_stack_pool
         self.logger = logger
 
     def render_POST(self, request):
         content = json.loads(request.content.read().decode())
-        self.logger.info("Request in: {}".format(content))
+        self.logger.info("Request in: %s", content)
 
         driver = driver_for(content["params"]["format"])
 
-        command_processor = self.processor_stack_factory(display=driver.display_class())
+        processor_stacks = self.processor_stack_pool(driver.display_class)
+        command_processor = processor_stacks.acquire()
         command_processor.init(
             switch_configuration=self.switch_configuration,
             terminal_controller=BufferingTerminalController(),
@@ -50,28 +52,57 @@ class EAPI(resource.Resource, object):
             "id": content["id"],
         }
 
-        command_index = 1
-        command_results = []
+        response = []
+        execution = defer.maybeDeferred(self._execute, command_processor, driver, content["params"]["cmds"], [],
+                                        result)
+        execution.addBoth(_released, processor_stacks, command_processor)
+        execution.addCallback(lambda _: response.append(json.dumps(result).encode()))
+        if response:
+            return response[0]
+
+        execution.addCallback(lambda _: (request.write(response[0]), request.finish()))
+        execution.addErrback(self._failed, request)
+        return server.NOT_DONE_YET
+
+    def _execute(self, command_processor, driver, cmds, command_results, result):
         try:
-            for cmd in content["params"]["cmds"]:
-                command_processor.process_command(cmd)
+            while len(command_results) < len(cmds):
+                command_processor.process_command(cmds[len(command_results)])
+                command_in_progress = command_processor.command_in_progress()
+                if command_in_progress is not None:
+                    return command_in_progress.addCallback(
+                        self._command_completed, command_processor, driver, cmds, command_results, result)
                 command_results.append(driver.format_output(command_processor))
-                command_index += 1
             result["result"] = command_results
         except CommandProcessorError as e:
+            command_index = len(command_results) + 1
             command_results.append(driver.format_errors([str(e)], base_obj=e.json_data))
             result["error"] = {
                 "data": command_results,
                 "message": "CLI command {index} of {count} '{cmd}' failed: {error}".format(
                     index=command_index,
-                    count=len(content["params"]["cmds"]),
-                    cmd=content["params"]["cmds"][command_index - 1],
+                    count=len(cmds),
+                    cmd=cmds[command_index - 1],
                     error=e.error
                 ),
                 "code": e.code
             }
 
-        return json.dumps(result).encode()
+        return defer.succeed(result)
+
+    def _command_completed(self, _, command_processor, driver, cmds, command_results, result):
+        command_results.append(driver.format_output(command_processor))
+        return self._execute(command_processor, driver, cmds, command_results, result)
+
+    def _failed(self, failure, request):
+        self.logger.error("Request failed: %s", failure.getTraceback())
+        request.setResponseCode(500)
+        request.finish()
+
+
+def _released(result, processor_stacks, command_processor):
+    processor_stacks.release(command_processor)
+    return result
 
 
 def driver_for(format):
@@ -105,6 +136,9 @@ class JsonDisplay(object):
     def __init__(self, *_):
         self.display_object = None
 
+    def reset(self):
+        self.display_object = None
+
     def invalid_command(self, processor, message, json_data=None):
         raise InvalidCommand(message, json_data=json_data)
 
@@ -145,20 +179,6 @@ class TextDriver(object):
         raise NotImplementedError
 
 
-class BufferingTerminalController(TerminalController):
-
-    def __init__(self):
-        self.buffer = ""
-
-    def pop(self):
-        buffer = self.buffer
-        self.buffer = ""
-        return buffer
-
-    def write(self, text):
-        self.buffer += text
-
-
 def strip_prompt(command_processor, content):
     prompt = command_processor.get_prompt()
     return content[:-len(prompt)]
@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import logging
-
 from fake_switches import switch_core
 from fake_switches.brocade.command_processor.config import ConfigCommandProcessor
 from fake_switches.brocade.command_processor.config_interface import ConfigInterfaceCommandProcessor
@@ -25,6 +23,7 @@ from fake_switches.brocade.command_processor.config_vrf import ConfigVrfCommandP
 from fake_switches.brocade.command_processor.default import DefaultCommandProcessor
 from fake_switches.brocade.command_processor.enabled import EnabledCommandProcessor
 from fake_switches.brocade.command_processor.piping import PipingProcessor
+from fake_switches.command_processing.processor_stack_pool import ProcessorStackPool
 from fake_switches.command_processing.shell_session import ShellSession
 from fake_switches.switch_configuration import Port
 from fake_switches.terminal import LoggingTerminalController
@@ -35,15 +34,22 @@ class BrocadeSwitchCore(switch_core.SwitchCore):
         super(BrocadeSwitchCore, self).__init__(switch_configuration)
         self.switch_configuration.add_vlan(self.switch_configuration.new("Vlan", 1))
         self.logger = None
-        self.last_connection_id = 0
+        self.processor_stacks = ProcessorStackPool(self.new_processor_stack)
 
     def launch(self, protocol, terminal_controller):
-        self.last_connection_id += 1
+        self.logger = self.new_connection_logger("brocade", protocol)
+
+        command_processor = self.processor_stacks.acquire()
+        command_processor.init(switch_configuration=self.switch_configuration,
+                               terminal_controller=LoggingTerminalController(self.logger, terminal_controller,
+                                                                             self.switch_configuration.log_payload_limit),
+                               piping_processor=PipingProcessor(self.logger),
+                               logger=self.logger)
 
-        self.logger = logging.getLogger(
-            "fake_switches.brocade.%s.%s.%s" % (self.switch_configuration.name, self.last_connection_id, protocol))
+        return BrocadeShellSession(command_processor, on_close=self.processor_stacks.release)
 
-        command_processor = DefaultCommandProcessor(
+    def new_processor_stack(self):
+        return DefaultCommandProcessor(
             enabled=EnabledCommandProcessor(
                 config=ConfigCommandProcessor(
                     config_vlan=ConfigVlanCommandProcessor(),
@@ -54,12 +60,6 @@ class BrocadeSwitchCore(switch_core.SwitchCore):
                     )
                 )
             ))
-        command_processor.init(switch_configuration=self.switch_configuration,
-                               terminal_controller=LoggingTerminalController(self.logger, terminal_controller),
-                               piping_processor=PipingProcessor(self.logger),
-                               logger=self.logger)
-
-        return BrocadeShellSession(command_processor)
 
     def get_netconf_protocol(self):
         return None
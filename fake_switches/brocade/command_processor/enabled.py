@@ -17,11 +17,16 @@ import re
 from fake_switches import group_sequences
 from fake_switches.brocade.command_processor import explain_missing_port
 from fake_switches.command_processing.base_command_processor import BaseCommandProcessor
+from fake_switches.command_processing.command_tree import command
+from fake_switches.command_processing.output_cache import cached_output
+from fake_switches.command_processing.running_config import RunningConfig
 from fake_switches.command_processing.switch_tftp_parser import SwitchTftpParser
 from fake_switches.switch_configuration import split_port_name, VlanPort
 
 
 class EnabledCommandProcessor(BaseCommandProcessor):
+    command_error_format = "Error: {}"
+
     def __init__(self, config):
         super(EnabledCommandProcessor, self).__init__()
         self.config_processor = config
@@ -33,62 +38,43 @@ class EnabledCommandProcessor(BaseCommandProcessor):
         self.move_to(self.config_processor)
 
     def do_show(self, *args):
-        if "running-config".startswith(args[0]):
-            if "vlan".startswith(args[1]):
-                self.show_run_vlan()
-            if "interface".startswith(args[1]):
-                self.show_run_int(args)
-        elif "interfaces".startswith(args[0]):
-            self.show_int(args)
-        elif "vlan".startswith(args[0]):
-            if args[1].isdigit():
-                self._show_vlan(int(args[1]))
-            elif "brief".startswith(args[1]):
-                self.show_vlan_brief()
-            elif "ethernet".startswith(args[1]):
-                self.show_vlan_int(args)
-            else:
-                self.write_line("Invalid input -> %s" % args[1])
-                self.write_line("Type ? for a list")
-        elif "ip".startswith(args[0]) and "route".startswith(args[1]) and "static".startswith(args[2]):
-            routes = self.switch_configuration.static_routes
-            if routes:
-                self.write_line("        Destination        Gateway        Port          Cost          Type Uptime src-vrf")
-            for n, route in enumerate(routes):
-                self.write_line("{index:<8}{destination:<18} {next_hop:}".format(index=n+1, destination=str(route.dest), next_hop=str(route.next_hop)))
-            self.write_line("")
-        elif "version".startswith(args[0]):
-            self.show_version()
+        pass
 
     def do_ncopy(self, protocol, url, filename, target):
         try:
             SwitchTftpParser(self.switch_configuration).parse(url, filename, self.config_processor)
             self.write_line("done")
         except Exception as e:
-            self.logger.warning("tftp parsing went wrong : %s" % str(e))
+            self.logger.warning("tftp parsing went wrong : %s", e)
             self.write_line("%s: Download to %s failed - Session timed out" % (protocol.upper(), target))
 
     def do_skip_page_display(self, *args):
         pass
 
     def do_write(self, *args):
-        self.switch_configuration.commit()
+        self.wait_for(self.switch_configuration.commit())
 
     def do_exit(self):
         self.is_done = True
 
+    @command("show", "running-config", "vlan")
+    @cached_output
     def show_run_vlan(self):
-        self.write_line("spanning-tree")
-        self.write_line("!")
-        self.write_line("!")
+        self.write_chunks(RunningConfig(self.running_config_vlan_fragments()).chunks())
+
+    def running_config_vlan_fragments(self):
+        yield ["spanning-tree", "!", "!"]
         for vlan in sorted(self.switch_configuration.vlans, key=lambda v: v.number):
             if vlan_name(vlan):
-                self.write_line("vlan %d name %s" % (vlan.number, vlan_name(vlan)))
+                data = ["vlan %d name %s" % (vlan.number, vlan_name(vlan))]
             else:
-                self.write_line("vlan %d" % vlan.number)
+                data = ["vlan %d" % vlan.number]
 
             untagged_ports = []
-            for port in self.switch_configuration.ports:
+            memberships = [("access", vlan.number), ("native", vlan.number)]
+            if vlan.number == 1:
+                memberships.append(("access", None))
+            for port in self.switch_configuration.get_vlan_members(*memberships):
                 if not isinstance(port, VlanPort):
                     if vlan.number == 1 and port.access_vlan is None and port.trunk_native_vlan is None:
                         untagged_ports.append(port)
@@ -97,56 +83,48 @@ class EnabledCommandProcessor(BaseCommandProcessor):
 
             if len(untagged_ports) > 0:
                 if vlan.number == 1:
-                    self.write_line(" no untagged %s" % to_port_ranges(untagged_ports))
+                    data.append(" no untagged %s" % to_port_ranges(untagged_ports))
                 else:
-                    self.write_line(" untagged %s" % to_port_ranges(untagged_ports))
+                    data.append(" untagged %s" % to_port_ranges(untagged_ports))
 
-            tagged_ports = [p for p in self.switch_configuration.ports if
-                            p.trunk_vlans and vlan.number in p.trunk_vlans]
+            tagged_ports = self.switch_configuration.get_vlan_members(("tagged", vlan.number))
             if tagged_ports:
-                self.write_line(" tagged %s" % to_port_ranges(tagged_ports))
+                data.append(" tagged %s" % to_port_ranges(tagged_ports))
 
             vif = self.get_interface_vlan_for(vlan)
             if vif is not None:
-                self.write_line(" router-interface %s" % vif.name)
+                data.append(" router-interface %s" % vif.name)
 
-            self.write_line("!")
-        self.write_line("!")
-        self.write_line("")
+            yield data + ["!"]
+        yield ["!", ""]
 
-    def show_run_int(self, args):
+    @command("show", "running-config", "interface")
+    def show_run_int(self, *args):
         port_list = []
-        if len(args) < 3:
+        if not args:
             port_list = sorted(self.switch_configuration.ports, key=lambda e: ("a" if not isinstance(e, VlanPort) else "b") + e.name)
         else:
-            if "ve".startswith(args[2]):
-                port = self.switch_configuration.get_port_by_partial_name(" ".join(args[2:]))
+            if "ve".startswith(args[0]):
+                port = self.switch_configuration.get_port_by_partial_name(" ".join(args))
                 if not port:
-                    self.write_line("Error - %s was not configured" % " ".join(args[2:]))
+                    self.write_line("Error - %s was not configured" % " ".join(args))
                 else:
                     port_list = [port]
             else:
-                port_type, port_number = split_port_name("".join(args[2:]))
+                port_type, port_number = split_port_name("".join(args))
                 port = self.switch_configuration.get_port_by_partial_name(port_number)
                 if not port:
                     self.write_line("")
                 else:
                     port_list = [port]
         if len(port_list) > 0:
-            for port in port_list:
-                attributes = get_port_attributes(port)
-                if len(attributes) > 0 or isinstance(port, VlanPort):
-                    self.write_line("interface %s" % port.name)
-                    for a in attributes:
-                        self.write_line(" " + a)
-                    self.write_line("!")
-
-            self.write_line("")
+            self.write_chunks(RunningConfig(running_interface_fragments(port_list)).chunks())
 
-    def show_int(self, args):
+    @command("show", "interfaces")
+    def show_int(self, *args):
         ports = []
-        port_name = " ".join(args[1:])
-        if len(args) > 1:
+        port_name = " ".join(args)
+        if args:
             port = self.switch_configuration.get_port_by_partial_name(port_name)
             if port:
                 ports.append(port)
@@ -178,21 +156,24 @@ class EnabledCommandProcessor(BaseCommandProcessor):
                 else:
                     self.write_line("  No port name")
 
+    @command("show", "vlan", "brief")
+    @cached_output
     def show_vlan_brief(self):
         self.write_line("")
         self.write_line("VLAN     Name       Encap ESI                              Ve    Pri Ports")
         self.write_line("----     ----       ----- ---                              ----- --- -----")
         for vlan in sorted(self.switch_configuration.vlans, key=lambda v: v.number):
-            ports = [port for port in self.switch_configuration.ports
-                     if port.access_vlan == vlan.number or (port.access_vlan is None and vlan.number == 1)]
+            memberships = [("access", vlan.number)] + ([("access", None)] if vlan.number == 1 else [])
+            ports = self.switch_configuration.get_vlan_members(*memberships)
             self.write_line("%-4s     %-10s                                        -     -%s" % (
                 vlan.number,
                 vlan_name(vlan)[:10] if vlan_name(vlan) else "[None]",
                 ("   Untagged Ports : %s" % to_port_ranges(ports)) if ports else ""
             ))
 
-    def show_vlan_int(self, args):
-        port = self.switch_configuration.get_port_by_partial_name(" ".join(args[1:]))
+    @command("show", "vlan", "ethernet")
+    def show_vlan_int(self, *args):
+        port = self.switch_configuration.get_port_by_partial_name(" ".join(("ethernet",) + args))
         if port:
             untagged_vlan = port.access_vlan or (port.trunk_native_vlan if port.trunk_native_vlan != 1 else None)
             if untagged_vlan is None and port.trunk_vlans is None:
@@ -207,9 +188,26 @@ class EnabledCommandProcessor(BaseCommandProcessor):
                 if untagged_vlan is not None:
                     self.write_line("VLAN: %s  Untagged" % untagged_vlan)
         else:
-            self.write_line("Invalid input -> %s" % args[2])
+            self.write_line("Invalid input -> %s" % args[0])
             self.write_line("Type ? for a list")
 
+    @command("show", "vlan")
+    def show_vlan(self, *args):
+        if args[0].isdigit():
+            self._show_vlan(int(args[0]))
+        else:
+            self.write_line("Invalid input -> %s" % args[0])
+            self.write_line("Type ? for a list")
+
+    @command("show", "ip", "route", "static")
+    def show_ip_route_static(self):
+        routes = self.switch_configuration.static_routes
+        if routes:
+            self.write_line("        Destination        Gateway        Port          Cost          Type Uptime src-vrf")
+        for n, route in enumerate(routes):
+            self.write_line("{index:<8}{destination:<18} {next_hop:}".format(index=n+1, destination=str(route.dest), next_hop=str(route.next_hop)))
+        self.write_line("")
+
     def _show_vlan(self, vlan_id):
         vlan = self.switch_configuration.get_vlan(vlan_id)
         if vlan is None:
@@ -261,6 +259,7 @@ class EnabledCommandProcessor(BaseCommandProcessor):
                      if isinstance(p, VlanPort) and p.vlan_id == vlan.number),
                     None)
 
+    @command("show", "version")
     def show_version(self):
         self.write_line("System: NetIron CER (Serial #: 1P2539K036,  Part #: 40-1000617-02)")
         self.write_line("License: RT_SCALE, ADV_SVCS_PREM (LID: XXXXXXXXXX)")
@@ -284,15 +283,25 @@ class EnabledCommandProcessor(BaseCommandProcessor):
 
     def get_interface_ports_for(self, vlan):
         vlan_ports = {"tagged": [], "untagged": []}
-        for port in self.switch_configuration.ports:
+        members = self.switch_configuration.get_vlan_members(
+            ("access", vlan.number), ("native", vlan.number), ("tagged", vlan.number))
+        for port in members:
             if not isinstance(port, VlanPort):
                 if port.access_vlan == vlan.number or port.trunk_native_vlan == vlan.number:
                     vlan_ports["untagged"].append(port)
-                elif port.trunk_vlans and vlan.number in port.trunk_vlans:
+                else:
                     vlan_ports["tagged"].append(port)
         return vlan_ports
 
 
+def running_interface_fragments(ports):
+    for port in ports:
+        attributes = get_port_attributes(port)
+        if len(attributes) > 0 or isinstance(port, VlanPort):
+            yield ["interface %s" % port.name] + [" " + a for a in attributes] + ["!"]
+    yield [""]
+
+
 def port_index(port):
     return int(re.match(".*(\d)$", port.name).groups()[0])
 
@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import logging
-
 from fake_switches import switch_core
 from fake_switches.cisco.command_processor.config import ConfigCommandProcessor
 from fake_switches.cisco.command_processor.config_interface import ConfigInterfaceCommandProcessor
@@ -22,6 +20,7 @@ from fake_switches.cisco.command_processor.config_vrf import ConfigVRFCommandPro
 from fake_switches.cisco.command_processor.default import DefaultCommandProcessor
 from fake_switches.cisco.command_processor.enabled import EnabledCommandProcessor
 from fake_switches.cisco.command_processor.piping import PipingProcessor
+from fake_switches.command_processing.processor_stack_pool import ProcessorStackPool
 from fake_switches.command_processing.shell_session import ShellSession
 from fake_switches.switch_configuration import Port
 from fake_switches.terminal import LoggingTerminalController
@@ -33,24 +32,25 @@ class BaseCiscoSwitchCore(switch_core.SwitchCore):
         self.switch_configuration.add_vlan(self.switch_configuration.new("Vlan", 1))
 
         self.logger = None
-        self.last_connection_id = 0
+        self.processor_stacks = ProcessorStackPool(self.new_processor_stack)
 
     def launch(self, protocol, terminal_controller):
-        self.last_connection_id += 1
-
-        self.logger = logging.getLogger(
-            "fake_switches.cisco.%s.%s.%s" % (self.switch_configuration.name, self.last_connection_id, protocol))
-
-        processor = self.new_command_processor()
-        if not self.switch_configuration.auto_enabled:
-            processor = DefaultCommandProcessor(processor)
+        self.logger = self.new_connection_logger("cisco", protocol)
 
+        processor = self.processor_stacks.acquire()
         processor.init(
             self.switch_configuration,
-            LoggingTerminalController(self.logger, terminal_controller),
+            LoggingTerminalController(self.logger, terminal_controller,
+                                      self.switch_configuration.log_payload_limit),
             self.logger,
             PipingProcessor(self.logger))
-        return CiscoShellSession(processor)
+        return CiscoShellSession(processor, on_close=self.processor_stacks.release)
+
+    def new_processor_stack(self):
+        processor = self.new_command_processor()
+        if not self.switch_configuration.auto_enabled:
+            processor = DefaultCommandProcessor(processor)
+        return processor
 
     def new_command_processor(self):
         raise NotImplementedError
@@ -17,6 +17,7 @@ from netaddr.ip import IPAddress
 
 from fake_switches.command_processing.base_command_processor import BaseCommandProcessor
 from fake_switches.switch_configuration import VlanPort
+from fake_switches.vlan_set import all_vlans
 
 
 class ConfigInterfaceCommandProcessor(BaseCommandProcessor):
@@ -40,7 +41,7 @@ class ConfigInterfaceCommandProcessor(BaseCommandProcessor):
                 self.port.trunk_vlans += parse_vlan_list(args[4])
         elif args[0:4] == ("trunk", "allowed", "vlan", "remove"):
             if self.port.trunk_vlans is None:
-                self.port.trunk_vlans = list(range(1, 4097))
+                self.port.trunk_vlans = all_vlans()
             for v in parse_vlan_list(args[4]):
                 if v in self.port.trunk_vlans:
                     self.port.trunk_vlans.remove(v)
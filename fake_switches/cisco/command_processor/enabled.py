@@ -18,8 +18,12 @@ from functools import partial
 
 from fake_switches import group_sequences
 from fake_switches.command_processing.base_command_processor import BaseCommandProcessor
+from fake_switches.command_processing.command_tree import command
+from fake_switches.command_processing.output_cache import cached_output
+from fake_switches.command_processing.running_config import RunningConfig
 from fake_switches.command_processing.switch_tftp_parser import SwitchTftpParser
 from fake_switches.switch_configuration import VlanPort, AggregatedPort
+from fake_switches.vlan_set import VlanSet, MAX_VLAN
 
 
 class EnabledCommandProcessor(BaseCommandProcessor):
@@ -38,138 +42,145 @@ class EnabledCommandProcessor(BaseCommandProcessor):
         self.move_to(self.config_processor)
 
     def do_show(self, *args):
-        if "running-config".startswith(args[0]):
-            if len(args) < 2:
-                self.show_run()
-            elif "vlan".startswith(args[1]):
-                self.write_line("Building configuration...")
-                self.write_line("")
-                self.write_line("Current configuration:")
-                for vlan in self.switch_configuration.vlans:
-                    if vlan.number == int(args[2]):
-                        self.write_line("\n".join(["!"] + build_running_vlan(vlan)))
-                self.write_line("end")
-                self.write_line("")
-            elif "interface".startswith(args[1]):
-                if_name = "".join(args[2:])
-                port = self.switch_configuration.get_port_by_partial_name(if_name)
+        pass
 
-                if port:
-                    self.write_line("Building configuration...")
-                    self.write_line("")
+    @command("show", "running-config", "vlan")
+    def show_running_config_vlan(self, number):
+        self.write_line("Building configuration...")
+        self.write_line("")
+        self.write_line("Current configuration:")
+        for vlan in self.switch_configuration.vlans:
+            if vlan.number == int(number):
+                self.write_line("\n".join(["!"] + build_running_vlan(vlan)))
+        self.write_line("end")
+        self.write_line("")
 
-                    data = ["!"] + build_running_interface(port) + ["end", ""]
+    @command("show", "running-config", "interface")
+    def show_running_config_interface(self, *args):
+        if_name = "".join(args)
+        port = self.switch_configuration.get_port_by_partial_name(if_name)
 
-                    self.write_line("Current configuration : %i bytes" % (len("\n".join(data)) + 1))
-                    [self.write_line(l) for l in data]
-                else:
-                    self.write_line("                               ^")
-                    self.write_line("% Invalid input detected at '^' marker.")
-                    self.write_line("")
+        if port:
+            self.write_line("Building configuration...")
+            self.write_line("")
+
+            data = ["!"] + build_running_interface(port) + ["end", ""]
+
+            self.write_line("Current configuration : %i bytes" % (len("\n".join(data)) + 1))
+            [self.write_line(l) for l in data]
+        else:
+            self.write_line("                               ^")
+            self.write_line("% Invalid input detected at '^' marker.")
+            self.write_line("")
 
-        elif "vlan".startswith(args[0]):
+    @command("show", "vlan")
+    @cached_output
+    def show_vlan(self, *args):
+        self.write_line("")
+        self.write_line("VLAN Name                             Status    Ports")
+        self.write_line("---- -------------------------------- --------- -------------------------------")
+        for vlan in sorted(self.switch_configuration.vlans, key=lambda v: v.number):
+            memberships = [("access", vlan.number)] + ([("access", None)] if vlan.number == 1 else [])
+            ports = [port.get_subname(length=2) for port in self.switch_configuration.get_vlan_members(*memberships)
+                     if not isinstance(port, (VlanPort, AggregatedPort))]
+            formatted_membership = []
+            if ports:
+                ports_membership = ["    {}".format(l) for l in get_port_groups(ports, max_line_length=30)]
+                formatted_membership.append(ports_membership.pop(0))
+                for remaining_line in ports_membership:
+                    formatted_membership.append(' ' * 44 + remaining_line)
+
+            self.write_line("%-4s %-32s %s%s" % (
+                vlan.number,
+                vlan_display_name(vlan),
+                "active",
+                '\n'.join(formatted_membership)
+            ))
+        if not args:
             self.write_line("")
-            self.write_line("VLAN Name                             Status    Ports")
-            self.write_line("---- -------------------------------- --------- -------------------------------")
+            self.write_line("VLAN Type  SAID       MTU   Parent RingNo BridgeNo Stp  BrdgMode Trans1 Trans2")
+            self.write_line("---- ----- ---------- ----- ------ ------ -------- ---- -------- ------ ------")
             for vlan in sorted(self.switch_configuration.vlans, key=lambda v: v.number):
-                ports = [port.get_subname(length=2) for port in self.switch_configuration.get_physical_ports()
-                         if port.access_vlan == vlan.number or (vlan.number == 1 and port.access_vlan is None)]
-                formatted_membership = []
-                if ports:
-                    ports_membership = ["    {}".format(l) for l in get_port_groups(ports, max_line_length=30)]
-                    formatted_membership.append(ports_membership.pop(0))
-                    for remaining_line in ports_membership:
-                        formatted_membership.append(' ' * 44 + remaining_line)
-
-                self.write_line("%-4s %-32s %s%s" % (
-                    vlan.number,
-                    vlan_display_name(vlan),
-                    "active",
-                    '\n'.join(formatted_membership)
-                ))
-            if len(args) == 1:
-                self.write_line("")
-                self.write_line("VLAN Type  SAID       MTU   Parent RingNo BridgeNo Stp  BrdgMode Trans1 Trans2")
-                self.write_line("---- ----- ---------- ----- ------ ------ -------- ---- -------- ------ ------")
-                for vlan in sorted(self.switch_configuration.vlans, key=lambda v: v.number):
-                    self.write_line("%-4s enet  10%04d     1500  -      -      -        -    -        0      0" % (vlan.number, vlan.number))
-                self.write_line("")
-                self.write_line("Remote SPAN VLANs")
-                self.write_line("------------------------------------------------------------------------------")
-                self.write_line("")
-                self.write_line("")
-                self.write_line("Primary Secondary Type              Ports")
-                self.write_line("------- --------- ----------------- ------------------------------------------")
-                self.write_line("")
-        elif "etherchannel".startswith(args[0]) and len(args) == 2 and "summary".startswith(args[1]):
-            ports = sorted(self.switch_configuration.ports, key=lambda x: x.name)
-            port_channels = sorted(
-                [p for p in ports if isinstance(p, AggregatedPort)],
-                key=port_channel_number)
-            self.write_line("Flags:  D - down        P - bundled in port-channel")
-            self.write_line("        I - stand-alone s - suspended")
-            self.write_line("        H - Hot-standby (LACP only)")
-            self.write_line("        R - Layer3      S - Layer2")
-            self.write_line("        U - in use      f - failed to allocate aggregator")
-            self.write_line("")
-            self.write_line("        M - not in use, minimum links not met")
-            self.write_line("        u - unsuitable for bundling")
-            self.write_line("        w - waiting to be aggregated")
-            self.write_line("        d - default port")
+                self.write_line("%-4s enet  10%04d     1500  -      -      -        -    -        0      0" % (vlan.number, vlan.number))
             self.write_line("")
+            self.write_line("Remote SPAN VLANs")
+            self.write_line("------------------------------------------------------------------------------")
             self.write_line("")
-            self.write_line("Number of channel-groups in use: {}".format(len(port_channels)))
-            self.write_line("Number of aggregators:           {}".format(len(port_channels)))
             self.write_line("")
-            self.write_line("Group  Port-channel  Protocol    Ports")
-            self.write_line("------+-------------+-----------+-----------------------------------------------")
-            for port_channel in port_channels:
-                members = [short_name(p) for p in ports
-                           if p.aggregation_membership == port_channel.name]
-                self.write_line(
-                    "{: <6} {: <13} {: <11} {}".format(
-                        port_channel_number(port_channel),
-                        "{}(S{})".format(short_name(port_channel), "U" if members else ""),
-                        "  LACP",
-                        "  ".join("{}(P)".format(m) for m in members)))
+            self.write_line("Primary Secondary Type              Ports")
+            self.write_line("------- --------- ----------------- ------------------------------------------")
             self.write_line("")
-        elif "ip".startswith(args[0]):
-            if "interface".startswith(args[1]):
-                if_list = None
-                if len(args) > 2:
-                    interface = self.switch_configuration.get_port_by_partial_name("".join(args[2:]))
-                    if interface:
-                        if_list = [interface]
-                    else:
-                        self.write_line("                                 ^")
-                        self.write_line("% Invalid input detected at '^' marker.")
-                        self.write_line("")
-                else:
-                    if_list = self.switch_configuration.get_vlan_ports() + self.switch_configuration.get_physical_ports()
-                if if_list:
-                    for interface in if_list:
-                        self.write_line("%s is down, line protocol is down" % interface.name)
-                        if not isinstance(interface, VlanPort):
-                            self.write_line("  Internet protocol processing disabled")
-                        else:
-                            if len(interface.ips) == 0:
-                                self.write_line("  Internet protocol processing disabled")
-                            else:
-                                self.write_line("  Internet address is %s" % interface.ips[0])
-                                for ip in interface.ips[1:]:
-                                    self.write_line("  Secondary address %s" % ip)
-                                self.write_line("  Outgoing access list is %s" % (interface.access_group_out if interface.access_group_out else "not set"))
-                                self.write_line("  Inbound  access list is %s" % (interface.access_group_in if interface.access_group_in else "not set"))
-                                if interface.vrf is not None:
-                                    self.write_line("  VPN Routing/Forwarding \"%s\"" % interface.vrf.name)
-            elif "route".startswith(args[1]):
-                if "static".startswith(args[2]):
-                    routes = self.switch_configuration.static_routes
-                    for route in routes:
-                        self.write_line("S        {0} [x/y] via {1}".format(route.destination, route.next_hop))
+
+    @command("show", "etherchannel", "summary")
+    def show_etherchannel_summary(self):
+        ports = sorted(self.switch_configuration.ports, key=lambda x: x.name)
+        port_channels = sorted(
+            [p for p in ports if isinstance(p, AggregatedPort)],
+            key=port_channel_number)
+        self.write_line("Flags:  D - down        P - bundled in port-channel")
+        self.write_line("        I - stand-alone s - suspended")
+        self.write_line("        H - Hot-standby (LACP only)")
+        self.write_line("        R - Layer3      S - Layer2")
+        self.write_line("        U - in use      f - failed to allocate aggregator")
+        self.write_line("")
+        self.write_line("        M - not in use, minimum links not met")
+        self.write_line("        u - unsuitable for bundling")
+        self.write_line("        w - waiting to be aggregated")
+        self.write_line("        d - default port")
+        self.write_line("")
+        self.write_line("")
+        self.write_line("Number of channel-groups in use: {}".format(len(port_channels)))
+        self.write_line("Number of aggregators:           {}".format(len(port_channels)))
+        self.write_line("")
+        self.write_line("Group  Port-channel  Protocol    Ports")
+        self.write_line("------+-------------+-----------+-----------------------------------------------")
+        for port_channel in port_channels:
+            members = [short_name(p) for p in ports
+                       if p.aggregation_membership == port_channel.name]
+            self.write_line(
+                "{: <6} {: <13} {: <11} {}".format(
+                    port_channel_number(port_channel),
+                    "{}(S{})".format(short_name(port_channel), "U" if members else ""),
+                    "  LACP",
+                    "  ".join("{}(P)".format(m) for m in members)))
+        self.write_line("")
+
+    @command("show", "ip", "interface")
+    def show_ip_interface(self, *args):
+        if_list = None
+        if args:
+            interface = self.switch_configuration.get_port_by_partial_name("".join(args))
+            if interface:
+                if_list = [interface]
+            else:
+                self.write_line("                                 ^")
+                self.write_line("% Invalid input detected at '^' marker.")
                 self.write_line("")
-        elif "version".startswith(args[0]):
-            self.show_version()
+        else:
+            if_list = self.switch_configuration.get_vlan_ports() + self.switch_configuration.get_physical_ports()
+        if if_list:
+            for interface in if_list:
+                self.write_line("%s is down, line protocol is down" % interface.name)
+                if not isinstance(interface, VlanPort):
+                    self.write_line("  Internet protocol processing disabled")
+                else:
+                    if len(interface.ips) == 0:
+                        self.write_line("  Internet protocol processing disabled")
+                    else:
+                        self.write_line("  Internet address is %s" % interface.ips[0])
+                        for ip in interface.ips[1:]:
+                            self.write_line("  Secondary address %s" % ip)
+                        self.write_line("  Outgoing access list is %s" % (interface.access_group_out if interface.access_group_out else "not set"))
+                        self.write_line("  Inbound  access list is %s" % (interface.access_group_in if interface.access_group_in else "not set"))
+                        if interface.vrf is not None:
+                            self.write_line("  VPN Routing/Forwarding \"%s\"" % interface.vrf.name)
+
+    @command("show", "ip", "route", "static")
+    def show_ip_route_static(self):
+        routes = self.switch_configuration.static_routes
+        for route in routes:
+            self.write_line("S        {0} [x/y] via {1}".format(route.destination, route.next_hop))
+        self.write_line("")
 
     def do_copy(self, source_url, destination_url):
         dest_protocol, dest_file = destination_url.split(":")
@@ -183,23 +194,32 @@ class EnabledCommandProcessor(BaseCommandProcessor):
             SwitchTftpParser(self.switch_configuration).parse(url, filename, self.config_processor)
             self.write_line("Done (or some official message...)")
         except Exception as e:
-            self.logger.warning("tftp parsing went wrong : %s" % str(e))
+            self.logger.warning("tftp parsing went wrong : %s", e)
             self.write_line("Error opening %s (Timed out)" % source_url)
 
     def do_terminal(self, *args):
-        pass
+        self.apply_terminal_setting(*args)
 
     def do_write(self, *args):
         self.write_line("Building configuration...")
-        self.switch_configuration.commit()
-        self.write_line("OK")
+        self.wait_for(self.switch_configuration.commit(), self.write_line, "OK")
 
     def do_exit(self):
         self.is_done = True
 
+    @command("show", "running-config")
+    @cached_output
     def show_run(self):
+        running_config = RunningConfig(self.running_config_fragments())
+
+        self.write_line("Building configuration...")
+        self.write_line("")
+
+        self.write_line("Current configuration : %i bytes" % running_config.size())
+        self.write_chunks(running_config.chunks())
 
-        all_data = [
+    def running_config_fragments(self):
+        yield [
             "version 12.1",
             "!",
             "hostname %s" % self.switch_configuration.name,
@@ -207,22 +227,14 @@ class EnabledCommandProcessor(BaseCommandProcessor):
             "!",
         ]
         for vlan in self.switch_configuration.vlans:
-            all_data = all_data + build_running_vlan(vlan) + ["!"]
+            yield build_running_vlan(vlan) + ["!"]
         for interface in self.switch_configuration.get_physical_ports() + self.switch_configuration.get_vlan_ports():
-            all_data = all_data + build_running_interface(interface) + ["!"]
+            yield build_running_interface(interface) + ["!"]
         if self.switch_configuration.static_routes:
-            for route in self.switch_configuration.static_routes:
-                all_data.append(build_static_routes(route))
-            all_data.append("!")
-
-        all_data += ["end", ""]
-
-        self.write_line("Building configuration...")
-        self.write_line("")
-
-        self.write_line("Current configuration : %i bytes" % (len("\n".join(all_data)) + 1))
-        [self.write_line(l) for l in all_data]
+            yield [build_static_routes(route) for route in self.switch_configuration.static_routes] + ["!"]
+        yield ["end", ""]
 
+    @command("show", "version")
     def show_version(self):
         self.write_line(version_text(
             hostname=self.switch_configuration.name,
@@ -260,7 +272,7 @@ def build_running_interface(port):
         data.append(" switchport trunk encapsulation %s" % port.trunk_encapsulation_mode)
     if port.trunk_native_vlan is not None:
         data.append(" switchport trunk native vlan %s" % port.trunk_native_vlan)
-    if port.trunk_vlans is not None and len(port.trunk_vlans) < 4096 :
+    if port.trunk_vlans is not None and len(port.trunk_vlans) < MAX_VLAN:
         data.append(" switchport trunk allowed vlan %s" % to_vlan_ranges(port.trunk_vlans))
     if port.mode:
         data.append(" switchport mode %s" % port.mode)
@@ -330,6 +342,9 @@ def to_vlan_ranges(vlans):
     if len(vlans) == 0:
         return "none"
 
+    if isinstance(vlans, VlanSet):
+        return vlans.to_range_string(min_range_length=3)
+
     ranges = group_sequences(vlans, are_in_sequence=lambda a, b: a + 1 == b)
 
     return ",".join([to_range_string(r) for r in ranges])
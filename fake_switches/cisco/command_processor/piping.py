@@ -12,7 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from fake_switches.command_processing.piping_processor_base import PipingProcessorBase, StartOutputAt, Grep
+from fake_switches.command_processing.piping_processor_base import PipingProcessorBase, StartOutputAt, Grep, \
+    Exclude, Section, Count
 
 
 class PipingProcessor(PipingProcessorBase):
@@ -23,3 +24,11 @@ class PipingProcessor(PipingProcessorBase):
     def do_include(self, *args):
         return Grep(" ".join(args))
 
+    def do_exclude(self, *args):
+        return Exclude(" ".join(args))
+
+    def do_section(self, *args):
+        return Section(" ".join(args))
+
+    def do_count(self, *args):
+        return Count(" ".join(args))
@@ -0,0 +1,55 @@
+# Copyright 2018 Inap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from twisted.internet import task
+
+
+class VirtualClock(task.Clock):
+    """
+    A clock whose time only moves when it is advanced, to be given to a switch configuration instead of the reactor.
+
+    With auto_advance, the time jumps to the next scheduled call as soon as the reactor gets to it: delays complete
+    immediately but the calls still run in the order of their deadlines.
+    """
+
+    def __init__(self, auto_advance=False, reactor=None):
+        task.Clock.__init__(self)
+        self.auto_advance = auto_advance
+        self.reactor = reactor
+        self._pending_advance = None
+
+    def callLater(self, delay, callable, *args, **kw):
+        call = task.Clock.callLater(self, delay, callable, *args, **kw)
+        if self.auto_advance:
+            self._schedule_advance()
+        return call
+
+    def _schedule_advance(self):
+        if self._pending_advance is None and self.calls:
+            self._pending_advance = self._get_reactor().callLater(0, self.advance_to_next_call)
+
+    def advance_to_next_call(self):
+        self._pending_advance = None
+        if self.calls:
+            self.advance(max(0, self.calls[0].getTime() - self.seconds()))
+        self._schedule_advance()
+
+    def _get_reactor(self):
+        if self.reactor is None:
+            from twisted.internet import reactor
+            return reactor
+        return self.reactor
+
+    def __deepcopy__(self, memo):
+        return self
@@ -7,11 +7,9 @@ from fake_switches.transports.ssh_service import SwitchSshService
 from twisted.internet import reactor
 
 
-logging.basicConfig(level='DEBUG')
 logger = logging.getLogger()
 
-# NOTE(mmitchell): This is necessary because some imports will initialize the root logger.
-logger.setLevel('DEBUG')
+LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
 
 
 def main():
@@ -24,12 +22,20 @@ def main():
     parser.add_argument('--password', type=str, default='root', help='Switch password')
     parser.add_argument('--listen-host', type=str, default='0.0.0.0', help='Listen host')
     parser.add_argument('--listen-port', type=int, default=2222, help='Listen port')
+    parser.add_argument('--log-level', type=str, default='INFO', choices=LOG_LEVELS, help='Log level')
+    parser.add_argument('--log-payload-limit', type=int, default=None,
+                        help='Number of characters logged from each terminal or netconf payload, all when not set')
 
     args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level)
+    # NOTE(mmitchell): This is necessary because some imports will initialize the root logger.
+    logger.setLevel(args.log_level)
+
     args.password = args.password.encode()
 
     factory = switch_factory.SwitchFactory()
-    switch_core = factory.get(args.model, args.hostname, args.password)
+    switch_core = factory.get(args.model, args.hostname, args.password, log_payload_limit=args.log_payload_limit)
 
     ssh_service = SwitchSshService(
         ip=args.listen_host,
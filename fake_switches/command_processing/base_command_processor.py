@@ -12,10 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from twisted.internet import defer
+
 from fake_switches.command_processing.command_processor import CommandProcessor
+from fake_switches.command_processing.pager import Pager
 
 
 class BaseCommandProcessor(CommandProcessor):
+    command_error_format = "% Error: {}"
+
     def init(self, switch_configuration, terminal_controller, logger, piping_processor, *args):
         """
         :type switch_configuration: fake_switches.switch_configuration.SwitchConfiguration
@@ -33,8 +38,22 @@ class BaseCommandProcessor(CommandProcessor):
         self.is_done = False
         self.replace_input = False
         self.awaiting_keystroke = False
+        self.awaiting_completion = None
+
+    def reset(self):
+        if self.sub_processor is not None:
+            self.sub_processor.reset()
+        if self.piping_processor.is_listening():
+            self.piping_processor.stop_listening()
+        self.sub_processor = None
+        self.continuing_to = None
+        self.is_done = False
+        self.replace_input = False
+        self.awaiting_keystroke = False
+        self.awaiting_completion = None
 
     def process_command(self, line):
+        piping_started = False
         if " | " in line:
             line, piping_command = line.split(" | ", 1)
             piping_started = self.activate_piping(piping_command)
@@ -52,17 +71,24 @@ class BaseCommandProcessor(CommandProcessor):
             else:
                 processed = self.parse_and_execute_command(line)
 
-            if not self.continuing_to and not self.awaiting_keystroke and not self.is_done and processed and not self.sub_processor:
-                self.finish_piping()
-                self.show_prompt()
+            if processed and self.awaiting_completion is None:
+                self.finish_command()
+
+        if piping_started and not processed:
+            self.finish_piping()
 
         return processed
 
+    def finish_command(self):
+        if not self.continuing_to and not self.awaiting_keystroke and not self.is_done and not self.sub_processor:
+            self.finish_piping()
+            self.show_prompt()
+
     def parse_and_execute_command(self, line):
         if line.strip():
             func, args = self.get_command_func(line)
             if not func:
-                self.logger.debug("%s can't process : %s, falling back to parent" % (self.__class__.__name__, line))
+                self.logger.debug("%s can't process : %s, falling back to parent", self.__class__.__name__, line)
                 return False
             else:
                 func(*args)
@@ -88,7 +114,7 @@ class BaseCommandProcessor(CommandProcessor):
                            self.piping_processor,
                            *args)
         self.sub_processor = new_processor
-        self.logger.info("new subprocessor = {}".format(self.sub_processor.__class__.__name__))
+        self.logger.info("new subprocessor = %s", self.sub_processor.__class__.__name__)
         self.sub_processor.show_prompt()
 
     def continue_to(self, continuing_action):
@@ -98,6 +124,12 @@ class BaseCommandProcessor(CommandProcessor):
         return getattr(self, 'continue_' + cmd, None)
 
     def write(self, data):
+        if isinstance(data, bytes):
+            if not self.piping_processor.is_listening():
+                self.terminal_controller.write_bytes(data)
+                return
+            data = data.decode("utf-8")
+
         filtered = self.pipe(data)
         if filtered is not False:
             self.terminal_controller.write(filtered)
@@ -105,11 +137,28 @@ class BaseCommandProcessor(CommandProcessor):
     def write_line(self, data):
         self.write(data + u"\n")
 
+    def write_chunks(self, chunks):
+        for chunk in chunks:
+            self.write(chunk)
+
+    def show_paged(self, entries, page_length, **kwargs):
+        """
+        Shows entries through a Pager, page_length being used unless a terminal length was set for the session.
+        """
+        if self.terminal_controller.terminal_length is not None:
+            page_length = self.terminal_controller.terminal_length
+        Pager(self, entries, page_length, **kwargs).show()
+
+    def apply_terminal_setting(self, *args):
+        if len(args) == 2 and "length".startswith(args[0]) and args[1].isdigit():
+            self.terminal_controller.terminal_length = int(args[1])
+
     def show_prompt(self):
         if self.sub_processor is not None:
             self.sub_processor.show_prompt()
         else:
             self.write(self.get_prompt())
+            self.terminal_controller.flush()
 
     def get_prompt(self):
         pass
@@ -125,13 +174,48 @@ class BaseCommandProcessor(CommandProcessor):
 
     def finish_piping(self):
         if self.piping_processor.is_listening():
-            self.piping_processor.stop_listening()
+            remaining = self.piping_processor.stop_listening()
+            if remaining is not False:
+                self.terminal_controller.write(remaining)
+
+    def wait_for(self, deferred, callback=None, *args):
+        """
+        Completes the current command by calling callback once deferred has fired, or by reporting its failure.
+        Until then the prompt is not shown and command_in_progress() returns a deferred firing when it is.
+        """
+        completed = []
+        deferred.addCallbacks(lambda _: completed.append(callback and callback(*args)),
+                              lambda failure: completed.append(self._awaited_command_failed(failure)))
+        if completed:
+            return
+
+        self.awaiting_completion = defer.Deferred()
+        deferred.addBoth(self._complete_awaited_command)
+        self.terminal_controller.flush()
+
+    def _awaited_command_failed(self, failure):
+        self.logger.error("Command failed: %s", failure.getTraceback())
+        self.write_line(self.command_error_format.format(failure.getErrorMessage()))
+
+    def _complete_awaited_command(self, result):
+        awaiting_completion, self.awaiting_completion = self.awaiting_completion, None
+        self.finish_command()
+        awaiting_completion.callback(None)
+        return result
+
+    def command_in_progress(self):
+        if self.awaiting_completion is not None:
+            return self.awaiting_completion
+        if self.sub_processor is not None:
+            return self.sub_processor.command_in_progress()
+        return None
 
     def on_keystroke(self, callback, *args):
         def on_keystroke_handler(key):
             self.awaiting_keystroke = False
             self.terminal_controller.remove_any_key_handler()
             callback(*(args + (key,)))
+            self.terminal_controller.flush()
 
         self.terminal_controller.add_any_key_handler(on_keystroke_handler)
         self.awaiting_keystroke = True
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import re
+from bisect import bisect_left
+
+from fake_switches.command_processing.command_tree import compile_command_trees
 
 
 class CommandProcessor(object):
@@ -28,10 +30,39 @@ class CommandProcessor(object):
             if command == "no":
                 command += "_" + args.pop(0)
 
-            command = re.sub('[-]', "_", command)
+            command = command.replace("-", "_")
 
-            matching = sorted([c for c in dir(self) if c.startswith('do_' + command)])
-            if len(matching) >= 1:
-                return getattr(self, matching[0], None), args
+            name = self.find_command_name('do_' + command)
+            if name is not None:
+                tree = self.get_command_trees().get(name)
+                if tree is not None:
+                    name, args = tree.resolve(args)
+                    if name is None:
+                        return None, []
+                return getattr(self, name, None), args
 
         return None, []
+
+    @classmethod
+    def find_command_name(cls, prefix):
+        names = cls.get_command_names()
+        index = bisect_left(names, prefix)
+        if index < len(names) and names[index].startswith(prefix):
+            return names[index]
+        return None
+
+    @classmethod
+    def get_command_trees(cls):
+        trees = cls.__dict__.get("_command_trees")
+        if trees is None:
+            trees = compile_command_trees(cls)
+            cls._command_trees = trees
+        return trees
+
+    @classmethod
+    def get_command_names(cls):
+        names = cls.__dict__.get("_command_names")
+        if names is None:
+            names = sorted(name for name in dir(cls) if name.startswith('do_'))
+            cls._command_names = names
+        return names
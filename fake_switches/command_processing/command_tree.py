@@ -0,0 +1,115 @@
+# Copyright 2018 Inap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import inspect
+import itertools
+
+_declarations = itertools.count()
+
+
+def command(*keywords):
+    """
+    Declares the decorated method as the handler of a subcommand, the first keyword being the do_ command it
+    belongs to: @command("show", "running-config") handles "show run" and "sh running-config", receiving the tokens
+    that follow the subcommand as arguments.
+
+    Like the "if 'keyword'.startswith(args[0])" chains it replaces, an abbreviation resolves to the first declared
+    keyword it is a prefix of.  The do_ method itself handles what no subcommand matches, and a line leaving more
+    or fewer tokens than the handler's signature accepts is not processed.
+    """
+
+    def decorator(func):
+        func.command_paths = getattr(func, "command_paths", ()) + ((next(_declarations), keywords),)
+        return func
+
+    return decorator
+
+
+class CommandTree(object):
+    def __init__(self):
+        self.handler = None
+        self.min_arguments = 0
+        self.max_arguments = None
+        self.children = []
+        self.abbreviations = {}
+
+    def add(self, keywords, handler, min_arguments=0, max_arguments=None):
+        node = self
+        for keyword in keywords:
+            node = node._child(keyword)
+        node.handler = handler
+        node.min_arguments = min_arguments
+        node.max_arguments = max_arguments
+
+    def compile(self):
+        self.abbreviations = {}
+        for keyword, node in self.children:
+            for length in range(1, len(keyword) + 1):
+                self.abbreviations.setdefault(keyword[:length], node)
+            node.compile()
+
+    def resolve(self, tokens):
+        resolved, consumed = self, 0
+        node = self
+        for index, token in enumerate(tokens):
+            node = node.abbreviations.get(token)
+            if node is None:
+                break
+            if node.handler is not None:
+                resolved, consumed = node, index + 1
+
+        arguments = tokens[consumed:]
+        if len(arguments) < resolved.min_arguments or \
+                (resolved.max_arguments is not None and len(arguments) > resolved.max_arguments):
+            return None, []
+        return resolved.handler, arguments
+
+    def _child(self, keyword):
+        for existing_keyword, node in self.children:
+            if existing_keyword == keyword:
+                return node
+        node = CommandTree()
+        self.children.append((keyword, node))
+        return node
+
+
+def compile_command_trees(cls):
+    declarations = {}
+    for klass in reversed(cls.__mro__):
+        for name in vars(klass):
+            if name.startswith("do_"):
+                declarations.pop(name, None)
+
+        for name, value in vars(klass).items():
+            for order, keywords in getattr(value, "command_paths", ()):
+                command_name = "do_" + keywords[0].replace("-", "_")
+                declarations.setdefault(command_name, {})[keywords[1:]] = (order, name)
+
+    trees = {}
+    for command_name, paths in declarations.items():
+        tree = trees[command_name] = CommandTree()
+        tree.add((), command_name, *_arguments_range(getattr(cls, command_name)))
+        for keywords, (_, handler) in sorted(paths.items(), key=lambda path: path[1][0]):
+            tree.add(keywords, handler, *_arguments_range(getattr(cls, handler)))
+        tree.compile()
+    return trees
+
+
+def _arguments_range(method):
+    func = getattr(method, "__func__", method)
+    while hasattr(func, "__wrapped__"):
+        func = func.__wrapped__
+    code = func.__code__
+    max_arguments = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount - 1
+    return code.co_argcount - 1 - len(func.__defaults__ or ()), max_arguments
@@ -0,0 +1,87 @@
+# Copyright 2018 Inap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from functools import wraps
+
+
+class OutputCache(object):
+    """
+    Results rendered from a switch configuration, all forgotten as soon as the configuration version changes.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.version = None
+        self.results = {}
+
+    def get(self, version, key, render):
+        if version != self.version or len(self.results) >= self.max_size:
+            self.version = version
+            self.results = {}
+        try:
+            return self.results[key]
+        except KeyError:
+            result = self.results[key] = render()
+            return result
+
+    def __deepcopy__(self, memo):
+        return OutputCache(self.max_size)
+
+
+def output_cache(switch_configuration):
+    cache = switch_configuration.__dict__.get("_output_cache")
+    if cache is None:
+        cache = switch_configuration._output_cache = OutputCache()
+    return cache
+
+
+def cached_result(func):
+    """
+    Caches what a processor method returns for given arguments until its switch configuration changes.
+    """
+
+    @wraps(func)
+    def cached_func(self, *args):
+        return output_cache(self.switch_configuration).get(
+            self.switch_configuration.version, (type(self), func.__name__, args), lambda: func(self, *args))
+
+    return cached_func
+
+
+def cached_output(func):
+    """
+    Caches what a show command writes, encoded for the transports, until its switch configuration changes.  The
+    command must do nothing but write: no sub processor, no keystroke awaited.
+    """
+
+    @wraps(func)
+    def cached_func(self, *args):
+        output = output_cache(self.switch_configuration).get(
+            self.switch_configuration.version, (type(self), func.__name__, args),
+            lambda: _capture_output(self, func, args))
+        self.write(output)
+
+    cached_func.__wrapped__ = func
+    return cached_func
+
+
+def _capture_output(processor, func, args):
+    writes = []
+    processor.write = writes.append
+    try:
+        func(processor, *args)
+    finally:
+        del processor.write
+    return u"".join(writes).encode("utf-8")
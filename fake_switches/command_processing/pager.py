@@ -0,0 +1,68 @@
+# Copyright 2018 Inap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+_END = object()
+
+
+class Pager(object):
+    """
+    Writes entries a page at a time, waiting for a keystroke between pages.  An entry is a line or a list of
+    lines that are kept on the same page.  Entries are pulled from the iterable only as pages are shown, so
+    quitting leaves the rest of the output ungenerated.
+    """
+
+    more_prompt = "--More-- or (q)uit"
+
+    def __init__(self, processor, entries, page_length, header=(), footer=(), page_break=(), end=()):
+        self.processor = processor
+        self.entries = iter(entries)
+        self.page_length = page_length
+        self.header = header
+        self.footer = footer
+        self.page_break = page_break
+        self.end = end
+        self.next_entry = next(self.entries, _END)
+
+    def show(self):
+        self._write_lines(self.header)
+
+        line_count = 0
+        while self.next_entry is not _END and (not self.page_length or line_count < self.page_length):
+            lines = self.next_entry if isinstance(self.next_entry, (list, tuple)) else [self.next_entry]
+            self._write_lines(lines)
+            line_count += len(lines)
+            self.next_entry = next(self.entries, _END)
+
+        self._write_lines(self.footer)
+
+        if self.next_entry is not _END:
+            self.processor.write(self.more_prompt)
+            self.processor.on_keystroke(self._continue)
+
+    def _continue(self, key):
+        if key in ("q", "Q"):
+            self.processor.write_line("")
+        else:
+            self._write_lines(self.page_break)
+            self.show()
+            if self.processor.awaiting_keystroke:
+                return
+            self._write_lines(self.end)
+
+        self.processor.finish_command()
+
+    def _write_lines(self, lines):
+        for line in lines:
+            self.processor.write_line(line)
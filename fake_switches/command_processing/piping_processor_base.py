@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
+
 from fake_switches.command_processing.command_processor import CommandProcessor
 
 
@@ -22,13 +24,17 @@ class PipingProcessorBase(CommandProcessor):
         self.active_command = None
 
     def start_listening(self, command):
-        func, args = self.get_command_func(command)
+        filters = []
+        for stage in command.split(" | "):
+            func, args = self.get_command_func(stage)
+
+            if not func:
+                self.logger.debug("%s can't process piping : %s", self.__class__.__name__, stage)
+                return False
 
-        if not func:
-            self.logger.debug("%s can't process piping : %s" % (self.__class__.__name__, command))
-            return False
+            filters.append(func(*args))
 
-        self.active_command = func(*args)
+        self.active_command = Pipeline(filters)
         return True
 
     def is_listening(self):
@@ -38,7 +44,8 @@ class PipingProcessorBase(CommandProcessor):
         return self.active_command.pipe(data)
 
     def stop_listening(self):
-        self.active_command = None
+        active_command, self.active_command = self.active_command, None
+        return active_command.finish()
 
 
 class NotPipingProcessor(PipingProcessorBase):
@@ -46,27 +53,97 @@ class NotPipingProcessor(PipingProcessorBase):
         super(NotPipingProcessor, self).__init__(None)
 
 
-class StartOutputAt(object):
-    def __init__(self, lookup):
-        self.lookup = lookup
-        self.found_lookup = False
+class Pipeline(object):
+    """
+    Splits the output in lines as it is written and runs them through a chain of filters.  Returns False when
+    nothing is left to write.
+    """
+
+    def __init__(self, filters):
+        self.filters = filters
+        self.partial_line = ""
 
     def pipe(self, data):
-        if not self.found_lookup:
-            self.found_lookup = self.lookup in data
+        lines = (self.partial_line + data).split("\n")
+        self.partial_line = lines.pop()
 
-        if self.found_lookup:
-            return data
-        else:
-            return False
+        lines = [line + "\n" for line in lines]
+        for line_filter in self.filters:
+            lines = line_filter.pipe(lines)
+        return "".join(lines) or False
 
+    def finish(self):
+        lines = [self.partial_line] if self.partial_line else []
+        self.partial_line = ""
 
-class Grep(object):
-    def __init__(self, lookup):
-        self.lookup = lookup
+        for line_filter in self.filters:
+            lines = line_filter.pipe(lines) + line_filter.finish()
+        return "".join(lines) or False
 
-    def pipe(self, data):
-        if self.lookup in data:
-            return data
-        else:
-            return False
+
+def compile_pattern(pattern):
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return re.compile(re.escape(pattern))
+
+
+class LineFilter(object):
+    def __init__(self, pattern):
+        self.pattern = compile_pattern(pattern)
+
+    def pipe(self, lines):
+        return [line for line in lines if self.keep(line)]
+
+    def finish(self):
+        return []
+
+    def keep(self, line):
+        raise NotImplementedError()
+
+
+class StartOutputAt(LineFilter):
+    def __init__(self, pattern):
+        super(StartOutputAt, self).__init__(pattern)
+        self.found_pattern = False
+
+    def keep(self, line):
+        if not self.found_pattern:
+            self.found_pattern = self.pattern.search(line) is not None
+        return self.found_pattern
+
+
+class Grep(LineFilter):
+    def keep(self, line):
+        return self.pattern.search(line) is not None
+
+
+class Exclude(LineFilter):
+    def keep(self, line):
+        return self.pattern.search(line) is None
+
+
+class Section(LineFilter):
+    def __init__(self, pattern):
+        super(Section, self).__init__(pattern)
+        self.in_section = False
+
+    def keep(self, line):
+        if line[:1] in (" ", "\t"):
+            return self.in_section
+        self.in_section = self.pattern.search(line) is not None
+        return self.in_section
+
+
+class Count(LineFilter):
+    def __init__(self, pattern=""):
+        super(Count, self).__init__(pattern)
+        self.count = 0
+
+    def keep(self, line):
+        if self.pattern.search(line) is not None:
+            self.count += 1
+        return False
+
+    def finish(self):
+        return ["Number of lines which match regexp = {}\n".format(self.count)]
@@ -0,0 +1,38 @@
+# Copyright 2018 Inap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class ProcessorStackPool(object):
+    """
+    Keeps the processor stacks of closed sessions so they can be reused by the next ones instead of building a
+    new tree of processors for every connection.  A released stack is reset and must be init()-ed again before
+    being used.
+    """
+
+    def __init__(self, factory, max_size=8):
+        self.factory = factory
+        self.max_size = max_size
+        self.free = []
+
+    def acquire(self):
+        if self.free:
+            return self.free.pop()
+        return self.factory()
+
+    def release(self, processor):
+        if processor.command_in_progress() is not None:
+            return
+        processor.reset()
+        if len(self.free) < self.max_size:
+            self.free.append(processor)
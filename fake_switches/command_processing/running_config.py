@@ -0,0 +1,52 @@
+# Copyright 2018 Inap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+CHUNK_SIZE = 16384
+
+
+class RunningConfig(object):
+    """
+    A configuration rendered from fragments, each fragment being a list of lines (a vlan, an interface, ...).
+
+    Fragments are rendered lazily while being written, unless the size of the configuration is asked first: they
+    are then rendered once and kept for the write.
+    """
+
+    def __init__(self, fragments):
+        self.fragments = fragments
+        self.rendered = None
+
+    def size(self):
+        if self.rendered is None:
+            self.rendered = list(self)
+        return sum(len(text) for text in self.rendered)
+
+    def chunks(self, chunk_size=CHUNK_SIZE):
+        chunk = []
+        length = 0
+        for text in self:
+            chunk.append(text)
+            length += len(text)
+            if length >= chunk_size:
+                yield "".join(chunk)
+                chunk = []
+                length = 0
+        if chunk:
+            yield "".join(chunk)
+
+    def __iter__(self):
+        if self.rendered is not None:
+            return iter(self.rendered)
+        return ("".join(line + "\n" for line in fragment) for fragment in self.fragments)
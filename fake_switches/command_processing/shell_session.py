@@ -14,27 +14,38 @@
 
 
 class ShellSession(object):
-    def __init__(self, command_processor):
+    def __init__(self, command_processor, on_close=None):
         self.command_processor = command_processor
+        self.on_close = on_close
 
         self.command_processor.show_prompt()
 
+    def close(self):
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close(self.command_processor)
+
     def receive(self, line):
-        self.command_processor.logger.debug("received: %s" % line)
+        self.command_processor.logger.debug("received: %s", line)
         try:
             processed = self.command_processor.process_command(line)
         except TerminalExitSignal:
+            self.command_processor.terminal_controller.flush()
             return False
 
         if not processed:
-            self.command_processor.logger.info("Command not supported : %s" % line)
+            self.command_processor.logger.info("Command not supported : %s", line)
 
             self.handle_unknown_command(line)
 
             self.command_processor.show_prompt()
 
+        self.command_processor.terminal_controller.flush()
         return not self.command_processor.is_done
 
+    def command_in_progress(self):
+        return self.command_processor.command_in_progress()
+
     def handle_unknown_command(self, line):
         pass
 
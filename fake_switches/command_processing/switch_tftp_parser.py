@@ -26,7 +26,7 @@ class SwitchTftpParser(object):
         self.logger = logging.getLogger("fake_switches.%s.tftp" % self.configuration.name)
 
     def parse(self, url, filename, command_processor):
-        self.logger.info("Reading : %s/%s" % (url, filename))
+        self.logger.info("Reading : %s/%s", url, filename)
 
         data = self.reader.read_tftp(url, filename).split("\n")
 
@@ -35,5 +35,5 @@ class SwitchTftpParser(object):
             self.logger, NotPipingProcessor())
 
         for line in data:
-            self.logger.debug("Processing : %s" % line)
+            self.logger.debug("Processing : %s", line)
             command_processor.process_command(line)
@@ -17,10 +17,16 @@ from collections import namedtuple
 from fake_switches import group_sequences
 from fake_switches.command_processing.base_command_processor import \
     BaseCommandProcessor
+from fake_switches.command_processing.command_tree import command
+from fake_switches.command_processing.output_cache import cached_output, cached_result
+from fake_switches.command_processing.running_config import RunningConfig
 from fake_switches.switch_configuration import VlanPort, AggregatedPort
+from fake_switches.vlan_set import VlanSet
 
 
 class DellEnabledCommandProcessor(BaseCommandProcessor):
+    command_error_format = "ERROR: {}"
+
     def __init__(self, config):
         super(DellEnabledCommandProcessor, self).__init__()
         self.config_processor = config
@@ -43,81 +49,90 @@ class DellEnabledCommandProcessor(BaseCommandProcessor):
         self.write_line("")
         self.write_line("")
         if character == 'y':
-            self.switch_configuration.commit()
-            self.write_line("Configuration Saved!")
+            self.wait_for(self.switch_configuration.commit(), self.write_line, "Configuration Saved!")
         else:
             self.write_line("Configuration Not Saved!")
-        self.show_prompt()
+        if self.awaiting_completion is None:
+            self.show_prompt()
 
     def do_configure(self, *_):
         self.move_to(self.config_processor)
 
     def do_show(self, *args):
-        if "running-config".startswith(args[0]):
-            if len(args) == 1:
-                self.write_line('!Current Configuration:')
-                self.write_line('!System Description "PowerConnect 6224P, 3.3.7.3, VxWorks 6.5"')
-                self.write_line('!System Software Version 3.3.7.3')
-                self.write_line('!Cut-through mode is configured as disabled')
-                self.write_line('!')
-                self.write_line('configure')
-                self.write_line('vlan database')
-                if len(self.switch_configuration.vlans) > 0:
-                    self.write_line('vlan %s' % ','.join(sorted([str(v.number) for v in self.switch_configuration.vlans])))
-                self.write_line('exit')
-                for port in self.switch_configuration.ports:
-                    port_config = self.get_port_configuration(port)
-
-                    if len(port_config) > 0:
-                        self.write_line('interface %s' % port.name)
-                        for item in port_config:
-                            self.write_line(item)
-                        self.write_line('exit')
-                        self.write_line('!')
-                self.write_line('exit')
-            elif "interface".startswith(args[1]):
-                interface_name = ' '.join(args[2:])
-
-                port = self.switch_configuration.get_port_by_partial_name(interface_name)
-                if port:
-                    if isinstance(port, VlanPort):
-                        config = self.get_vlan_port_configuration(port)
-                    else:
-                        config = self.get_port_configuration(port)
-                    if len(config) > 0:
-                        for line in config:
-                            self.write_line(line)
-                    else:
-                        self.write_line("")
-                    self.write_line("")
-                else:
-                    self.write_line("\nERROR: Invalid input!\n")
-        elif "vlan".startswith(args[0]):
-            if len(args) == 1:
-                self.show_vlan_page(list(self.switch_configuration.vlans))
-            elif args[1] == "id":
-                if len(args) < 3:
-                    self.write_line("")
-                    self.write_line("Command not found / Incomplete command. Use ? to list commands.")
+        pass
+
+    def do_terminal(self, *args):
+        self.apply_terminal_setting(*args)
+
+    @command("show", "running-config")
+    @cached_output
+    def show_running_config(self):
+        self.write_chunks(RunningConfig(self.running_config_fragments()).chunks())
+
+    def running_config_fragments(self):
+        yield [
+            '!Current Configuration:',
+            '!System Description "PowerConnect 6224P, 3.3.7.3, VxWorks 6.5"',
+            '!System Software Version 3.3.7.3',
+            '!Cut-through mode is configured as disabled',
+            '!',
+            'configure',
+            'vlan database',
+        ]
+        if len(self.switch_configuration.vlans) > 0:
+            yield ['vlan %s' % ','.join(sorted([str(v.number) for v in self.switch_configuration.vlans]))]
+        yield ['exit']
+        for port in self.switch_configuration.ports:
+            port_config = self.get_port_configuration(port)
+
+            if len(port_config) > 0:
+                yield ['interface %s' % port.name] + port_config + ['exit', '!']
+        yield ['exit']
+
+    @command("show", "running-config", "interface")
+    def show_running_config_interface(self, *args):
+        interface_name = ' '.join(args)
+
+        port = self.switch_configuration.get_port_by_partial_name(interface_name)
+        if port:
+            if isinstance(port, VlanPort):
+                config = self.get_vlan_port_configuration(port)
+            else:
+                config = self.get_port_configuration(port)
+            if len(config) > 0:
+                for line in config:
+                    self.write_line(line)
+            else:
+                self.write_line("")
+            self.write_line("")
+        else:
+            self.write_line("\nERROR: Invalid input!\n")
+
+    @command("show", "vlan")
+    def show_vlan(self, *args):
+        if not args:
+            self.show_vlan_page(list(self.switch_configuration.vlans))
+        elif args[0] == "id":
+            if len(args) < 2:
+                self.write_line("")
+                self.write_line("Command not found / Incomplete command. Use ? to list commands.")
+                self.write_line("")
+            elif not _is_vlan_id(args[1]):
+                self.write_line("                     ^")
+                self.write_line("Invalid input. Please specify an integer in the range 1 to 4093.")
+                self.write_line("")
+            else:
+                vlan = self.switch_configuration.get_vlan(int(args[1]))
+                if vlan is None:
                     self.write_line("")
-                elif not _is_vlan_id(args[2]):
-                    self.write_line("                     ^")
-                    self.write_line("Invalid input. Please specify an integer in the range 1 to 4093.")
+                    self.write_line("ERROR: This VLAN does not exist.")
                     self.write_line("")
                 else:
-                    vlan = self.switch_configuration.get_vlan(int(args[2]))
-                    if vlan is None:
-                        self.write_line("")
-                        self.write_line("ERROR: This VLAN does not exist.")
-                        self.write_line("")
-                    else:
-                        self.show_vlan_page([vlan])
-
+                    self.show_vlan_page([vlan])
 
-        elif "interfaces".startswith(args[0]) and "status".startswith(args[1]):
-            self.show_page(self.get_interfaces_status_output())
-        elif "version".startswith(args[0]):
-            self.show_version()
+    @command("show", "interfaces", "status")
+    def show_interfaces_status(self):
+        self.show_paged(self.get_interfaces_status_output(), 23, page_break=[""], end=[""])
 
     def get_port_configuration(self, port):
         conf = []
@@ -159,6 +174,7 @@ class DellEnabledCommandProcessor(BaseCommandProcessor):
 
         return conf
 
+    @cached_result
     def get_interfaces_status_output(self):
         output_lines = [
             "",
@@ -199,37 +215,29 @@ class DellEnabledCommandProcessor(BaseCommandProcessor):
         return output_lines
 
     def show_vlan_page(self, vlans):
-        lines_per_pages = 18
-        self.write_line("")
-        self.write_line("VLAN       Name                         Ports          Type      Authorization")
-        self.write_line("-----  ---------------                  -------------  -----     -------------")
-
-        line_count = 0
-        while len(vlans) > 0 and line_count < lines_per_pages:
-            vlan = vlans.pop(0)
+        self.show_paged(self._vlan_rows(vlans), 18,
+                        header=["",
+                                "VLAN       Name                         Ports          Type      Authorization",
+                                "-----  ---------------                  -------------  -----     -------------"],
+                        footer=[""],
+                        page_break=["\r                     ", ""])
+
+    def _vlan_rows(self, vlans):
+        for vlan in vlans:
             ports_strings = self._build_port_strings(self.get_ports_for_vlan(vlan))
 
-            self.write_line("{number: <5}  {name: <32} {ports: <13}  {type: <8}  {auth: <13}".format(
+            rows = ["{number: <5}  {name: <32} {ports: <13}  {type: <8}  {auth: <13}".format(
                 number=vlan.number, name=vlan_name(vlan), ports=ports_strings[0],
-                type="Default" if vlan.number == 1 else "Static", auth="Required"))
-            line_count += 1
+                type="Default" if vlan.number == 1 else "Static", auth="Required")]
             for port_string in ports_strings[1:]:
-                self.write_line("{number: <5}  {name: <32} {ports: <13}  {type: <8}  {auth: <13}".format(
-                        number="", name="", ports=port_string, type="", auth=""))
-                line_count += 1
-        self.write_line("")
-
-        if len(vlans) > 0:
-            self.write("--More-- or (q)uit")
-            self.on_keystroke(self.continue_vlan_pages, vlans)
+                rows.append("{number: <5}  {name: <32} {ports: <13}  {type: <8}  {auth: <13}".format(
+                    number="", name="", ports=port_string, type="", auth=""))
+            yield rows
 
     def get_ports_for_vlan(self, vlan):
-        ports = []
-        for port in self.switch_configuration.ports:
-            if not isinstance(port, VlanPort):
-                if (port.trunk_vlans and vlan.number in port.trunk_vlans) or port.access_vlan == vlan.number:
-                    ports.append(port)
-        return ports
+        return [port for port in self.switch_configuration.get_vlan_members(("tagged", vlan.number),
+                                                                             ("access", vlan.number))
+                if not isinstance(port, VlanPort)]
 
     def _build_port_strings(self, ports):
         port_range_list = group_sequences(ports, are_in_sequence=self._are_in_sequence)
@@ -254,36 +262,7 @@ class DellEnabledCommandProcessor(BaseCommandProcessor):
         details_b = self._get_interface_details(b.name)
         return details_a.port + 1 == details_b.port and details_a.port_prefix == details_b.port_prefix
 
-    def continue_vlan_pages(self, lines, _):
-        self.write_line("\r                     ")
-        self.write_line("")
-
-        self.show_vlan_page(lines)
-
-        if not self.awaiting_keystroke:
-            self.show_prompt()
-
-    def show_page(self, lines):
-        lines_per_pages = 23
-
-        line = 0
-        while len(lines) > 0 and line < lines_per_pages:
-            self.write_line(lines.pop(0))
-            line += 1
-
-        if len(lines) > 0:
-            self.write("--More-- or (q)uit")
-            self.on_keystroke(self.continue_pages, lines)
-
-    def continue_pages(self, lines, _):
-        self.write_line("")
-
-        self.show_page(lines)
-
-        if not self.awaiting_keystroke:
-            self.write_line("")
-            self.show_prompt()
-
+    @command("show", "version")
     def show_version(self):
         self.write_line("")
         self.write_line("Image Descriptions")
@@ -315,6 +294,9 @@ def to_vlan_ranges(vlans):
     if len(vlans) == 0:
         return "none"
 
+    if isinstance(vlans, VlanSet):
+        return vlans.to_range_string()
+
     ranges = group_sequences(vlans, are_in_sequence=lambda a, b: a + 1 == b)
 
     return ",".join([to_range_string(r) for r in ranges])
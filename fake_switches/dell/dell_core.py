@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import logging
-
 from fake_switches.brocade.brocade_core import BrocadeSwitchCore
 from fake_switches.brocade.command_processor.config_vrf import ConfigVrfCommandProcessor
 from fake_switches.brocade.command_processor.piping import \
@@ -32,23 +30,26 @@ from fake_switches.terminal import LoggingTerminalController
 
 class DellSwitchCore(BrocadeSwitchCore):
     def launch(self, protocol, terminal_controller):
-        self.last_connection_id += 1
-        self.logger = logging.getLogger("fake_switches.dell.%s.%s.%s" % (self.switch_configuration.name, self.last_connection_id, protocol))
+        self.logger = self.new_connection_logger("dell", protocol)
+
+        processor = self.processor_stacks.acquire()
+        processor.init(
+            switch_configuration=self.switch_configuration,
+            terminal_controller=LoggingTerminalController(self.logger, terminal_controller,
+                                                          self.switch_configuration.log_payload_limit),
+            piping_processor=PipingProcessor(self.logger),
+            logger=self.logger)
 
-        processor = DellDefaultCommandProcessor(
+        return DellShellSession(processor, on_close=self.processor_stacks.release)
+
+    def new_processor_stack(self):
+        return DellDefaultCommandProcessor(
             enabled=DellEnabledCommandProcessor(
                 config=DellConfigCommandProcessor(
                     config_vlan=DellConfigureVlanCommandProcessor(),
                     config_vrf=ConfigVrfCommandProcessor(),
                     config_interface=DellConfigInterfaceCommandProcessor()
                 )))
-        processor.init(
-            switch_configuration=self.switch_configuration,
-            terminal_controller=LoggingTerminalController(self.logger, terminal_controller),
-            piping_processor=PipingProcessor(self.logger),
-            logger=self.logger)
-
-        return DellShellSession(processor)
 
     @staticmethod
     def get_default_ports():
@@ -14,6 +14,7 @@
 
 from fake_switches.dell.command_processor.config_interface import DellConfigInterfaceCommandProcessor, parse_vlan_list
 from fake_switches.switch_configuration import AggregatedPort
+from fake_switches.vlan_set import all_vlans
 
 
 class Dell10GConfigInterfaceCommandProcessor(DellConfigInterfaceCommandProcessor):
@@ -70,7 +71,7 @@ class Dell10GConfigInterfaceCommandProcessor(DellConfigInterfaceCommandProcessor
                             self.port.trunk_vlans = sorted(list(set(self.port.trunk_vlans + parse_vlan_list(args[4]))))
                     elif args[0:4] == ("trunk", "allowed", "vlan", "remove"):
                         if self.port.trunk_vlans is None:
-                            self.port.trunk_vlans = list(range(1, 4097))
+                            self.port.trunk_vlans = all_vlans()
                         for v in parse_vlan_list(args[4]):
                             if v in self.port.trunk_vlans:
                                 self.port.trunk_vlans.remove(v)
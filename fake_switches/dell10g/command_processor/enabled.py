@@ -15,6 +15,7 @@ import re
 from collections import namedtuple
 
 from fake_switches import group_sequences
+from fake_switches.command_processing.output_cache import cached_output
 from fake_switches.dell.command_processor.enabled import DellEnabledCommandProcessor, to_vlan_ranges, _is_vlan_id, \
     _assemble_elements_on_lines
 from fake_switches.switch_configuration import VlanPort, AggregatedPort
@@ -62,23 +63,7 @@ class Dell10GEnabledCommandProcessor(DellEnabledCommandProcessor):
     def do_show(self, *args):
         if "running-config".startswith(args[0]):
             if len(args) == 1:
-                self.write_line('!Current Configuration:')
-                self.write_line('!System Description "............."')
-                self.write_line('!System Software Version 3.3.7.3')
-                self.write_line('!Cut-through mode is configured as disabled')
-                self.write_line('!')
-                self.write_line('configure')
-                self.write_vlans()
-                for port in self.switch_configuration.ports:
-                    port_config = self.get_port_configuration(port)
-
-                    if len(port_config) > 0:
-                        self.write_line('interface %s' % port.name)
-                        for item in port_config:
-                            self.write_line(item)
-                        self.write_line('exit')
-                        self.write_line('!')
-                self.write_line('exit')
+                self.show_running_config()
             elif "interface".startswith(args[1]):
                 interface_name = ' '.join(args[2:])
 
@@ -122,7 +107,15 @@ class Dell10GEnabledCommandProcessor(DellEnabledCommandProcessor):
         elif "interfaces".startswith(args[0]) and "status".startswith(args[1]):
             self.show_interfaces_status()
 
-    def write_vlans(self):
+    def running_config_fragments(self):
+        yield [
+            '!Current Configuration:',
+            '!System Description "............."',
+            '!System Software Version 3.3.7.3',
+            '!Cut-through mode is configured as disabled',
+            '!',
+            'configure',
+        ]
         named_vlans = []
         other_vlans = []
         for v in self.switch_configuration.vlans:
@@ -132,14 +125,17 @@ class Dell10GEnabledCommandProcessor(DellEnabledCommandProcessor):
                 other_vlans.append(v)
 
         for vlan in named_vlans:
-            self.write_line('vlan {}'.format(vlan.number))
-            if vlan.name is not None:
-                self.write_line('name {}'.format(vlan.name))
-            self.write_line('exit')
+            yield ['vlan {}'.format(vlan.number), 'name {}'.format(vlan.name), 'exit']
 
-        self.write_line('vlan {}'.format(to_vlan_ranges([v.number for v in other_vlans])))
-        self.write_line('exit')
+        yield ['vlan {}'.format(to_vlan_ranges([v.number for v in other_vlans])), 'exit']
+        for port in self.switch_configuration.ports:
+            port_config = self.get_port_configuration(port)
+
+            if len(port_config) > 0:
+                yield ['interface %s' % port.name] + port_config + ['exit', '!']
+        yield ['exit']
 
+    @cached_output
     def show_interfaces_status(self):
 
         self.write_line("")
@@ -205,6 +201,7 @@ class Dell10GEnabledCommandProcessor(DellEnabledCommandProcessor):
         return interface_descriptor(interface, port_prefix, int(port))
 
     def do_terminal(self, *args):
+        self.apply_terminal_setting(*args)
         self.write_line("")
 
 def vlan_name(vlan):
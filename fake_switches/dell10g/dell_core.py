@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import logging
-
 from fake_switches.brocade.command_processor.config_vrf import ConfigVrfCommandProcessor
 from fake_switches.brocade.command_processor.piping import \
     PipingProcessor
@@ -30,23 +28,26 @@ from fake_switches.terminal import LoggingTerminalController
 
 class Dell10GSwitchCore(DellSwitchCore):
     def launch(self, protocol, terminal_controller):
-        self.last_connection_id += 1
-        self.logger = logging.getLogger("fake_switches.dell10g.%s.%s.%s" % (self.switch_configuration.name, self.last_connection_id, protocol))
+        self.logger = self.new_connection_logger("dell10g", protocol)
+
+        processor = self.processor_stacks.acquire()
+        processor.init(
+            switch_configuration=self.switch_configuration,
+            terminal_controller=LoggingTerminalController(self.logger, terminal_controller,
+                                                          self.switch_configuration.log_payload_limit),
+            piping_processor=PipingProcessor(self.logger),
+            logger=self.logger)
 
-        processor = Dell10GDefaultCommandProcessor(
+        return DellShellSession(processor, on_close=self.processor_stacks.release)
+
+    def new_processor_stack(self):
+        return Dell10GDefaultCommandProcessor(
             enabled=Dell10GEnabledCommandProcessor(
                 config=Dell10GConfigCommandProcessor(
                     config_vlan=Dell10GConfigureVlanCommandProcessor(),
                     config_vrf=ConfigVrfCommandProcessor(),
                     config_interface=Dell10GConfigInterfaceCommandProcessor()
                 )))
-        processor.init(
-            switch_configuration=self.switch_configuration,
-            terminal_controller=LoggingTerminalController(self.logger, terminal_controller),
-            piping_processor=PipingProcessor(self.logger),
-            logger=self.logger)
-
-        return DellShellSession(processor)
 
     @staticmethod
     def get_default_ports():
@@ -12,13 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import logging
 import textwrap
 
 from fake_switches import switch_core
 from fake_switches.juniper.juniper_netconf_datastore import JuniperNetconfDatastore, NS_JUNOS
 from fake_switches.netconf import OperationNotSupported, RUNNING, CANDIDATE, Response, xml_equals, NetconfError
-from fake_switches.netconf.capabilities import Candidate1_0, ConfirmedCommit1_0, Validate1_0, Url1_0, \
+from fake_switches.netconf.capabilities import Base1_1, Candidate1_0, ConfirmedCommit1_0, Validate1_0, Url1_0, \
     Capability
 from fake_switches.netconf.netconf_protocol import NetconfProtocol
 from fake_switches.switch_configuration import Port, AggregatedPort
@@ -29,7 +28,6 @@ class BaseJuniperSwitchCore(switch_core.SwitchCore):
     def __init__(self, switch_configuration, datastore_class):
         super(BaseJuniperSwitchCore, self).__init__(switch_configuration)
 
-        self.last_connection_id = 0
         self.datastore = datastore_class(self.switch_configuration)
 
     def launch(self, protocol, terminal_controller):
@@ -39,18 +37,17 @@ class BaseJuniperSwitchCore(switch_core.SwitchCore):
         raise NotImplemented()
 
     def get_netconf_protocol(self):
-        self.last_connection_id += 1
-
         return NetconfProtocol(
             datastore=self.datastore,
             capabilities=self.capabilities(),
             additionnal_namespaces={"junos": NS_JUNOS},
-            logger=logging.getLogger(
-                "fake_switches.juniper.%s.%s.netconf" % (self.switch_configuration.name, self.last_connection_id))
+            logger=self.new_connection_logger("juniper", "netconf"),
+            log_payload_limit=self.switch_configuration.log_payload_limit
         )
 
     def capabilities(self):
         return [
+            Base1_1,
             Candidate1_0,
             ConfirmedCommit1_0,
             Validate1_0,
@@ -21,7 +21,7 @@ from fake_switches.netconf import XML_NS, XML_ATTRIBUTES, CANDIDATE, RUNNING, Al
     CannotLockUncleanCandidate, first,UnknownVlan, InvalidInterfaceType, InvalidTrailingInput, \
     AggregatePortOutOfRange, PhysicalPortOutOfRange,  MultipleNetconfErrors, InvalidNumericValue, InvalidMTUValue
 from fake_switches.netconf.netconf_protocol import dict_2_etree
-from fake_switches.switch_configuration import AggregatedPort, VlanPort
+from fake_switches.switch_configuration import AggregatedPort, VlanPort, CopyOnWriteConfiguration
 
 NS_JUNOS = "http://xml.juniper.net/junos/11.4R1/junos"
 
@@ -45,11 +45,15 @@ class JuniperNetconfDatastore(object):
 
     def reset(self):
         self.configurations = {
-            CANDIDATE: deepcopy(self.original_configuration),
+            CANDIDATE: CopyOnWriteConfiguration(self.original_configuration),
             RUNNING: self.original_configuration,
         }
 
         self.configurations[CANDIDATE].routing_engine = None
+        self.clean_versions = self._versions()
+
+    def _versions(self):
+        return self.configurations[RUNNING].version, self.configurations[CANDIDATE].version
 
     def to_etree(self, source):
         etree.register_namespace("junos", NS_JUNOS)
@@ -76,37 +80,49 @@ class JuniperNetconfDatastore(object):
     def edit(self, target, etree_conf):
         self.edit_errors = []
         conf = self.configurations[target]
-        handled_elements = []
-
-        handled_elements += self.parse_vlans(conf, etree_conf)
-        handled_elements += self.parse_interfaces(conf, etree_conf)
-        handled_elements += parse_protocols(conf, etree_conf)
+        if isinstance(conf, CopyOnWriteConfiguration):
+            with conf.guarding_base():
+                handled_elements = self._parse(conf, etree_conf)
+        else:
+            handled_elements = self._parse(conf, etree_conf)
 
         self.edit_errors.extend(_get_errors_for_unused_nodes(etree_conf, handled_elements))
 
         if len(self.edit_errors) > 0:
             raise MultipleNetconfErrors(self.edit_errors)
 
+    def _parse(self, conf, etree_conf):
+        handled_elements = []
+        handled_elements += self.parse_vlans(conf, etree_conf)
+        handled_elements += self.parse_interfaces(conf, etree_conf)
+        handled_elements += parse_protocols(conf, etree_conf)
+        return handled_elements
+
     def commit_candidate(self):
         self._validate(self.configurations[CANDIDATE])
         for updated_vlan in self.configurations[CANDIDATE].vlans:
             actual_vlan = self.configurations[RUNNING].get_vlan_by_name(updated_vlan.name)
-            if not actual_vlan:
-                self.configurations[RUNNING].add_vlan(deepcopy(updated_vlan))
+            if actual_vlan is updated_vlan:
+                continue
+            elif not actual_vlan:
+                self.configurations[RUNNING].add_vlan(self.configurations[RUNNING].clone(updated_vlan))
             else:
                 actual_vlan.number = updated_vlan.number
                 actual_vlan.description = updated_vlan.description
                 actual_vlan.vendor_specific = updated_vlan.vendor_specific
 
+        candidate_vlan_names = set(vlan.name for vlan in self.configurations[CANDIDATE].vlans)
         for p in self.configurations[RUNNING].vlans[:]:
-            if self.configurations[CANDIDATE].get_vlan_by_name(p.name) is None:
+            if p.name not in candidate_vlan_names:
                 self.configurations[RUNNING].remove_vlan(p)
 
         for updated_port in self.configurations[CANDIDATE].ports:
             actual_port = self.configurations[RUNNING].get_port_by_partial_name(updated_port.name)
 
-            if actual_port is None:
-                actual_port = deepcopy(updated_port)
+            if actual_port is updated_port:
+                continue
+            elif actual_port is None:
+                actual_port = self.configurations[RUNNING].clone(updated_port)
                 self.configurations[RUNNING].add_port(actual_port)
             else:
                 actual_port.mode = updated_port.mode
@@ -140,17 +156,19 @@ class JuniperNetconfDatastore(object):
                     actual_port.secondary_ips = deepcopy(updated_port.secondary_ips)
                     actual_port.vrrp_common_authentication = updated_port.vrrp_common_authentication
                     actual_port.vrrp_version = updated_port.vrrp_version
-                    actual_port.vrrps = deepcopy(updated_port.vrrps)
+                    actual_port.vrrps = [self.configurations[RUNNING].clone(vrrp) for vrrp in updated_port.vrrps]
                     actual_port.ip_redirect = updated_port.ip_redirect
                     actual_port.ip_proxy_arp = updated_port.ip_proxy_arp
                     actual_port.unicast_reverse_path_forwarding = updated_port.unicast_reverse_path_forwarding
 
+        candidate_port_names = set(port.name for port in self.configurations[CANDIDATE].ports)
         for p in self.configurations[RUNNING].ports[:]:
-            if self.configurations[CANDIDATE].get_port_by_partial_name(p.name) is None:
+            if p.name not in candidate_port_names:
                 self.configurations[RUNNING].remove_port(p)
 
     def lock(self, target):
-        if etree.tostring(self.to_etree(RUNNING)) != etree.tostring(self.to_etree(CANDIDATE)):
+        if self._versions() != self.clean_versions and \
+                etree.tostring(self.to_etree(RUNNING)) != etree.tostring(self.to_etree(CANDIDATE)):
             raise CannotLockUncleanCandidate()
         if self.configurations[target].locked:
             raise AlreadyLocked()
@@ -226,7 +244,7 @@ class JuniperNetconfDatastore(object):
         ethernet_switching = {}
         if port.mode is not None:
             ethernet_switching[self.PORT_MODE_TAG] = port.mode
-        vlans = port.trunk_vlans or []
+        vlans = list(port.trunk_vlans or [])
         if port.access_vlan: vlans.append(port.access_vlan)
         if len(vlans) > 0:
             ethernet_switching["vlan"] = [{"members": str(v)} for v in vlans]
@@ -253,7 +271,7 @@ class JuniperNetconfDatastore(object):
 
         port = conf.get_port_by_partial_name(port_name)
         if port is None and re.match("^ae\d+$", port_name):
-            port = self.original_configuration.new("AggregatedPort", port_name)
+            port = conf.new("AggregatedPort", port_name)
             port.vendor_specific["has-ethernet-switching"] = True
             conf.add_port(port)
 
@@ -265,7 +283,7 @@ class JuniperNetconfDatastore(object):
 
     def handle_interface_operation(self, conf, operation, port):
         if operation in ("delete", "replace"):
-            backup = deepcopy(vars(port))
+            backup = _backup_protocols_specific_data(port)
 
             port.reset()
 
@@ -367,7 +385,7 @@ class JuniperNetconfDatastore(object):
                     conf.remove_vlan(vlan)
             else:
                 if vlan is None:
-                    vlan = self.original_configuration.new("Vlan", name=val(vlan_node, "name"))
+                    vlan = conf.new("Vlan", name=val(vlan_node, "name"))
                     conf.add_vlan(vlan)
 
                 self.parse_vlan_attributes(conf, vlan, vlan_node)
@@ -413,7 +431,7 @@ class JuniperNetconfDatastore(object):
         return vlan_data
 
     def _validate(self, configuration):
-        vlan_list = [vlan.number for vlan in configuration.vlans]
+        vlan_list = set(vlan.number for vlan in configuration.vlans)
 
         for port in configuration.ports:
             self.validate_vlan_config(port, vlan_list)
@@ -670,6 +688,14 @@ def _add_if_not_empty(target_dict, key, value):
         target_dict[key] = value
 
 
+def _backup_protocols_specific_data(port):
+    return {
+        "vendor_specific": deepcopy(port.vendor_specific),
+        "lldp_transmit": port.lldp_transmit,
+        "lldp_receive": port.lldp_receive,
+    }
+
+
 def _restore_protocols_specific_data(backup, port):
     port.vendor_specific["rstp-edge"] = backup.get("vendor_specific", {}).get("rstp-edge")
     port.vendor_specific["rstp-no-root-port"] = backup.get("vendor_specific", {}).get("rstp-no-root-port")
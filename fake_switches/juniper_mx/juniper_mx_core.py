@@ -14,7 +14,7 @@
 
 from fake_switches.juniper.juniper_core import BaseJuniperSwitchCore, NetconfJunos1_0, DmiSystem1_0
 from fake_switches.juniper_mx.juniper_mx_netconf_datastore import JuniperMxNetconfDatastore
-from fake_switches.netconf.capabilities import Candidate1_0, ConfirmedCommit1_0, Validate1_0, Url1_0, \
+from fake_switches.netconf.capabilities import Base1_1, Candidate1_0, ConfirmedCommit1_0, Validate1_0, Url1_0, \
     NSLessCandidate1_0, NSLessConfirmedCommit1_0, NSLessValidate1_0, NSLessUrl1_0
 from fake_switches.switch_configuration import Port
 
@@ -27,6 +27,7 @@ class JuniperMXSwitchCore(BaseJuniperSwitchCore):
 
     def capabilities(self):
         return [
+            Base1_1,
             Candidate1_0,
             ConfirmedCommit1_0,
             Validate1_0,
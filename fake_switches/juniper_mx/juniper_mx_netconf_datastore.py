@@ -11,10 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from copy import deepcopy
-
 from fake_switches.juniper.juniper_netconf_datastore import resolve_new_value, NS_JUNOS, resolve_operation, parse_range, \
-    val, _restore_protocols_specific_data
+    val, _backup_protocols_specific_data, _restore_protocols_specific_data
 from fake_switches.juniper_qfx_copper.juniper_qfx_copper_netconf_datastore import JuniperQfxCopperNetconfDatastore
 from fake_switches.netconf import NetconfError, XML_ATTRIBUTES, first
 from fake_switches.switch_configuration import AggregatedPort, VlanPort
@@ -98,9 +96,9 @@ class JuniperMxNetconfDatastore(JuniperQfxCopperNetconfDatastore):
             port = conf.get_port(port_name)
             if port is None:
                 linked_vlan = find_vlan_with_routing_interface(conf, port_name)
-                port = self.original_configuration.new("VlanPort",
-                                                       vlan_id=linked_vlan.number if linked_vlan else None,
-                                                       name=port_name)
+                port = conf.new("VlanPort",
+                                vlan_id=linked_vlan.number if linked_vlan else None,
+                                name=port_name)
                 port.vendor_specific["irb-unit"] = unit_id
                 conf.add_port(port)
 
@@ -127,7 +125,7 @@ class JuniperMxNetconfDatastore(JuniperQfxCopperNetconfDatastore):
                                 port.vrrps.remove(vrrp_group)
                             else:
                                 if vrrp_group is None:
-                                    vrrp_group = self.original_configuration.new("VRRP", group_id=group_id)
+                                    vrrp_group = conf.new("VRRP", group_id=group_id)
                                     port.vrrps.append(vrrp_group)
 
                                 vrrp_group.related_ip_network = ip
@@ -173,7 +171,7 @@ class JuniperMxNetconfDatastore(JuniperQfxCopperNetconfDatastore):
         if operation == 'delete' and isinstance(port, AggregatedPort):
             conf.remove_port(port)
         elif operation in ("delete", "replace"):
-            backup = deepcopy(vars(port))
+            backup = _backup_protocols_specific_data(port)
 
             port.reset()
 
@@ -0,0 +1,34 @@
+# Copyright 2018 Inap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class LogPayload(object):
+    """
+    Wraps data given as a log argument so its repr is only built when the record is actually emitted.
+
+    With a limit, only the first limit characters of the data are shown, followed by how many were left out.
+    """
+
+    __slots__ = ("data", "limit")
+
+    def __init__(self, data, limit=None):
+        self.data = data
+        self.limit = limit
+
+    def __str__(self):
+        if self.limit is None or len(self.data) <= self.limit:
+            return repr(self.data)
+        return "%r... (%s more)" % (self.data[:self.limit], len(self.data) - self.limit)
+
+    __repr__ = __str__
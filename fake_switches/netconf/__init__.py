@@ -19,6 +19,7 @@ from lxml import etree
 RUNNING = "running"
 CANDIDATE = "candidate"
 NS_BASE_1_0 = "urn:ietf:params:xml:ns:netconf:base:1.0"
+NS_BASE_1_1 = "urn:ietf:params:netconf:base:1.1"
 
 XML_ATTRIBUTES = "__xml_attributes__"
 XML_TEXT = "__xml_text__"
@@ -14,7 +14,7 @@
 
 from lxml import etree
 
-from fake_switches.netconf import resolve_source_name, Response, NS_BASE_1_0, first
+from fake_switches.netconf import resolve_source_name, Response, NS_BASE_1_0, NS_BASE_1_1, first
 
 
 class Capability(object):
@@ -66,8 +66,18 @@ class Base1_0(Capability):
 
     def commit(self, *args, **kwargs):
         self.datastore.commit_candidate()
-        self.datastore.configurations.get('candidate').commit()
-        return Response(etree.Element("ok"))
+        saved = self.datastore.configurations.get('candidate').commit()
+        return saved.addCallback(lambda _: Response(etree.Element("ok")))
+
+
+class Base1_1(Capability):
+    """
+    Chunked framing (RFC 6242), used once the client also announced it in its hello.  The operations are the ones
+    of Base1_0.
+    """
+
+    def get_url(self):
+        return NS_BASE_1_1
 
 
 def filter_content(content, filtering):
@@ -0,0 +1,119 @@
+# Copyright 2018 Inap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+
+END_OF_MESSAGE = b"]]>]]>"
+END_OF_CHUNKS = b"\n##\n"
+MAX_CHUNK_SIZE = 4294967295
+
+_CHUNK_HEADER = re.compile(b"\n#(?:([1-9][0-9]{0,9})|#)\n")
+_CHUNK_HEADER_START = re.compile(b"(?:\n(?:#(?:#|[1-9][0-9]{0,9})?)?)?\\Z")
+
+
+class EndOfMessageFramer(object):
+    """
+    Netconf base 1.0 framing: messages are followed by END_OF_MESSAGE.
+
+    Only the data that was not scanned yet is searched for the delimiter.
+    """
+
+    def __init__(self, data=b""):
+        self.buffer = bytearray(data)
+        self._scanned = 0
+
+    def feed(self, data):
+        self.buffer.extend(data)
+
+    def next_message(self):
+        """
+        Returns the next complete message received, or None until there is one.
+        """
+        end = self.buffer.find(END_OF_MESSAGE, self._scanned)
+        if end < 0:
+            self._scanned = max(0, len(self.buffer) - len(END_OF_MESSAGE) + 1)
+            return None
+
+        message = bytes(self.buffer[:end]).strip()
+        del self.buffer[:end + len(END_OF_MESSAGE)]
+        self._scanned = 0
+        return message
+
+    def chunk(self, data):
+        return data
+
+    def end(self):
+        return END_OF_MESSAGE + b"\n"
+
+    def frame(self, message):
+        return self.chunk(message) + self.end()
+
+
+class ChunkedFramer(object):
+    """
+    Netconf base 1.1 framing (RFC 6242): messages are sent as chunks, each preceded by its size, and END_OF_CHUNKS.
+    """
+
+    def __init__(self, data=b""):
+        self.buffer = bytearray(data)
+        self._chunks = []
+        self._chunk_size = None
+
+    def feed(self, data):
+        self.buffer.extend(data)
+
+    def next_message(self):
+        """
+        Returns the next complete message received, or None until there is one.
+
+        :raises FramingError: when the data received is not properly chunked
+        """
+        while True:
+            if self._chunk_size is None:
+                header = _CHUNK_HEADER.match(self.buffer)
+                if header is None:
+                    if not _CHUNK_HEADER_START.match(self.buffer):
+                        raise FramingError("Invalid chunk header : {!r}".format(bytes(self.buffer[:13])))
+                    return None
+                chunk_size = header.group(1)
+                del self.buffer[:header.end()]
+
+                if chunk_size is None:
+                    message, self._chunks = b"".join(self._chunks), []
+                    return message
+
+                self._chunk_size = int(chunk_size)
+                if self._chunk_size > MAX_CHUNK_SIZE:
+                    raise FramingError("Invalid chunk size : {}".format(self._chunk_size))
+
+            if len(self.buffer) < self._chunk_size:
+                return None
+            self._chunks.append(bytes(self.buffer[:self._chunk_size]))
+            del self.buffer[:self._chunk_size]
+            self._chunk_size = None
+
+    def chunk(self, data):
+        if not data:
+            return b""
+        return "\n#{}\n".format(len(data)).encode() + data
+
+    def end(self):
+        return END_OF_CHUNKS
+
+    def frame(self, message):
+        return self.chunk(message) + self.end()
+
+
+class FramingError(Exception):
+    pass
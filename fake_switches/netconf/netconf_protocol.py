@@ -16,18 +16,26 @@ import logging
 import re
 
 from lxml import etree
+from twisted.internet import defer
 from twisted.internet.protocol import Protocol
 
-from fake_switches.netconf import dict_2_etree, NS_BASE_1_0, normalize_operation_name, SimpleDatastore, \
-    Response, OperationNotSupported, NetconfError
+from fake_switches.log_payload import LogPayload
+from fake_switches.netconf import dict_2_etree, NS_BASE_1_0, NS_BASE_1_1, normalize_operation_name, \
+    SimpleDatastore, Response, OperationNotSupported, NetconfError
 from fake_switches.netconf.capabilities import Base1_0
+from fake_switches.netconf.framing import EndOfMessageFramer, ChunkedFramer, FramingError
+from fake_switches.netconf.streaming import iter_serialized, ReplyProducer
 
 
 class NetconfProtocol(Protocol):
-    def __init__(self, datastore=None, capabilities=None, additionnal_namespaces=None, logger=None):
+    def __init__(self, datastore=None, capabilities=None, additionnal_namespaces=None, logger=None,
+                 log_payload_limit=None, pretty_print=True):
         self.logger = logger or logging.getLogger("fake_switches.netconf")
+        self.log_payload_limit = log_payload_limit
+        self.pretty_print = pretty_print
 
-        self.input_buffer = ""
+        self.framer = EndOfMessageFramer()
+        self.processing = defer.succeed(None)
         self.session_count = 0
         self.been_greeted = False
 
@@ -45,45 +53,77 @@ class NetconfProtocol(Protocol):
 
         self.session_count += 1
 
-        self.say(dict_2_etree({
+        hello = dict_2_etree({
             "hello": [
                 {"session-id": str(self.session_count)},
                 {"capabilities": [{"capability": cap.get_url()} for cap in self.capabilities]}
             ]
-        }))
+        })
+        self.processing.addCallback(lambda _: self.say(hello))
 
     def dataReceived(self, data):
-        data = data.decode()
-        self.logger.info("Received : %s" % repr(data))
-        self.input_buffer += data
-        if self.input_buffer.rstrip().endswith("]]>]]>"):
-            self.process(self.input_buffer.rstrip()[0:-6])
-            self.input_buffer = ""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Received : %s", LogPayload(data, self.log_payload_limit))
+        self.framer.feed(data)
+        while True:
+            try:
+                message = self.framer.next_message()
+            except FramingError as e:
+                self.logger.error("Invalid framing, disconnecting : %s", e)
+                self.transport.loseConnection()
+                return
+            if message is None:
+                return
+
+            if not self.been_greeted:
+                try:
+                    self.greeted(message)
+                except etree.XMLSyntaxError as e:
+                    self.logger.error("Invalid greeting, disconnecting : %s", e)
+                    self.transport.loseConnection()
+                    return
+            else:
+                self.processing.addCallback(lambda _, message=message: self.process(message))
+                self.processing.addErrback(self._processing_failed)
+
+    def greeted(self, hello):
+        client_capabilities = etree.fromstring(hello).xpath("//*[local-name()='capability']/text()")
+        self.logger.info("Client's greeting received")
+        self.been_greeted = True
+
+        if NS_BASE_1_1 in [c.strip() for c in client_capabilities] and \
+                NS_BASE_1_1 in [cap.get_url() for cap in self.capabilities]:
+            self.logger.info("Using chunked framing")
+            self.framer = ChunkedFramer(self.framer.buffer)
 
     def process(self, data):
-        if not self.been_greeted:
-            self.logger.info("Client's greeting received")
-            self.been_greeted = True
-            return
-
-        xml_request_root = remove_namespaces(etree.fromstring(data.encode()))
+        xml_request_root = remove_namespaces(etree.fromstring(data))
         message_id = xml_request_root.get("message-id")
         operation = xml_request_root[0]
-        self.logger.info("Operation requested %s" % repr(operation.tag))
+        self.logger.info("Operation requested %r", operation.tag)
 
         handled = False
+        replies = defer.succeed(None)
         operation_name = normalize_operation_name(operation)
         for capability in self.capabilities:
             if hasattr(capability, operation_name):
-                try:
-                    self.reply(message_id, getattr(capability, operation_name)(operation))
-                except NetconfError as e:
-                    self.reply(message_id, Response(e.to_etree()))
-
+                replies.addCallback(self._handle, message_id, getattr(capability, operation_name), operation)
                 handled = True
 
         if not handled:
-            self.reply(message_id, Response(OperationNotSupported(operation_name).to_etree()))
+            replies.addCallback(lambda _: self.reply(message_id,
+                                                     Response(OperationNotSupported(operation_name).to_etree())))
+
+        return replies
+
+    def _handle(self, _, message_id, operation_handler, operation):
+        response = defer.maybeDeferred(operation_handler, operation)
+        response.addErrback(_netconf_error_response)
+        return response.addCallback(lambda r: self.reply(message_id, r))
+
+    def _processing_failed(self, failure):
+        self.logger.error("Processing failed, disconnecting : %s", failure.getTraceback())
+        self.transport.loseConnection()
 
     def reply(self, message_id, response):
         reply = etree.Element("rpc-reply", xmlns=NS_BASE_1_0, nsmap=self.additionnal_namespaces)
@@ -91,15 +131,36 @@ class NetconfProtocol(Protocol):
         for ele in response.elements:
             reply.append(ele)
 
-        self.say(reply)
+        said = self.say(reply)
 
         if response.require_disconnect:
-            self.logger.info("Disconnecting")
-            self.transport.loseConnection()
+            said.addCallback(lambda _: self._disconnect())
+        return said
+
+    def _disconnect(self):
+        self.logger.info("Disconnecting")
+        self.transport.loseConnection()
 
     def say(self, etree_root):
-        self.logger.info("Saying : %s" % repr(etree.tostring(etree_root)))
-        self.transport.write(etree.tostring(etree_root, pretty_print=True) + b"]]>]]>\n")
+        """
+        Streams etree_root to the transport and returns a deferred firing once it is entirely written.
+        """
+        return ReplyProducer(self.transport, self._framed(etree_root, self.framer)).start()
+
+    def _framed(self, etree_root, framer):
+        previous = b""
+        for data in iter_serialized(etree_root, self.pretty_print):
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Saying : %s", LogPayload(data, self.log_payload_limit))
+            if previous:
+                yield framer.chunk(previous)
+            previous = data
+        yield framer.chunk(previous) + framer.end()
+
+
+def _netconf_error_response(failure):
+    failure.trap(NetconfError)
+    return Response(failure.value.to_etree())
 
 
 def remove_namespaces(xml_root):
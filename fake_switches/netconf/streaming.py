@@ -0,0 +1,90 @@
+# Copyright 2018 Inap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from lxml import etree
+from twisted.internet import defer
+from twisted.internet.interfaces import IPushProducer
+from zope.interface import implementer
+
+REPLY_CHUNK_SIZE = 65536
+
+
+def iter_serialized(element, pretty_print=False, chunk_size=REPLY_CHUNK_SIZE):
+    """
+    Serializes element and yields the output in pieces of at most chunk_size bytes, so it can be written a piece at
+    a time as the transport accepts it.
+    """
+    data = etree.tostring(element, pretty_print=pretty_print)
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset:offset + chunk_size]
+
+
+@implementer(IPushProducer)
+class ReplyProducer(object):
+    """
+    Writes pieces of data to a transport as long as it is not paused.
+
+    When the transport is a consumer, the producer registers itself so the transport can pause it while its
+    buffers are full, a full SSH channel window for example.  Otherwise everything is written at once.
+    """
+
+    def __init__(self, transport, pieces):
+        self.transport = transport
+        self.pieces = pieces
+        self.paused = False
+        self.registered = False
+        self.writing = False
+        self.done = defer.Deferred()
+
+    def start(self):
+        """
+        Returns a deferred firing once every piece was written.
+        """
+        if hasattr(self.transport, "registerProducer"):
+            self.transport.registerProducer(self, True)
+            self.registered = True
+        self.resumeProducing()
+        return self.done
+
+    def resumeProducing(self):
+        self.paused = False
+        if self.writing:
+            return
+
+        self.writing = True
+        try:
+            while not self.paused and self.pieces is not None:
+                try:
+                    data = next(self.pieces)
+                except StopIteration:
+                    self._finish()
+                else:
+                    self.transport.write(data)
+        finally:
+            self.writing = False
+
+    def pauseProducing(self):
+        self.paused = True
+
+    def stopProducing(self):
+        if self.pieces is not None:
+            self.pieces.close()
+            self._finish()
+
+    def _finish(self):
+        self.pieces = None
+        if self.registered:
+            self.registered = False
+            self.transport.unregisterProducer()
+        self.done.callback(None)
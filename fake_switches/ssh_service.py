@@ -18,11 +18,10 @@ import warnings
 from twisted.cred import portal, checkers
 from twisted.conch import avatar, interfaces as conchinterfaces
 from twisted.conch.ssh import factory, keys, session
-from twisted.conch.insults import insults
 from zope.interface import implementer
 
 from fake_switches import transports
-from fake_switches.terminal.ssh import SwitchSSHShell
+from fake_switches.terminal.ssh import SwitchSSHShell, SwitchSSHServerProtocol
 
 
 warnings.warn("Please use transports.ssh_service", DeprecationWarning)
@@ -40,7 +39,7 @@ class SSHDemoAvatar(avatar.ConchUser):
             self.subsystemLookup.update({b'netconf': netconf_protocol})
 
     def openShell(self, protocol):
-        server_protocol = insults.ServerProtocol(SwitchSSHShell, self, switch_core=self.switch_core)
+        server_protocol = SwitchSSHServerProtocol(SwitchSSHShell, self, switch_core=self.switch_core)
         server_protocol.makeConnection(protocol)
         protocol.makeConnection(session.wrapProtocol(server_protocol))
 
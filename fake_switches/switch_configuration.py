@@ -12,13 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import re
-from time import sleep
+from collections import namedtuple
+from contextlib import contextmanager
+from copy import copy, deepcopy
 
 from netaddr import IPNetwork, IPAddress
+from twisted.internet import defer, task
+
+from fake_switches.vlan_set import VlanSet
+
+_DIGIT = re.compile(r'\d')
+
+
+VLAN_MEMBERSHIPS = ("access", "native", "tagged")
+
+ConfigurationChange = namedtuple("ConfigurationChange", ["version", "action", "target", "attribute"])
 
 
 class SwitchConfiguration(object):
-    def __init__(self, ip, name="", auto_enabled=False, privileged_passwords=None, ports=None, vlans=None, objects_overrides=None, commit_delay=0):
+    def __init__(self, ip, name="", auto_enabled=False, privileged_passwords=None, ports=None, vlans=None, objects_overrides=None, commit_delay=0, clock=None,
+                 log_level=None, log_payload_limit=None):
         self.ip = ip
         self.name = name
         self.privileged_passwords = privileged_passwords or []
@@ -26,8 +39,17 @@ class SwitchConfiguration(object):
         self.vlans = []
         self.ports = []
         self.static_routes = []
-        self.vrfs = [VRF('DEFAULT-LAN')]
+        self.vrfs = []
         self.locked = False
+        self._vlans_by_number = {}
+        self._vlans_by_name = {}
+        self._ports_by_name = {}
+        self._ports_by_number_suffix = {}
+        self._vrfs_by_name = {}
+        self._static_routes_by_dest = {}
+        self._vlan_members = dict((membership, {}) for membership in VLAN_MEMBERSHIPS)
+        self._port_sequence = {}
+        self._next_port_sequence = 0
         self.objects_factory = {
             "Route": Route,
             "VRF": VRF,
@@ -38,7 +60,12 @@ class SwitchConfiguration(object):
             "AggregatedPort": AggregatedPort,
         }
         self.commit_delay = commit_delay
+        self.clock = clock
+        self.log_level = log_level
+        self.log_payload_limit = log_payload_limit
+        self.journal = ConfigurationJournal()
 
+        self.add_vrf(VRF('DEFAULT-LAN'))
         if vlans:
             [self.add_vlan(v) for v in vlans]
         if ports:
@@ -46,46 +73,102 @@ class SwitchConfiguration(object):
         if objects_overrides:
             self.objects_factory.update(objects_overrides)
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        journal = self.__dict__.get("journal")
+        if journal is not None and not name.startswith("_") and name != "journal":
+            journal.record("changed", self, name)
+
+    @property
+    def version(self):
+        return self.journal.version
+
+    def subscribe(self, callback):
+        return self.journal.subscribe(callback)
+
+    def unsubscribe(self, callback):
+        self.journal.unsubscribe(callback)
+
     def new(self, class_name, *args, **kwargs):
-        return self.objects_factory[class_name](*args, **kwargs)
+        obj = self.objects_factory[class_name](*args, **kwargs)
+        if isinstance(obj, TrackedObject) and obj.switch_configuration is None:
+            obj.switch_configuration = self
+        return obj
 
     def add_static_route(self, route):
         self.static_routes.append(route)
+        _index_add(self._static_routes_by_dest, route.dest, route)
+        self.journal.record("added", route)
 
     def remove_static_route(self, destination, mask):
         subnet = IPNetwork("{}/{}".format(destination, mask))
-        route = next(route for route in self.static_routes if route.dest == subnet)
+        route = next(iter(self._static_routes_by_dest.get(subnet, [])))
+        _index_remove(self._static_routes_by_dest, subnet, route)
         self.static_routes.remove(route)
+        self.journal.record("removed", route)
 
     def get_vlan(self, number):
-        return next((vlan for vlan in self.vlans if vlan.number == number), None)
+        return _index_get(self._vlans_by_number, number)
 
     def get_vlan_by_name(self, name):
-        return next((vlan for vlan in self.vlans if vlan.name == name), None)
+        return _index_get(self._vlans_by_name, name)
 
     def add_vlan(self, vlan):
         self.vlans.append(vlan)
         vlan.switch_configuration = self
+        _index_add(self._vlans_by_number, vlan.number, vlan)
+        _index_add(self._vlans_by_name, vlan.name, vlan)
+        self.journal.record("added", vlan)
 
     def remove_vlan(self, vlan):
         vlan.switch_configuration = None
         self.vlans.remove(vlan)
+        _index_remove(self._vlans_by_number, vlan.number, vlan)
+        _index_remove(self._vlans_by_name, vlan.name, vlan)
+        self.journal.record("removed", vlan)
 
     def get_port(self, name):
-        return next((port for port in self.ports if port.name == name), None)
+        return _index_get(self._ports_by_name, name)
 
     def add_port(self, port):
         self.ports.append(port)
         port.switch_configuration = self
+        _index_add(self._ports_by_name, port.name, port)
+        prefix, suffixes = _partial_name_keys(port.name)
+        self._port_sequence[port] = self._next_port_sequence
+        self._next_port_sequence += 1
+        for membership, vlans in port.get_vlan_memberships():
+            self._port_vlans_changed(port, membership, [], vlans)
+        self.journal.record("added", port)
+        for suffix in suffixes:
+            _index_add(self._ports_by_number_suffix, suffix, (prefix, port))
 
     def remove_port(self, port):
         port.switch_configuration = None
         self.ports.remove(port)
+        _index_remove(self._ports_by_name, port.name, port)
+        for membership, vlans in port.get_vlan_memberships():
+            self._port_vlans_changed(port, membership, vlans, [])
+        del self._port_sequence[port]
+        self.journal.record("removed", port)
+        for suffix in _partial_name_keys(port.name)[1]:
+            bucket = self._ports_by_number_suffix[suffix]
+            bucket[:] = [entry for entry in bucket if entry[1] is not port]
+            if not bucket:
+                del self._ports_by_number_suffix[suffix]
 
     def get_port_by_partial_name(self, name):
         partial_name, number = split_port_name(name.lower())
+        partial_name = partial_name.strip()
 
-        return next((port for port in self.ports if port.name.lower().startswith(partial_name.strip()) and port.name.lower().endswith(number.strip())), None)
+        return next((port for prefix, port in self._ports_by_number_suffix.get(number.strip(), [])
+                     if prefix.startswith(partial_name)), None)
+
+    def get_vlan_members(self, *memberships):
+        ports = set()
+        for membership, number in memberships:
+            ports.update(self._vlan_members[membership].get(number, ()))
+        return sorted(ports, key=self._port_sequence.__getitem__)
 
     def get_port_and_ip_by_ip(self, ip_string):
         for port in [e for e in self.ports if isinstance(e, VlanPort)]:
@@ -97,17 +180,20 @@ class SwitchConfiguration(object):
     def add_vrf(self, vrf):
         if not self.get_vrf(vrf.name):
             self.vrfs.append(vrf)
+            _index_add(self._vrfs_by_name, vrf.name, vrf)
+            self.journal.record("added", vrf)
 
     def get_vrf(self, name):
-        return next((vrf for vrf in self.vrfs if vrf.name == name), None)
+        return _index_get(self._vrfs_by_name, name)
 
     def remove_vrf(self, name):
         vrf = self.get_vrf(name)
         if vrf:
             self.vrfs.remove(vrf)
-            for port in self.ports:
-                if port.vrf and port.vrf.name == name:
-                    port.vrf = None
+            _index_remove(self._vrfs_by_name, name, vrf)
+            for port in [p for p in self.ports if p.vrf and p.vrf.name == name]:
+                self._for_update(port).vrf = None
+            self.journal.record("removed", vrf)
 
     def get_physical_ports(self):
         return [p for p in self.ports if not (isinstance(p, VlanPort) or isinstance(p, AggregatedPort))]
@@ -116,16 +202,293 @@ class SwitchConfiguration(object):
         return [p for p in self.ports if isinstance(p, VlanPort)]
 
     def commit(self):
-        sleep(self.commit_delay)
+        """
+        Returns a deferred firing once the configuration is saved, after commit_delay seconds
+        """
+        if not self.commit_delay:
+            return defer.succeed(None)
+
+        return task.deferLater(self.get_clock(), self.commit_delay, lambda: None)
+
+    def get_clock(self):
+        if self.clock is None:
+            from twisted.internet import reactor
+            return reactor
+        return self.clock
+
+    def clone(self, obj):
+        memo = {}
+        if obj.switch_configuration is not None:
+            memo[id(obj.switch_configuration)] = self
+            for vrf in obj.switch_configuration.vrfs:
+                memo[id(vrf)] = _index_get(self._vrfs_by_name, vrf.name) or vrf
+        return deepcopy(obj, memo)
+
+    def _for_update(self, obj):
+        return obj
+
+    def _replace(self, old, new):
+        if old in self._port_sequence:
+            self.ports[self.ports.index(old)] = new
+            _index_replace(self._ports_by_name, old.name, old, new)
+            prefix, suffixes = _partial_name_keys(old.name)
+            for suffix in suffixes:
+                bucket = self._ports_by_number_suffix[suffix]
+                bucket[:] = [(prefix, new) if entry[1] is old else entry for entry in bucket]
+            for membership, vlans in old.get_vlan_memberships():
+                for number in set(vlans):
+                    ports = self._vlan_members[membership][number]
+                    ports[new] = ports.pop(old)
+            self._port_sequence[new] = self._port_sequence.pop(old)
+        elif _index_replace(self._vlans_by_name, getattr(old, "name", None), old, new):
+            self.vlans[self.vlans.index(old)] = new
+            _index_replace(self._vlans_by_number, old.number, old, new)
+        elif _index_replace(self._vrfs_by_name, getattr(old, "name", None), old, new):
+            self.vrfs[self.vrfs.index(old)] = new
+        elif _index_replace(self._static_routes_by_dest, getattr(old, "dest", None), old, new):
+            self.static_routes[self.static_routes.index(old)] = new
+
+    def _object_changed(self, obj, attribute):
+        self.journal.record("changed", obj, attribute)
+
+    def _vlan_key_changed(self, vlan, attribute, old_value, new_value):
+        index = self._vlans_by_number if attribute == "number" else self._vlans_by_name
+        if _index_remove(index, old_value, vlan):
+            _index_add(index, new_value, vlan)
+
+    def _port_vlans_changed(self, port, membership, removed, added):
+        if port not in self._port_sequence:
+            return
+        members = self._vlan_members[membership]
+        for number in removed:
+            ports = members.get(number, {})
+            if port in ports:
+                ports[port] -= 1
+                if ports[port] == 0:
+                    del ports[port]
+                if not ports:
+                    del members[number]
+        for number in added:
+            ports = members.setdefault(number, {})
+            ports[port] = ports.get(port, 0) + 1
+
+
+class CopyOnWriteConfiguration(SwitchConfiguration):
+    """
+    A configuration sharing its objects with a base configuration.
+
+    Nothing is copied until the configuration is first used, and then only the lists and indexes are.  An object is
+    copied the first time it is obtained through one of the lookup methods, so every object that may be modified
+    belongs to this configuration while the others remain shared with the base.  Objects reached by iterating the
+    public lists are the shared ones and must only be read, guarding_base() enforces it while modifying the copy.
+    """
+
+    def __init__(self, base):
+        self.__dict__["_base"] = base
+        self.__dict__["journal"] = ConfigurationJournal(base.version)
+
+    def __getattr__(self, name):
+        if name.startswith("__") or "_base" not in self.__dict__ or "_materialized" in self.__dict__:
+            raise AttributeError(name)
+        self._materialize()
+        return getattr(self, name)
+
+    def _materialize(self):
+        self.__dict__["_materialized"] = True
+        if isinstance(self._base, CopyOnWriteConfiguration) and "_materialized" not in self._base.__dict__:
+            self._base._materialize()
+        for name, value in self._base.__dict__.items():
+            if name not in self.__dict__:
+                self.__dict__[name] = copy(value) if isinstance(value, (list, dict)) else value
+        for name in ("_vlans_by_number", "_vlans_by_name", "_ports_by_name", "_ports_by_number_suffix",
+                     "_vrfs_by_name", "_static_routes_by_dest"):
+            self.__dict__[name] = dict((key, list(bucket)) for key, bucket in self.__dict__[name].items())
+        self.__dict__["_vlan_members"] = dict(
+            (membership, dict((number, dict(ports)) for number, ports in members.items()))
+            for membership, members in self._vlan_members.items())
+
+    @contextmanager
+    def guarding_base(self):
+        """
+        Raises SharedObjectModified as soon as the base configuration changes within the block, which can only be an
+        object shared with it being modified instead of its private copy.
+        """
+
+        def base_changed(change):
+            raise SharedObjectModified("{} was {} on the base configuration".format(change.target, change.action))
+
+        self._base.subscribe(base_changed)
+        try:
+            yield self
+        finally:
+            self._base.unsubscribe(base_changed)
+
+    def _for_update(self, obj):
+        if obj is None or getattr(obj, "switch_configuration", None) is self:
+            return obj
+        private_copy = self.clone(obj)
+        private_copy.switch_configuration = self
+        self._replace(obj, private_copy)
+        return private_copy
+
+    def get_vlan(self, number):
+        return self._for_update(super(CopyOnWriteConfiguration, self).get_vlan(number))
+
+    def get_vlan_by_name(self, name):
+        return self._for_update(super(CopyOnWriteConfiguration, self).get_vlan_by_name(name))
+
+    def get_port(self, name):
+        return self._for_update(super(CopyOnWriteConfiguration, self).get_port(name))
+
+    def get_port_by_partial_name(self, name):
+        return self._for_update(super(CopyOnWriteConfiguration, self).get_port_by_partial_name(name))
+
+    def get_vrf(self, name):
+        return self._for_update(super(CopyOnWriteConfiguration, self).get_vrf(name))
+
+    def get_vlan_members(self, *memberships):
+        return [self._for_update(p) for p in super(CopyOnWriteConfiguration, self).get_vlan_members(*memberships)]
+
+    def get_port_and_ip_by_ip(self, ip_string):
+        port, ip = super(CopyOnWriteConfiguration, self).get_port_and_ip_by_ip(ip_string)
+        if port is None:
+            return None, None
+        index = port.ips.index(ip)
+        port = self._for_update(port)
+        return port, port.ips[index]
+
+    def get_physical_ports(self):
+        return [self._for_update(p) for p in super(CopyOnWriteConfiguration, self).get_physical_ports()]
+
+    def get_vlan_ports(self):
+        return [self._for_update(p) for p in super(CopyOnWriteConfiguration, self).get_vlan_ports()]
+
+
+class SharedObjectModified(Exception):
+    pass
+
+
+class ConfigurationJournal(object):
+    def __init__(self, version=0):
+        self.version = version
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def record(self, action, target, attribute=None):
+        self.version += 1
+        change = ConfigurationChange(self.version, action, target, attribute)
+        for callback in list(self.subscribers):
+            callback(change)
+
+    def __deepcopy__(self, memo):
+        return ConfigurationJournal(self.version)
+
+
+class TrackedObject(object):
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        if name.startswith("_") or name == "switch_configuration":
+            object.__setattr__(self, name, value)
+        else:
+            if not isinstance(getattr(type(self), name, None), property):
+                value = _tracked_value(self, name, value)
+            object.__setattr__(self, name, value)
+            self._attribute_changed(name)
+
+    def __setstate__(self, state):
+        for attributes in (state if isinstance(state, tuple) else (state,)):
+            for name, value in (attributes or {}).items():
+                object.__setattr__(self, name, value)
+
+    def _attribute_changed(self, attribute):
+        configuration = getattr(self, "switch_configuration", None)
+        if configuration is not None:
+            configuration._object_changed(self, attribute)
+
+
+class TrackedList(list):
+    __slots__ = ("owner", "attribute")
+
+    def __init__(self, owner=None, attribute=None, items=()):
+        super(TrackedList, self).__init__(items)
+        self.owner = owner
+        self.attribute = attribute
+
+    def __deepcopy__(self, memo):
+        copy = TrackedList(memo.get(id(self.owner)), self.attribute)
+        memo[id(self)] = copy
+        list.extend(copy, [deepcopy(item, memo) for item in self])
+        return copy
+
+    def _changed(self):
+        if self.owner is not None:
+            self.owner._attribute_changed(self.attribute)
+
+
+class TrackedDict(dict):
+    __slots__ = ("owner", "attribute")
+
+    def __init__(self, owner=None, attribute=None, items=()):
+        super(TrackedDict, self).__init__(items)
+        self.owner = owner
+        self.attribute = attribute
+
+    def __deepcopy__(self, memo):
+        copy = TrackedDict(memo.get(id(self.owner)), self.attribute)
+        memo[id(self)] = copy
+        dict.update(copy, [(deepcopy(key, memo), deepcopy(value, memo)) for key, value in self.items()])
+        return copy
+
+    def _changed(self):
+        if self.owner is not None:
+            self.owner._attribute_changed(self.attribute)
 
 
-class VRF(object):
+def _notifying(method):
+    def notifying_method(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._changed()
+        return result
+
+    notifying_method.__name__ = method.__name__
+    return notifying_method
+
+
+for _method in ("append", "extend", "insert", "remove", "pop", "sort", "reverse", "clear", "__setitem__",
+                "__delitem__", "__iadd__", "__imul__", "__setslice__", "__delslice__"):
+    if hasattr(list, _method):
+        setattr(TrackedList, _method, _notifying(getattr(list, _method)))
+
+for _method in ("__setitem__", "__delitem__", "pop", "popitem", "setdefault", "update", "clear"):
+    setattr(TrackedDict, _method, _notifying(getattr(dict, _method)))
+
+
+def _tracked_value(owner, attribute, value):
+    if type(value) is list or (type(value) is TrackedList and value.owner is not owner):
+        return TrackedList(owner, attribute, value)
+    if type(value) is dict or (type(value) is TrackedDict and value.owner is not owner):
+        return TrackedDict(owner, attribute, value)
+    return value
+
+
+class VRF(TrackedObject):
     def __init__(self, name):
+        self.switch_configuration = None
         self.name = name
 
 
-class Route(object):
+class Route(TrackedObject):
+    __slots__ = ("switch_configuration", "dest", "next_hop")
+
     def __init__(self, destination, mask, next_hop):
+        self.switch_configuration = None
         self.dest = IPNetwork("{}/{}".format(destination, mask))
         self.next_hop = IPAddress(next_hop)
 
@@ -138,16 +501,46 @@ class Route(object):
         return self.dest.netmask
 
 
-class Vlan(object):
+class Vlan(TrackedObject):
+    __slots__ = ("switch_configuration", "_number", "_name", "description", "vendor_specific")
+
     def __init__(self, number=None, name=None, description=None, switch_configuration=None):
+        self.switch_configuration = switch_configuration
         self.number = number
         self.name = name
         self.description = description
-        self.switch_configuration = switch_configuration
         self.vendor_specific = {}
 
+    @property
+    def number(self):
+        return self._number
+
+    @number.setter
+    def number(self, value):
+        self._set_key("number", value)
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._set_key("name", value)
+
+    def _set_key(self, attribute, value):
+        old_value = getattr(self, "_" + attribute, None)
+        setattr(self, "_" + attribute, value)
+        if getattr(self, "switch_configuration", None) is not None:
+            self.switch_configuration._vlan_key_changed(self, attribute, old_value, value)
+
+
+class Port(TrackedObject):
+    __slots__ = ("name", "switch_configuration", "description", "mode", "_access_vlan", "_trunk_vlans",
+                 "_trunk_native_vlan", "trunk_encapsulation_mode", "shutdown", "vrf", "speed", "auto_negotiation",
+                 "aggregation_membership", "mtu", "vendor_specific", "ip_helpers", "lldp_transmit", "lldp_receive",
+                 "lldp_med", "lldp_med_transmit_capabilities", "lldp_med_transmit_network_policy", "spanning_tree",
+                 "spanning_tree_portfast", "ntp")
 
-class Port(object):
     def __init__(self, name):
         self.name = name
         self.switch_configuration = None
@@ -181,9 +574,71 @@ class Port(object):
         name, number = split_port_name(self.name)
         return name[:length] + number
 
+    def get_vlan_memberships(self):
+        return [("access", [self.access_vlan]),
+                ("native", [self.trunk_native_vlan]),
+                ("tagged", list(self.trunk_vlans or []))]
+
+    @property
+    def access_vlan(self):
+        return self._access_vlan
+
+    @access_vlan.setter
+    def access_vlan(self, value):
+        self._vlan_membership_changed("access", [getattr(self, "_access_vlan", None)], [value])
+        self._access_vlan = value
+
+    @property
+    def trunk_native_vlan(self):
+        return self._trunk_native_vlan
+
+    @trunk_native_vlan.setter
+    def trunk_native_vlan(self, value):
+        self._vlan_membership_changed("native", [getattr(self, "_trunk_native_vlan", None)], [value])
+        self._trunk_native_vlan = value
+
+    @property
+    def trunk_vlans(self):
+        return self._trunk_vlans
+
+    @trunk_vlans.setter
+    def trunk_vlans(self, value):
+        current = getattr(self, "_trunk_vlans", None)
+        if value is not None:
+            if value is current:
+                return
+            value = TrunkVlans(self, value)
+        self._vlan_membership_changed("tagged", list(current or []), list(value or []))
+        self._trunk_vlans = value
+
+    def _vlan_membership_changed(self, membership, removed, added):
+        if getattr(self, "switch_configuration", None) is not None:
+            self.switch_configuration._port_vlans_changed(self, membership, removed, added)
+
+
+class TrunkVlans(VlanSet):
+    __slots__ = ("port",)
+
+    def __init__(self, port, vlans=()):
+        super(TrunkVlans, self).__init__(vlans)
+        self.port = port
+
+    def __deepcopy__(self, memo):
+        return TrunkVlans(memo.get(id(self.port)), self)
+
+    def _changed(self, removed, added):
+        if self.port is not None:
+            self.port._vlan_membership_changed("tagged", removed, added)
+            self.port._attribute_changed("trunk_vlans")
+
+
+class VRRP(TrackedObject):
+    __slots__ = ("switch_configuration", "group_id", "ip_addresses", "description", "authentication", "timers_hello", "timers_hold",
+                 "priority", "track", "preempt", "preempt_delay_minimum", "activated", "advertising",
+                 "related_ip_network", "vendor_specific")
 
-class VRRP(object):
     def __init__(self, group_id):
+        self.switch_configuration = None
         self.group_id = group_id
         self.ip_addresses = None
         self.description = None
@@ -201,6 +656,10 @@ class VRRP(object):
 
 
 class VlanPort(Port):
+    __slots__ = ("vlan_id", "access_group_in", "access_group_out", "ips", "secondary_ips", "vrrp_common_authentication",
+                 "vrrp_version", "vrrps", "varp_addresses", "ip_redirect", "ip_proxy_arp",
+                 "unicast_reverse_path_forwarding", "load_interval", "mpls_ip")
+
     def __init__(self, vlan_id, *args, **kwargs):
         super(VlanPort, self).__init__(*args, **kwargs)
 
@@ -245,6 +704,8 @@ class VlanPort(Port):
 
 
 class AggregatedPort(Port):
+    __slots__ = ("lacp_active", "lacp_periodic")
+
     def reset(self):
         self.lacp_active = False
         self.lacp_periodic = None
@@ -255,6 +716,43 @@ class AggregatedPort(Port):
         return [p for p in self.switch_configuration.ports if p.aggregation_membership == self.name and p.link_name is not None]
 
 
+def _index_get(index, key):
+    bucket = index.get(key)
+    return bucket[0] if bucket else None
+
+
+def _index_add(index, key, obj):
+    index.setdefault(key, []).append(obj)
+
+
+def _index_remove(index, key, obj):
+    bucket = index.get(key, [])
+    for i, candidate in enumerate(bucket):
+        if candidate is obj:
+            bucket.pop(i)
+            if not bucket:
+                del index[key]
+            return True
+    return False
+
+
+def _index_replace(index, key, old, new):
+    bucket = index.get(key, [])
+    for i, candidate in enumerate(bucket):
+        if candidate is old:
+            bucket[i] = new
+            return True
+    return False
+
+
+def _partial_name_keys(name):
+    name = name.lower()
+    digits = [m.start() for m in _DIGIT.finditer(name)]
+    if not digits:
+        return name, []
+    return name[0:digits[0]], [name[start:] for start in digits]
+
+
 def split_port_name(name):
-    number_start, number_len = re.compile('\d').search(name).span()
+    number_start, number_len = _DIGIT.search(name).span()
     return name[0:number_start], name[number_start:]
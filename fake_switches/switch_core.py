@@ -12,14 +12,68 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+
+from fake_switches.clock import VirtualClock
+from fake_switches.terminal import BufferingTerminalController
+
 
 class SwitchCore(object):
     def __init__(self, switch_configuration):
         self.switch_configuration = switch_configuration
+        self.last_connection_id = 0
+
+    def new_connection_logger(self, vendor, protocol):
+        """
+        Returns the logger of a new connection.  All connections share the switch's logger, the records
+        carrying the connection id and protocol instead of them being part of a new logger name.
+        """
+        self.last_connection_id += 1
+        logger = logging.getLogger("fake_switches.%s.%s" % (vendor, self.switch_configuration.name))
+        if self.switch_configuration.log_level is not None:
+            logger.setLevel(self.switch_configuration.log_level)
+        return ConnectionLoggerAdapter(logger, {"connection_id": self.last_connection_id, "protocol": protocol})
 
     def launch(self, protocol, terminal_controller):
         raise NotImplementedError()
 
+    def execute(self, commands, protocol="api"):
+        """
+        Runs CLI lines through a new session of this switch, in-process, and returns the output of each line
+        without the prompt that follows it.
+
+        A line given while the switch waits for a keystroke (a "(y/n)" confirmation, a pager) answers it.
+        Commands that complete later, like a commit with a commit_delay, require the configuration to use a
+        VirtualClock: it is advanced until they are done.
+        """
+        terminal_controller = BufferingTerminalController()
+        session = self.launch(protocol, terminal_controller)
+        terminal_controller.pop()
+
+        outputs = []
+        try:
+            for line in commands:
+                if terminal_controller.any_key_handler is not None:
+                    callback, params = terminal_controller.any_key_handler
+                    callback(*(params + (line,)))
+                elif not session.receive(line):
+                    outputs.append(terminal_controller.pop())
+                    break
+
+                self._complete_command(session)
+                outputs.append(_strip_prompt(session.command_processor, terminal_controller.pop()))
+        finally:
+            session.close()
+
+        return outputs
+
+    def _complete_command(self, session):
+        while session.command_in_progress() is not None:
+            clock = self.switch_configuration.clock
+            if not isinstance(clock, VirtualClock) or not clock.calls:
+                raise CommandStillRunning("A command is waiting on the reactor, the switch needs a VirtualClock")
+            clock.advance_to_next_call()
+
     @staticmethod
     def get_default_ports():
         raise NotImplementedError()
@@ -29,3 +83,22 @@ class SwitchCore(object):
 
     def get_http_resource(self):
         raise NotImplementedError()
+
+
+class ConnectionLoggerAdapter(logging.LoggerAdapter):
+    def process(self, msg, kwargs):
+        kwargs["extra"] = self.extra
+        return "[%s.%s] %s" % (self.extra["connection_id"], self.extra["protocol"], msg), kwargs
+
+
+class CommandStillRunning(Exception):
+    pass
+
+
+def _strip_prompt(command_processor, output):
+    while command_processor.sub_processor is not None:
+        command_processor = command_processor.sub_processor
+    prompt = command_processor.get_prompt()
+    if prompt and output.endswith(prompt):
+        return output[:-len(prompt)]
+    return output
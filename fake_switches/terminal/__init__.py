@@ -12,14 +12,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
 import re
 
+from fake_switches.log_payload import LogPayload
+
+
+_LONE_LF = re.compile(u"(?<!\r)\n")
+_LONE_LF_BYTES = re.compile(b"(?<!\r)\n")
+
 
 def lf_to_crlf(text):
-    nb_subst = 1
-    while nb_subst:
-        text, nb_subst = re.subn("(^|[^\r])\n", "\\1\r\n", text)
-    return text
+    return _LONE_LF.sub(u"\r\n", text)
+
+
+class CrlfTranslator(object):
+    """
+    Replaces lone line feeds by CRLF in a single pass over text or bytes.  A write ending with a carriage
+    return is remembered so a line feed starting the next one is not doubled.
+    """
+
+    def __init__(self):
+        self.ended_with_cr = False
+
+    def translate(self, data):
+        if not data:
+            return data
+
+        if isinstance(data, bytes):
+            translated = _LONE_LF_BYTES.sub(b"\r\n", data)
+            starts_with_lf, ends_with_cr = data[:1] == b"\n", data[-1:] == b"\r"
+        else:
+            translated = _LONE_LF.sub(u"\r\n", data)
+            starts_with_lf, ends_with_cr = data[:1] == u"\n", data[-1:] == u"\r"
+
+        if starts_with_lf and self.ended_with_cr:
+            translated = translated[1:]
+        self.ended_with_cr = ends_with_cr
+        return translated
 
 
 class TerminalController(object):
@@ -39,8 +69,14 @@ class TerminalController(object):
 
     Resume normal input handling:
     >>> terminal_controller.remove_any_key_handler()
+
+    The number of lines per page chosen with "terminal length", 0 disabling
+    paging and None leaving each command to its default:
+    >>> terminal_controller.terminal_length = 0
     """
 
+    terminal_length = None
+
     def write(self, text):
         """
         Write text on the terminal.  Some implementation may replace the text
@@ -48,6 +84,19 @@ class TerminalController(object):
         """
         raise NotImplemented()
 
+    def write_bytes(self, data):
+        """
+        Write already utf-8 encoded text on the terminal, sparing a decoding
+        and an encoding when the transport takes bytes.
+        """
+        self.write(data.decode("utf-8"))
+
+    def flush(self):
+        """
+        Send what was written so far if the terminal holds it back.
+        """
+        return None
+
     def add_any_key_handler(self, callback, *params):
         """
         Registers a function as a callback to intercept every "printable"
@@ -70,20 +119,32 @@ class TerminalController(object):
 
 class LoggingTerminalController(TerminalController):
 
-    def __init__(self, logger, terminal_controller):
+    def __init__(self, logger, terminal_controller, payload_limit=None):
         """
         :param logger: log everything written on the terminal as debug
         :type logger: logging.Logger
         :param terminal_controller: the real terminal controller
         :type terminal_controller: TerminalController
+        :param payload_limit: number of characters logged from each write, all of them when None
+        :type payload_limit: int
         """
         self.logger = logger
         self.terminal_controller = terminal_controller
+        self.payload_limit = payload_limit
 
     def write(self, text):
-        self.logger.debug("replying: %s" % repr(text))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("replying: %s", LogPayload(text, self.payload_limit))
         return self.terminal_controller.write(text)
 
+    def write_bytes(self, data):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("replying: %s", LogPayload(data, self.payload_limit))
+        return self.terminal_controller.write_bytes(data)
+
+    def flush(self):
+        return self.terminal_controller.flush()
+
     def add_any_key_handler(self, callback, *params):
         return self.terminal_controller.add_any_key_handler(callback, *params)
 
@@ -91,6 +152,38 @@ class LoggingTerminalController(TerminalController):
         return self.terminal_controller.remove_any_key_handler()
 
 
+class CoalescingTerminalController(TerminalController):
+    """
+    Holds back what is written until flushed, or until flush_size bytes are pending, so a command's whole output
+    reaches the transport in a few writes instead of one per line.
+    """
+
+    flush_size = 16384
+
+    def __init__(self):
+        self.pending = []
+        self.pending_size = 0
+
+    def write(self, text):
+        self.write_bytes(text.encode("utf-8"))
+
+    def write_bytes(self, data):
+        self.pending.append(data)
+        self.pending_size += len(data)
+        if self.pending_size >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            data = b"".join(self.pending)
+            self.pending = []
+            self.pending_size = 0
+            self.send(data)
+
+    def send(self, data):
+        raise NotImplementedError()
+
+
 class NoopTerminalController(TerminalController):
 
     def write(self, text):
@@ -101,3 +194,24 @@ class NoopTerminalController(TerminalController):
 
     def remove_any_key_handler(self):
         return None
+
+
+class BufferingTerminalController(TerminalController):
+
+    def __init__(self):
+        self.buffer = []
+        self.any_key_handler = None
+
+    def pop(self):
+        buffer = u"".join(self.buffer)
+        self.buffer = []
+        return buffer
+
+    def write(self, text):
+        self.buffer.append(text)
+
+    def add_any_key_handler(self, callback, *params):
+        self.any_key_handler = (callback, params)
+
+    def remove_any_key_handler(self):
+        self.any_key_handler = None
@@ -12,8 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
+
 from twisted.conch import recvline
-from fake_switches.terminal import TerminalController
+from twisted.conch.insults import insults
+from fake_switches.terminal import CoalescingTerminalController
+
+_LINE_END = re.compile(b"[\r\n]")
+_SPECIAL_KEY = re.compile(b"[^ -~]")
 
 
 class SwitchSSHShell(recvline.HistoricRecvLine):
@@ -22,6 +28,7 @@ class SwitchSSHShell(recvline.HistoricRecvLine):
         self.switch_core = switch_core
         self.session = None
         self.awaiting_keystroke = None
+        self.pending_lines = None
 
     # Hack to get rid of magical characters that reset the screen / clear / goto position 0, 0
     def initializeScreen(self):
@@ -33,12 +40,57 @@ class SwitchSSHShell(recvline.HistoricRecvLine):
             shell=self
         ))
 
+    def connectionLost(self, reason):
+        recvline.HistoricRecvLine.connectionLost(self, reason)
+        if self.session is not None:
+            self.session.close()
+
     def lineReceived(self, line):
-        line = line.decode()
-        still_listening = self.session.receive(line)
+        if self._command_in_progress():
+            self.pending_lines.append(line)
+            return
+
+        still_listening = self.session.receive(line.decode())
         if not still_listening:
             self.terminal.loseConnection()
 
+    def _command_in_progress(self):
+        if self.pending_lines is None:
+            command_in_progress = self.session.command_in_progress()
+            if command_in_progress is None:
+                return False
+            self.pending_lines = []
+            command_in_progress.addCallback(self._command_completed)
+        return True
+
+    def _command_completed(self, _):
+        lines, self.pending_lines = self.pending_lines, None
+        for line in lines:
+            self.lineReceived(line)
+
+    def textReceived(self, data):
+        """
+        Handles a block of plain text (no escape sequences) a line at a time rather than key by key.
+        """
+        while data:
+            if self.awaiting_keystroke is not None:
+                self.keystrokeReceived(data[:1], None)
+                data = data[1:]
+                continue
+
+            line_end = _LINE_END.search(data)
+            typed = data[:line_end.start()] if line_end else data
+            if _SPECIAL_KEY.search(typed):
+                for i in range(len(typed)):
+                    self.keystrokeReceived(typed[i:i + 1], None)
+            elif typed:
+                self.characterReceived(typed, False)
+            if line_end is None:
+                break
+
+            self.handle_RETURN()
+            data = data[line_end.end():]
+
     def keystrokeReceived(self, keyID, modifier):
         if keyID in self._printableChars:
             if self.awaiting_keystroke is not None:
@@ -58,11 +110,12 @@ class SwitchSSHShell(recvline.HistoricRecvLine):
         else:
             self.terminal.write((len(ch) * command_processor.replace_input).encode())
 
+        chars = [ch[i:i + 1] for i in range(len(ch))]
         if self.mode == 'insert':
-            self.lineBuffer.insert(self.lineBufferIndex, ch)
+            self.lineBuffer[self.lineBufferIndex:self.lineBufferIndex] = chars
         else:
-            self.lineBuffer[self.lineBufferIndex:self.lineBufferIndex+1] = [ch]
-        self.lineBufferIndex += 1
+            self.lineBuffer[self.lineBufferIndex:self.lineBufferIndex+len(chars)] = chars
+        self.lineBufferIndex += len(chars)
 
     def get_actual_processor(self):
         proc = self.session.command_processor
@@ -71,14 +124,52 @@ class SwitchSSHShell(recvline.HistoricRecvLine):
         return proc
 
 
-class SshTerminalController(TerminalController):
+class SwitchSSHServerProtocol(insults.ServerProtocol):
+    """
+    Sends plain text to the shell's textReceived and everything written while handling received data
+    in a single transport write.
+    """
+    _batch = None
+
+    def dataReceived(self, data):
+        self._batch = []
+        try:
+            if self.state == b"data" and b"\x1b" not in data:
+                self.terminalProtocol.textReceived(data)
+            else:
+                insults.ServerProtocol.dataReceived(self, data)
+        finally:
+            self._flush_batch()
+
+    def write(self, data):
+        if self._batch is None:
+            insults.ServerProtocol.write(self, data)
+        elif data:
+            if not isinstance(data, bytes):
+                data = data.encode("utf-8")
+            self.lastWrite = data
+            self._batch.append(b"\r\n".join(data.split(b"\n")))
+
+    def loseConnection(self):
+        self._flush_batch()
+        insults.ServerProtocol.loseConnection(self)
+
+    def _flush_batch(self):
+        batch, self._batch = self._batch, None
+        if batch:
+            self.transport.write(b"".join(batch))
+
+
+class SshTerminalController(CoalescingTerminalController):
     def __init__(self, shell):
+        super(SshTerminalController, self).__init__()
         self.shell = shell
 
-    def write(self, text):
-        self.shell.terminal.write(text.encode())
+    def send(self, data):
+        self.shell.terminal.write(data)
 
     def add_any_key_handler(self, callback, *params):
+        self.flush()
         self.shell.awaiting_keystroke = (callback, list(params))
 
     def remove_any_key_handler(self):
@@ -12,12 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
 import string
 
 from twisted.conch.telnet import ECHO, Telnet, SGA, CR, LF
 
-from fake_switches.terminal import lf_to_crlf
-from fake_switches.terminal import TerminalController
+from fake_switches.terminal import CrlfTranslator
+from fake_switches.terminal import CoalescingTerminalController
+
+_keystroke_line_end = re.compile("^(\r\n?|\n)")
 
 
 class StatefulTelnet(Telnet, object):
@@ -25,6 +28,9 @@ class StatefulTelnet(Telnet, object):
     This is an easy telnet service to mock a telnet server
     It does not implement everything a terminal does, only what
     automated code calling it would require, example : line editing.
+
+    Received data is handled a line at a time and everything written while handling it is sent
+    in a single transport write, so pasted blocks are not echoed key by key.
     """
 
     def __init__(self):
@@ -35,6 +41,10 @@ class StatefulTelnet(Telnet, object):
         self._key_handlers = None
         self._printable_chars = set(string.printable)
         self._replace_input = None
+        self._crlf = CrlfTranslator()
+        self._line_end = None
+        self._unprintable = re.compile("[^%s]" % re.escape(string.printable))
+        self._batch = None
 
     def connectionMade(self):
         self.will(ECHO)
@@ -46,22 +56,57 @@ class StatefulTelnet(Telnet, object):
             '\r': self._run_command,
             '\n': self._run_command,
         }
+        self._line_end = re.compile("|".join(re.escape(key) for key in self._key_handlers))
 
     def applicationDataReceived(self, data):
-        data_string = data.decode()
-        for key in data_string:
-            m = self._key_handlers.get(key)
-            if m is not None:
-                m()
-            elif key in self._printable_chars:
-                self._buffer += key
-                if self._replace_input is None:
-                    self.write(key)
-                elif self._replace_input != "":
-                    self.write(self._replace_input)
+        self._batch = []
+        try:
+            self._receive(data.decode())
+        finally:
+            self._flush_batch()
+
+    def _receive(self, data_string):
+        while data_string:
+            if self._keystroke_received(data_string[0]):
+                data_string = _keystroke_line_end.sub("", data_string[1:], count=1)
+                continue
+
+            line_end = self._line_end.search(data_string)
+            self._type(data_string[:line_end.start()] if line_end else data_string)
+            if line_end is None:
+                break
+
+            self._key_handlers[line_end.group()]()
+            data_string = data_string[line_end.end():]
+
+    def _keystroke_received(self, key):
+        return False
+
+    def _type(self, keys):
+        keys = self._unprintable.sub("", keys)
+        if keys:
+            self._buffer += keys
+            if self._replace_input is None:
+                self.write(keys)
+            elif self._replace_input != "":
+                self.write(self._replace_input * len(keys))
 
     def write(self, data):
-        self.transport.write(lf_to_crlf(data).encode())
+        self._send(self._crlf.translate(data).encode())
+
+    def write_bytes(self, data):
+        self._send(self._crlf.translate(data))
+
+    def _send(self, data):
+        if self._batch is not None:
+            self._batch.append(data)
+        else:
+            self.transport.write(data)
+
+    def _flush_batch(self):
+        batch, self._batch = self._batch, None
+        if batch:
+            self.transport.write(b"".join(batch))
 
     def writeln(self, data):
         self.write(data)
@@ -102,6 +147,7 @@ class SwitchTelnetShell(StatefulTelnet):
         self.switch_core = switch_core
         self.session = None
         self.awaiting_keystroke = None
+        self.pending_lines = None
 
     def connectionMade(self):
         super(SwitchTelnetShell, self).connectionMade()
@@ -119,7 +165,16 @@ class SwitchTelnetShell(StatefulTelnet):
             "telnet", TelnetTerminalController(shell=self))
         self.handler = self.command
 
+    def connectionLost(self, reason):
+        super(SwitchTelnetShell, self).connectionLost(reason)
+        if self.session is not None:
+            self.session.close()
+
     def command(self, line):
+        if self._command_in_progress():
+            self.pending_lines.append(line)
+            return
+
         keep_going = self.session.receive(line)
 
         if self.session.command_processor.replace_input is False:
@@ -128,18 +183,29 @@ class SwitchTelnetShell(StatefulTelnet):
             self.enable_input_replacement(self.session.command_processor.replace_input)
 
         if not keep_going:
+            self._flush_batch()
             self.transport.loseConnection()
 
-    def applicationDataReceived(self, data):
-        data_string = data.decode()
-        if data_string in self._printable_chars:
-            if self.awaiting_keystroke is not None:
-                args = self.awaiting_keystroke[1] + [data_string]
-                cmd = self.awaiting_keystroke[0]
-                cmd(*args)
-                return
+    def _command_in_progress(self):
+        if self.pending_lines is None:
+            command_in_progress = self.session.command_in_progress()
+            if command_in_progress is None:
+                return False
+            self.pending_lines = []
+            command_in_progress.addCallback(self._command_completed)
+        return True
+
+    def _command_completed(self, _):
+        lines, self.pending_lines = self.pending_lines, None
+        for line in lines:
+            self.command(line)
 
-        super(SwitchTelnetShell, self).applicationDataReceived(data)
+    def _keystroke_received(self, key):
+        if self.awaiting_keystroke is not None and key in self._printable_chars:
+            cmd, args = self.awaiting_keystroke
+            cmd(*(args + [key]))
+            return True
+        return False
 
     def get_actual_processor(self):
         if not self.session:
@@ -154,14 +220,16 @@ class SwitchTelnetShell(StatefulTelnet):
         return command_processor is not None and command_processor.keystroke(data)
 
 
-class TelnetTerminalController(TerminalController):
+class TelnetTerminalController(CoalescingTerminalController):
     def __init__(self, shell):
+        super(TelnetTerminalController, self).__init__()
         self.shell = shell
 
-    def write(self, text):
-        self.shell.write(text)
+    def send(self, data):
+        self.shell.write_bytes(data)
 
     def add_any_key_handler(self, callback, *params):
+        self.flush()
         self.shell.awaiting_keystroke = (callback, list(params))
 
     def remove_any_key_handler(self):
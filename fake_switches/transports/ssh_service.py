@@ -15,12 +15,11 @@
 import logging
 
 from twisted.conch import avatar, interfaces as conchinterfaces
-from twisted.conch.insults import insults
-from twisted.conch.ssh import factory, keys, session
+from twisted.conch.ssh import common, factory, keys, session
 from twisted.cred import portal, checkers
 from zope.interface import implementer
 
-from fake_switches.terminal.ssh import SwitchSSHShell
+from fake_switches.terminal.ssh import SwitchSSHShell, SwitchSSHServerProtocol
 from fake_switches.transports.base_transport import BaseTransport
 
 
@@ -30,14 +29,14 @@ class SSHDemoAvatar(avatar.ConchUser):
         avatar.ConchUser.__init__(self)
         self.username = username
         self.switch_core = switch_core
-        self.channelLookup.update({b'session': session.SSHSession})
+        self.channelLookup.update({b'session': SwitchSSHSession})
 
         netconf_protocol = switch_core.get_netconf_protocol()
         if netconf_protocol:
             self.subsystemLookup.update({b'netconf': netconf_protocol})
 
     def openShell(self, protocol):
-        server_protocol = insults.ServerProtocol(SwitchSSHShell, self, switch_core=self.switch_core)
+        server_protocol = SwitchSSHServerProtocol(SwitchSSHShell, self, switch_core=self.switch_core)
         server_protocol.makeConnection(protocol)
         protocol.makeConnection(session.wrapProtocol(server_protocol))
 
@@ -57,6 +56,57 @@ class SSHDemoAvatar(avatar.ConchUser):
         pass
 
 
+class SwitchSSHSession(session.SSHSession):
+    """
+    Lets a subsystem register a streaming producer on its transport, paused while the client's window is full.
+    """
+    producer = None
+
+    def request_subsystem(self, data):
+        subsystem, ignored = common.getNS(data)
+        client = self.avatar.lookupSubsystem(subsystem, data)
+        if client:
+            pp = ProducerSSHSessionProcessProtocol(self)
+            proto = session.wrapProcessProtocol(pp)
+            client.makeConnection(proto)
+            pp.makeConnection(session.wrapProtocol(client))
+            self.client = pp
+            return 1
+        else:
+            logging.error("Failed to get subsystem %s", subsystem)
+            return 0
+
+    def registerProducer(self, producer, streaming):
+        self.producer = producer
+        if self.buf:
+            producer.pauseProducing()
+
+    def unregisterProducer(self):
+        self.producer = None
+
+    def stopWriting(self):
+        if self.producer is not None:
+            self.producer.pauseProducing()
+
+    def addWindowBytes(self, data):
+        session.SSHSession.addWindowBytes(self, data)
+        if self.producer is not None and not self.buf:
+            self.producer.resumeProducing()
+
+    def closed(self):
+        if self.producer is not None:
+            self.producer.stopProducing()
+        session.SSHSession.closed(self)
+
+
+class ProducerSSHSessionProcessProtocol(session.SSHSessionProcessProtocol):
+    def registerProducer(self, producer, streaming):
+        self.session.registerProducer(producer, streaming)
+
+    def unregisterProducer(self):
+        self.session.unregisterProducer()
+
+
 @implementer(portal.IRealm)
 class SSHDemoRealm:
     def __init__(self, switch_core):
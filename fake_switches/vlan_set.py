@@ -0,0 +1,203 @@
+# Copyright 2018 Inap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+MAX_VLAN = 4095
+
+
+class VlanSet(object):
+    """
+    A set of vlan numbers stored as a bitmap, bit N being set when vlan N is part of the set.  Numbers outside of
+    0-4095 raise a ValueError.
+
+    Iteration always yields the vlans in ascending order.  The usual list methods (append, remove, extend, +=, ...)
+    are also provided so it can be used wherever a list of vlans was expected.
+    """
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, vlans=()):
+        self._bits = 0
+        if isinstance(vlans, VlanSet):
+            self._bits = vlans._bits
+        else:
+            for vlan in vlans:
+                self._bits |= _bit(vlan)
+
+    def add(self, vlan):
+        bit = _bit(vlan)
+        if not self._bits & bit:
+            self._bits |= bit
+            self._changed([], [vlan])
+
+    def discard(self, vlan):
+        bit = _bit(vlan)
+        if self._bits & bit:
+            self._bits &= ~bit
+            self._changed([vlan], [])
+
+    def add_range(self, first, last):
+        self._update(self._bits | _range_bits(first, last))
+
+    def remove_range(self, first, last):
+        self._update(self._bits & ~_range_bits(first, last))
+
+    def update(self, vlans):
+        self._update(self._bits | VlanSet(vlans)._bits)
+
+    def to_range_string(self, separator=",", min_range_length=2):
+        ranges = []
+        bits = self._bits
+        while bits:
+            start = _lowest_bit_index(bits)
+            length = _lowest_bit_index(~(bits >> start))
+            if length < min_range_length:
+                ranges.extend(str(vlan) for vlan in range(start, start + length))
+            else:
+                ranges.append("%s-%s" % (start, start + length - 1))
+            bits &= ~(((1 << length) - 1) << start)
+        return separator.join(ranges)
+
+    def _update(self, new_bits):
+        added, removed = new_bits & ~self._bits, self._bits & ~new_bits
+        self._bits = new_bits
+        if added or removed:
+            self._changed(list(_iter_bits(removed)), list(_iter_bits(added)))
+
+    def _changed(self, removed, added):
+        pass
+
+    def append(self, vlan):
+        self.add(vlan)
+
+    def insert(self, index, vlan):
+        self.add(vlan)
+
+    def extend(self, vlans):
+        self.update(vlans)
+
+    def remove(self, vlan):
+        if vlan not in self:
+            raise ValueError("{} is not in the vlan set".format(vlan))
+        self.discard(vlan)
+
+    def pop(self, index=-1):
+        vlan = self[index]
+        self.discard(vlan)
+        return vlan
+
+    def index(self, vlan):
+        if vlan not in self:
+            raise ValueError("{} is not in the vlan set".format(vlan))
+        return _count_bits(self._bits & (_bit(vlan) - 1))
+
+    def count(self, vlan):
+        return 1 if vlan in self else 0
+
+    def sort(self, *args, **kwargs):
+        pass
+
+    def copy(self):
+        return VlanSet(self)
+
+    def __copy__(self):
+        return VlanSet(self)
+
+    def __deepcopy__(self, memo):
+        return VlanSet(self)
+
+    def __reduce__(self):
+        return VlanSet, (list(self),)
+
+    def __contains__(self, vlan):
+        try:
+            return bool(self._bits & _bit(vlan))
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self):
+        return _iter_bits(self._bits)
+
+    def __len__(self):
+        return _count_bits(self._bits)
+
+    def __bool__(self):
+        return self._bits != 0
+
+    __nonzero__ = __bool__
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    def __iadd__(self, vlans):
+        self.update(vlans)
+        return self
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, VlanSet):
+            return self._bits == other._bits
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "VlanSet('{}')".format(self.to_range_string())
+
+
+def all_vlans():
+    vlans = VlanSet()
+    vlans.add_range(1, MAX_VLAN)
+    return vlans
+
+
+def _bit(vlan):
+    return 1 << _checked(vlan)
+
+
+def _range_bits(first, last):
+    if last < first:
+        return 0
+    return ((1 << (_checked(last) - _checked(first) + 1)) - 1) << first
+
+
+def _checked(vlan):
+    if not 0 <= vlan <= MAX_VLAN:
+        raise ValueError("Invalid vlan number {}".format(vlan))
+    return vlan
+
+
+def _lowest_bit_index(bits):
+    return (bits & -bits).bit_length() - 1
+
+
+def _count_bits(bits):
+    return bin(bits).count("1")
+
+
+def _iter_bits(bits):
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
@@ -12,11 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import time
-
-from hamcrest import assert_that, greater_than
+from hamcrest import assert_that, greater_than_or_equal_to
 from tests.brocade.test_brocade_switch_protocol import enable
-from tests.util.global_reactor import COMMIT_DELAY
+from tests.util.global_reactor import COMMIT_DELAY, VIRTUAL_CLOCK
 from tests.util.protocol_util import SshTester, with_protocol, ProtocolTest
 
 
@@ -29,11 +27,11 @@ class TestBrocadeSwitchProtocolWithCommitDelay(ProtocolTest):
         enable(t)
         t.child.timeout = 10
 
-        start_time = time.time()
+        start_time = VIRTUAL_CLOCK.seconds()
 
         t.write("write memory")
         t.read("SSH@my_switch#")
 
-        end_time = time.time()
+        end_time = VIRTUAL_CLOCK.seconds()
 
-        assert_that((end_time - start_time), greater_than(COMMIT_DELAY))
+        assert_that((end_time - start_time), greater_than_or_equal_to(COMMIT_DELAY))
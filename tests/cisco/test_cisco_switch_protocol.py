@@ -334,6 +334,28 @@ class TestCiscoSwitchProtocol(ProtocolTest):
             "interface FastEthernet0/3",
             "end"])
 
+    @with_protocol
+    def test_removing_trunk_vlans_from_all_vlans(self, t):
+        enable(t)
+
+        configuring_interface(t, "Fa0/3", do="switchport mode trunk")
+        configuring_interface(t, "Fa0/3", do="switchport trunk allowed vlan remove 100")
+
+        assert_interface_configuration(t, "FastEthernet0/3", [
+            "interface FastEthernet0/3",
+            " switchport trunk allowed vlan 1-99,101-4095",
+            " switchport mode trunk",
+            "end"])
+
+        configuring_interface(t, "Fa0/3", do="switchport trunk allowed vlan add 100")
+
+        assert_interface_configuration(t, "FastEthernet0/3", [
+            "interface FastEthernet0/3",
+            " switchport mode trunk",
+            "end"])
+
+        configuring_interface(t, "Fa0/3", do="no switchport mode")
+
     @with_protocol
     def test_configure_native_vlan(self, t):
         enable(t)
@@ -638,6 +660,18 @@ class TestCiscoSwitchProtocol(ProtocolTest):
         t.readln("")
         t.read("my_switch#")
 
+    @with_protocol
+    def test_show_etherchannel_summary_rejects_trailing_tokens(self, t):
+        enable(t)
+
+        t.write("show etherchannel summary foo")
+        t.readln("No such command : show etherchannel summary foo")
+        t.read("my_switch#")
+
+        t.write("show running-config foo")
+        t.readln("No such command : show running-config foo")
+        t.read("my_switch#")
+
     @with_protocol
     def test_port_channel_is_automatically_created_when_adding_a_port_to_it(self, t):
         enable(t)
@@ -12,12 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from time import time
-
 from hamcrest import assert_that
-from hamcrest import greater_than
+from hamcrest import greater_than_or_equal_to
 from tests.cisco import enable
-from tests.util.global_reactor import COMMIT_DELAY
+from tests.util.global_reactor import COMMIT_DELAY, VIRTUAL_CLOCK
 from tests.util.protocol_util import SshTester, with_protocol, ProtocolTest
 
 
@@ -29,12 +27,12 @@ class TestCiscoSwitchProtocolWithCommitDelay(ProtocolTest):
     def test_write_memory_with_commit_delay(self, t):
         t.child.timeout = 10
         enable(t)
-        start_time = time()
+        start_time = VIRTUAL_CLOCK.seconds()
         t.write("write memory")
         t.readln("Building configuration...")
         t.readln("OK")
         t.read("my_switch#")
-        end_time = time()
+        end_time = VIRTUAL_CLOCK.seconds()
 
-        assert_that((end_time - start_time), greater_than(COMMIT_DELAY))
+        assert_that((end_time - start_time), greater_than_or_equal_to(COMMIT_DELAY))
 
@@ -97,6 +97,16 @@ class DellEnabledTest(ProtocolTest):
         t.readln("% Invalid input detected at '^' marker.")
         t.readln("")
 
+    @with_protocol
+    def test_show_running_config_rejects_trailing_tokens(self, t):
+        enable(t)
+
+        t.write("show running-config foo")
+        t.readln("          ^")
+        t.readln("% Invalid input detected at '^' marker.")
+        t.readln("")
+        t.read("my_switch#")
+
     @with_protocol
     def test_entering_configure_mode(self, t):
         enable(t)
@@ -570,6 +570,23 @@ class Dell10GConfigureInterfaceSshTest(ProtocolTest):
         configuring(t, do="no vlan 1203")
         configuring(t, do="no vlan 1205")
 
+    @with_protocol
+    def test_switchport_remove_trunk_vlans_from_all_vlans(self, t):
+        enable(t)
+
+        configuring_interface(t, "tengigabitethernet 0/0/1", do="switchport mode trunk")
+        configuring_interface(t, "tengigabitethernet 0/0/1", do="switchport trunk allowed vlan remove 1200")
+        assert_interface_configuration(t, 'tengigabitethernet 0/0/1', [
+            "switchport mode trunk",
+            "switchport trunk allowed vlan 1-1199,1201-4095",
+        ])
+
+        configuring_interface(t, "tengigabitethernet 0/0/1", do="switchport mode access")
+        configuring_interface(t, "tengigabitethernet 0/0/1", do="no switchport trunk allowed vlan")
+        assert_interface_configuration(t, 'tengigabitethernet 0/0/1', [
+            "",
+        ])
+
     @with_protocol
     def test_switchport_add_remove_general_trunk_vlans(self, t):
         enable(t)
@@ -12,11 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from time import time
-
-from hamcrest import greater_than, assert_that, less_than
+from hamcrest import greater_than_or_equal_to, assert_that, less_than
 from tests.dell10g import enable
-from tests.util.global_reactor import COMMIT_DELAY
+from tests.util.global_reactor import COMMIT_DELAY, VIRTUAL_CLOCK
 from tests.util.protocol_util import with_protocol, SshTester, ProtocolTest
 
 
@@ -38,14 +36,14 @@ class Dell10GEnabledWithCommitDelayTest(ProtocolTest):
         t.readln("")
         t.read("Are you sure you want to save? (y/n) ")
         t.write_raw("y")
-        start_time = time()
+        start_time = VIRTUAL_CLOCK.seconds()
         t.readln("")
         t.readln("")
         t.readln("Configuration Saved!")
-        end_time = time()
+        end_time = VIRTUAL_CLOCK.seconds()
         t.read("my_switch#")
 
-        assert_that((end_time - start_time), greater_than(COMMIT_DELAY))
+        assert_that((end_time - start_time), greater_than_or_equal_to(COMMIT_DELAY))
 
     @with_protocol
     def test_write_memory_abort_does_not_delay(self, t):
@@ -60,11 +58,11 @@ class Dell10GEnabledWithCommitDelayTest(ProtocolTest):
         t.readln("")
         t.read("Are you sure you want to save? (y/n) ")
         t.write_raw("n")
-        start_time = time()
+        start_time = VIRTUAL_CLOCK.seconds()
         t.readln("")
         t.readln("")
         t.readln("Configuration Not Saved!")
-        end_time = time()
+        end_time = VIRTUAL_CLOCK.seconds()
         t.read("my_switch#")
 
         assert_that((end_time - start_time), less_than(COMMIT_DELAY))
@@ -12,12 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from time import time
-
 from fake_switches.netconf import dict_2_etree, XML_ATTRIBUTES
-from hamcrest import assert_that, has_length, greater_than
+from hamcrest import assert_that, has_length, greater_than_or_equal_to
 from tests.juniper import BaseJuniper
-from tests.util.global_reactor import COMMIT_DELAY
+from tests.util.global_reactor import COMMIT_DELAY, VIRTUAL_CLOCK
 
 
 class JuniperBaseProtocolWithCommitDelayTest(BaseJuniper):
@@ -53,14 +51,14 @@ class JuniperBaseProtocolWithCommitDelayTest(BaseJuniper):
             }
         })
 
-        start_time = time()
+        start_time = VIRTUAL_CLOCK.seconds()
         self.nc.commit()
-        end_time = time()
+        end_time = VIRTUAL_CLOCK.seconds()
 
         result = self.nc.get_config(source="running")
 
         assert_that(result.xpath("data/configuration/vlans/vlan"), has_length(0))
-        assert_that((end_time - start_time), greater_than(COMMIT_DELAY))
+        assert_that((end_time - start_time), greater_than_or_equal_to(COMMIT_DELAY))
 
     def edit(self, config):
         result = self.nc.edit_config(target="candidate", config=dict_2_etree({
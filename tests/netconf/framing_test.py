@@ -0,0 +1,56 @@
+import unittest
+
+from hamcrest import assert_that, contains, empty, is_
+
+from fake_switches.netconf.framing import EndOfMessageFramer, ChunkedFramer, FramingError
+
+
+def received(framer, data):
+    framer.feed(data)
+    messages = []
+    message = framer.next_message()
+    while message is not None:
+        messages.append(message)
+        message = framer.next_message()
+    return messages
+
+
+class EndOfMessageFramerTest(unittest.TestCase):
+    def setUp(self):
+        self.framer = EndOfMessageFramer()
+
+    def test_a_message_can_be_received_in_pieces(self):
+        assert_that(received(self.framer, b"<rpc>"), is_(empty()))
+        assert_that(received(self.framer, b"</rpc>]]>"), is_(empty()))
+        assert_that(received(self.framer, b"]]>\n"), contains(b"<rpc></rpc>"))
+
+    def test_a_read_can_hold_several_messages(self):
+        assert_that(received(self.framer, b"<a/>]]>]]>\n<b/>]]>]]><c"), contains(b"<a/>", b"<b/>"))
+        assert_that(received(self.framer, b"/>]]>]]>"), contains(b"<c/>"))
+
+    def test_frame(self):
+        assert_that(self.framer.frame(b"<ok/>"), is_(b"<ok/>]]>]]>\n"))
+
+
+class ChunkedFramerTest(unittest.TestCase):
+    def setUp(self):
+        self.framer = ChunkedFramer()
+
+    def test_messages_are_made_of_chunks(self):
+        assert_that(received(self.framer, b"\n#4\n<rpc\n#2"), is_(empty()))
+        assert_that(received(self.framer, b"\n/>\n##"), is_(empty()))
+        assert_that(received(self.framer, b"\n\n#4\n<a/>\n##\n"), contains(b"<rpc/>", b"<a/>"))
+
+    def test_takes_over_what_was_received_after_the_hello(self):
+        framer = ChunkedFramer(b"\n#4\n<a/>\n##\n")
+
+        assert_that(framer.next_message(), is_(b"<a/>"))
+
+    def test_invalid_chunk_headers_are_rejected(self):
+        for data in (b"<rpc/>", b"\n#\n", b"\n#0\n", b"\n#12345678901\n", b"\n#4a"):
+            with self.assertRaises(FramingError):
+                received(ChunkedFramer(), data)
+
+    def test_frame(self):
+        assert_that(self.framer.frame(b"<ok/>"), is_(b"\n#5\n<ok/>\n##\n"))
+        assert_that(self.framer.chunk(b""), is_(b""))
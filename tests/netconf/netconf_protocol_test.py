@@ -6,11 +6,13 @@ import unittest
 from hamcrest import assert_that, ends_with, equal_to, has_length, has_key
 from hamcrest.core.base_matcher import BaseMatcher
 from lxml.etree import _Element
+from lxml import etree
 from mock import Mock
 from ncclient.xml_ import to_ele, to_xml
+from twisted.internet import defer
 
-from fake_switches.netconf import RUNNING, dict_2_etree
-from fake_switches.netconf.capabilities import filter_content
+from fake_switches.netconf import RUNNING, dict_2_etree, Response
+from fake_switches.netconf.capabilities import filter_content, Base1_1
 from fake_switches.netconf.netconf_protocol import NetconfProtocol
 
 
@@ -139,6 +141,104 @@ class NetconfProtocolTest(unittest.TestCase):
               <data/>
             </rpc-reply>""")
 
+    def test_replies_are_sent_in_order_when_an_operation_is_deferred(self):
+        self.netconf = NetconfProtocol(logger=logging.getLogger(), capabilities=[DeferredOperation])
+        self.netconf.transport = Mock()
+        self.netconf.connectionMade()
+        self.say_hello()
+
+        self.netconf.dataReceived(b"""
+            <rpc xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="1"><deferred-operation/></rpc>
+            ]]>]]>""")
+        self.netconf.dataReceived(b"""
+            <rpc xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="2">
+              <get-config><source><running/></source></get-config>
+            </rpc>
+            ]]>]]>""")
+
+        assert_that(self.netconf.transport.write.call_count, equal_to(1))
+
+        self.netconf.capabilities[1].pending.callback(Response(etree.Element("ok")))
+
+        assert_that(self.netconf.transport.write.call_count, equal_to(3))
+        self.assert_xml_response("""
+            <rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="2">
+              <data/>
+            </rpc-reply>""")
+
+    def test_pipelined_requests_are_all_replied_in_order(self):
+        self.netconf.connectionMade()
+        self.say_hello()
+
+        self.netconf.dataReceived(b"""
+            <rpc xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="1">
+              <get-config><source><running/></source></get-config>
+            </rpc>]]>]]>
+            <rpc xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="2">
+              <get-config><source><running/></source></get-config>
+            </rpc>]]>]]><rpc xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-""")
+        self.netconf.dataReceived(b"""id="3"><close-session/></rpc>]]>]]>""")
+
+        replies = [etree.fromstring(c[0][0].replace(b"]]>]]>\n", b""))
+                   for c in self.netconf.transport.write.call_args_list[1:]]
+        assert_that([r.get("message-id") for r in replies], equal_to(["1", "2", "3"]))
+        self.netconf.transport.loseConnection.assert_called_with()
+
+    def test_chunked_framing_is_used_when_both_sides_support_base_1_1(self):
+        self.netconf = NetconfProtocol(logger=logging.getLogger(), capabilities=[Base1_1])
+        self.netconf.transport = Mock()
+        self.netconf.connectionMade()
+
+        self.netconf.dataReceived(b"""<hello xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"><capabilities>
+            <capability>urn:ietf:params:netconf:base:1.1</capability>
+            </capabilities></hello>]]>]]>\n#31\n<rpc message-id="1"><close-sess""")
+        self.netconf.dataReceived(b"\n#11\nion/></rpc>\n##\n")
+
+        data = self.netconf.transport.write.call_args[0][0]
+        header, reply = data[:-4].split(b"\n", 2)[1:]
+        assert_that(header, equal_to("#{}".format(len(reply)).encode()))
+        assert_that(reply, xml_equals_to("""
+            <rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="1">
+                <ok/>
+            </rpc-reply>"""))
+        assert_that(data[-4:], equal_to(b"\n##\n"))
+
+    def test_base_1_0_framing_is_kept_when_the_client_does_not_support_base_1_1(self):
+        self.netconf = NetconfProtocol(logger=logging.getLogger(), capabilities=[Base1_1])
+        self.netconf.transport = Mock()
+        self.netconf.connectionMade()
+        self.say_hello()
+
+        self.netconf.dataReceived(b"""<rpc xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="1">
+            <close-session/></rpc>]]>]]>""")
+
+        self.assert_xml_response("""
+            <rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="1">
+                <ok/>
+            </rpc-reply>""")
+
+    def test_disconnects_on_a_malformed_hello(self):
+        self.netconf.connectionMade()
+
+        self.netconf.dataReceived(b"<hello><capabilities></hello>]]>]]>\n"
+                                  b"<rpc message-id=\"1\"><close-session/></rpc>]]>]]>\n")
+
+        self.netconf.transport.loseConnection.assert_called_with()
+        assert_that(self.netconf.been_greeted, equal_to(False))
+        assert_that(self.netconf.transport.write.call_count, equal_to(1))
+
+    def test_replies_can_be_sent_without_pretty_printing(self):
+        self.netconf = NetconfProtocol(logger=logging.getLogger(), pretty_print=False)
+        self.netconf.transport = Mock()
+        self.netconf.connectionMade()
+        self.say_hello()
+
+        self.netconf.dataReceived(b"""<rpc xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="1">
+            <close-session/></rpc>]]>]]>""")
+
+        assert_that(self.netconf.transport.write.call_args[0][0], equal_to(
+            b'<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="1"><ok/></rpc-reply>]]>]]>\n'))
+
     def test_filtering(self):
         content = dict_2_etree({
             "data": {
@@ -371,6 +471,17 @@ class NetconfProtocolTest(unittest.TestCase):
         assert_that(data, xml_equals_to(expected))
 
 
+class DeferredOperation(object):
+    def __init__(self, datastore):
+        self.pending = defer.Deferred()
+
+    def get_url(self):
+        return "urn:test:deferred-operation"
+
+    def deferred_operation(self, _):
+        return self.pending
+
+
 def xml_equals_to(string):
     return XmlEqualsToMatcher(string)
 
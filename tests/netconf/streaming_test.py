@@ -0,0 +1,93 @@
+import unittest
+
+from hamcrest import assert_that, is_, contains, equal_to
+from lxml import etree
+from twisted.test.proto_helpers import StringTransport
+
+from fake_switches.netconf import dict_2_etree
+from fake_switches.netconf.streaming import iter_serialized, ReplyProducer
+
+
+class IterSerializedTest(unittest.TestCase):
+    def setUp(self):
+        self.root = etree.Element("rpc-reply", xmlns="urn:ietf:params:xml:ns:netconf:base:1.0",
+                                  nsmap={"junos": "http://xml.juniper.net/junos/11.4R1/junos"})
+        self.root.append(dict_2_etree({"data": {"configuration": {"vlans": [
+            {"vlan": {"name": "one", "vlan-id": "1"}},
+            {"vlan": {"name": "two & <three>", "vlan-id": "2"}},
+        ]}}}))
+        self.root[0][0].set("{http://xml.juniper.net/junos/11.4R1/junos}changed-localtime", "now")
+
+    def test_produces_what_tostring_does(self):
+        assert_that(b"".join(iter_serialized(self.root)), is_(etree.tostring(self.root)))
+        assert_that(b"".join(iter_serialized(self.root, pretty_print=True)),
+                    is_(etree.tostring(self.root, pretty_print=True)))
+
+    def test_empty_elements_are_written_as_tostring_does(self):
+        vlan = self.root[0][0][0][0]
+        etree.SubElement(vlan, "disable")
+        etree.SubElement(vlan, "{http://xml.juniper.net/junos/11.4R1/junos}inactive", {"reason": "<none>"})
+        etree.SubElement(vlan, "{urn:other}empty", nsmap={"other": "urn:other"})
+        etree.SubElement(self.root, "ok")
+
+        assert_that(b"".join(iter_serialized(self.root)), is_(etree.tostring(self.root)))
+        assert_that(b"".join(iter_serialized(self.root, pretty_print=True)),
+                    is_(etree.tostring(self.root, pretty_print=True)))
+        assert_that(b"".join(iter_serialized(etree.Element("ok"))), is_(b"<ok/>"))
+
+    def test_mixed_content_is_written_as_tostring_does(self):
+        root = etree.fromstring(b"<a>text<b>x</b>tail<c>\n  <d/>\n</c><e/></a>")
+
+        assert_that(b"".join(iter_serialized(root)), is_(etree.tostring(root)))
+        assert_that(b"".join(iter_serialized(root, pretty_print=True)), is_(etree.tostring(root, pretty_print=True)))
+
+    def test_pieces_are_bounded(self):
+        pieces = list(iter_serialized(self.root, chunk_size=16))
+
+        assert_that(set(len(piece) for piece in pieces[:-1]), is_({16}))
+        assert_that(b"".join(pieces), is_(etree.tostring(self.root)))
+
+
+class ReplyProducerTest(unittest.TestCase):
+    def test_writes_everything_and_unregisters(self):
+        transport = StringTransport()
+        done = []
+
+        ReplyProducer(transport, iter([b"a", b"b"])).start().addCallback(done.append)
+
+        assert_that(transport.value(), is_(b"ab"))
+        assert_that(transport.producer, is_(None))
+        assert_that(done, contains(None))
+
+    def test_stops_writing_while_paused(self):
+        transport = PausingTransport()
+        producer = ReplyProducer(transport, iter([b"a", b"b", b"c"]))
+        done = []
+
+        producer.start().addCallback(done.append)
+        assert_that(transport.value(), is_(b"a"))
+
+        transport.pause_after_write = False
+        producer.resumeProducing()
+        assert_that(transport.value(), is_(b"abc"))
+        assert_that(done, contains(None))
+
+    def test_stop_producing_completes_the_reply(self):
+        transport = PausingTransport()
+        producer = ReplyProducer(transport, (piece for piece in [b"a", b"b"]))
+        done = []
+
+        producer.start().addCallback(done.append)
+        producer.stopProducing()
+
+        assert_that(transport.value(), equal_to(b"a"))
+        assert_that(done, contains(None))
+
+
+class PausingTransport(StringTransport):
+    pause_after_write = True
+
+    def write(self, data):
+        StringTransport.write(self, data)
+        if self.pause_after_write:
+            self.producer.pauseProducing()
@@ -0,0 +1,36 @@
+import unittest
+
+from hamcrest import assert_that, is_, contains
+from twisted.internet import task
+
+from fake_switches.clock import VirtualClock
+from fake_switches.switch_configuration import SwitchConfiguration
+
+
+class VirtualClockTest(unittest.TestCase):
+    def test_commit_completes_when_the_clock_is_advanced(self):
+        clock = VirtualClock()
+        conf = SwitchConfiguration("127.0.0.1", commit_delay=30, clock=clock)
+        saved = []
+
+        conf.commit().addCallback(saved.append)
+        clock.advance(29)
+        assert_that(saved, is_([]))
+
+        clock.advance(1)
+        assert_that(saved, is_([None]))
+
+    def test_auto_advance_runs_calls_in_order_without_waiting(self):
+        reactor = task.Clock()
+        clock = VirtualClock(auto_advance=True, reactor=reactor)
+        calls = []
+
+        clock.callLater(60, calls.append, "second")
+        clock.callLater(10, calls.append, "first")
+        clock.callLater(10, lambda: clock.callLater(100, calls.append, "third"))
+        assert_that(calls, is_([]))
+
+        reactor.advance(0)
+        assert_that(calls, contains("first", "second", "third"))
+        assert_that(clock.seconds(), is_(110))
+        assert_that(reactor.seconds(), is_(0))
@@ -0,0 +1,132 @@
+import unittest
+from functools import wraps
+
+from hamcrest import assert_that, is_, none
+
+from fake_switches.command_processing.command_processor import CommandProcessor
+from fake_switches.command_processing.command_tree import command
+
+
+class MyProcessor(CommandProcessor):
+    def do_show(self, *args):
+        return "show", args
+
+    def do_shutdown(self, *args):
+        return "shutdown", args
+
+    def do_no_shutdown(self, *args):
+        return "no shutdown", args
+
+    def do_spanning_tree(self, *args):
+        return "spanning-tree", args
+
+
+class MySubProcessor(MyProcessor):
+    def do_sh(self, *args):
+        return "sh", args
+
+
+class CommandProcessorTest(unittest.TestCase):
+    def test_commands_match_the_first_sorted_name_starting_with_the_prefix(self):
+        processor = MyProcessor()
+
+        assert_that(run(processor, "sh run"), is_(("show", ("run",))))
+        assert_that(run(processor, "shu"), is_(("shutdown", ())))
+        assert_that(run(processor, "no shut"), is_(("no shutdown", ())))
+        assert_that(run(processor, "spanning-t portfast"), is_(("spanning-tree", ("portfast",))))
+        assert_that(processor.get_command_func("vlan 10")[0], is_(none()))
+
+    def test_subclasses_have_their_own_commands(self):
+        assert_that(run(MyProcessor(), "sh"), is_(("show", ())))
+        assert_that(run(MySubProcessor(), "sh"), is_(("sh", ())))
+        assert_that(run(MyProcessor(), "sh"), is_(("show", ())))
+
+    def test_subcommands_resolve_through_the_command_tree(self):
+        processor = ShowProcessor()
+
+        assert_that(run(processor, "sh run"), is_(("running-config", ())))
+        assert_that(run(processor, "sh run int fa0/1"), is_(("running-config interface", ("fa0/1",))))
+        assert_that(run(processor, "show interfaces status"), is_(("interfaces status", ())))
+        assert_that(run(processor, "show i"), is_(("ip", ())))
+        assert_that(run(processor, "show in status"), is_(("interfaces status", ())))
+        assert_that(run(processor, "show ip route"), is_(("ip", ("route",))))
+        assert_that(run(processor, "show interfaces"), is_(("show", ("interfaces",))))
+        assert_that(run(processor, "show clock"), is_(("show", ("clock",))))
+
+    def test_trailing_tokens_are_rejected_by_handlers_taking_no_arguments(self):
+        processor = ShowProcessor()
+
+        assert_that(processor.get_command_func("show interfaces status foo"), is_((None, [])))
+        assert_that(run(processor, "show vlan 10"), is_(("vlan", "10")))
+        assert_that(processor.get_command_func("show vlan 10 foo")[0], is_(none()))
+        assert_that(run(processor, "show run foo"), is_(("running-config", ("foo",))))
+        assert_that(processor.get_command_func("show users foo")[0], is_(none()))
+        assert_that(run(processor, "show users"), is_(("users", ())))
+        assert_that(processor.get_command_func("show ip route static")[0], is_(none()))
+        assert_that(run(processor, "show ip route static 10.0.0.0"), is_(("ip route static", "10.0.0.0")))
+
+    def test_overriding_the_command_drops_the_inherited_subcommands(self):
+        class MyShowProcessor(ShowProcessor):
+            def do_show(self, *args):
+                return "my show", args
+
+            @command("show", "version")
+            def show_version(self):
+                return "version", ()
+
+        class MyOtherShowProcessor(ShowProcessor):
+            def show_ip(self, *args):
+                return "my ip", args
+
+        assert_that(run(MyShowProcessor(), "show run"), is_(("my show", ("run",))))
+        assert_that(run(MyShowProcessor(), "show ver"), is_(("version", ())))
+        assert_that(run(MyOtherShowProcessor(), "show ip"), is_(("my ip", ())))
+        assert_that(run(ShowProcessor(), "show ver"), is_(("show", ("ver",))))
+
+
+def decorated(func):
+    @wraps(func)
+    def decorated_func(self, *args):
+        return func(self, *args)
+
+    decorated_func.__wrapped__ = func
+    return decorated_func
+
+
+class ShowProcessor(CommandProcessor):
+    def do_show(self, *args):
+        return "show", args
+
+    @command("show", "running-config")
+    def show_running_config(self, *args):
+        return "running-config", args
+
+    @command("show", "running-config", "interface")
+    def show_running_config_interface(self, *args):
+        return "running-config interface", args
+
+    @command("show", "ip")
+    def show_ip(self, *args):
+        return "ip", args
+
+    @command("show", "interfaces", "status")
+    def show_interfaces_status(self):
+        return "interfaces status", ()
+
+    @command("show", "vlan")
+    def show_vlan(self, number=None):
+        return "vlan", number
+
+    @command("show", "users")
+    @decorated
+    def show_users(self):
+        return "users", ()
+
+    @command("show", "ip", "route", "static")
+    def show_ip_route_static(self, destination):
+        return "ip route static", destination
+
+
+def run(processor, line):
+    func, args = processor.get_command_func(line)
+    return func(*args)
@@ -0,0 +1,53 @@
+import logging
+import unittest
+
+from hamcrest import assert_that, is_, contains, empty
+
+from fake_switches.log_payload import LogPayload
+from fake_switches.terminal import LoggingTerminalController, BufferingTerminalController
+
+
+class LogPayloadTest(unittest.TestCase):
+    def test_shows_the_repr_of_the_data(self):
+        assert_that(str(LogPayload(b"a\nb")), is_(repr(b"a\nb")))
+        assert_that(str(LogPayload("abcdef", limit=6)), is_(repr("abcdef")))
+
+    def test_cuts_the_data_past_the_limit(self):
+        assert_that(str(LogPayload("abcdef", limit=2)), is_("'ab'... (4 more)"))
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class LoggingTerminalControllerTest(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("fake_switches.tests.logging_terminal")
+        self.logger.propagate = False
+        self.handler = RecordingHandler()
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def test_writes_are_logged_up_to_the_payload_limit(self):
+        self.logger.setLevel(logging.DEBUG)
+        terminal_controller = BufferingTerminalController()
+        logging_controller = LoggingTerminalController(self.logger, terminal_controller, payload_limit=3)
+
+        logging_controller.write("hello")
+        logging_controller.write_bytes(b"hi")
+
+        assert_that(self.handler.messages, contains("replying: 'hel'... (2 more)", "replying: %r" % b"hi"))
+        assert_that(terminal_controller.pop(), is_("hellohi"))
+
+    def test_nothing_is_logged_when_debug_is_disabled(self):
+        self.logger.setLevel(logging.INFO)
+        logging_controller = LoggingTerminalController(self.logger, BufferingTerminalController())
+
+        logging_controller.write("hello")
+
+        assert_that(self.handler.messages, is_(empty()))
@@ -0,0 +1,55 @@
+import unittest
+
+from hamcrest import assert_that, is_, contains
+
+from fake_switches.cisco.command_processor.piping import PipingProcessor
+from fake_switches.command_processing.base_command_processor import BaseCommandProcessor
+from fake_switches.command_processing.output_cache import cached_output
+from fake_switches.switch_configuration import SwitchConfiguration, Vlan
+from fake_switches.terminal import BufferingTerminalController
+
+
+class VlanProcessor(BaseCommandProcessor):
+    def __init__(self):
+        self.renders = 0
+
+    @cached_output
+    def show_vlans(self):
+        self.renders += 1
+        for vlan in self.switch_configuration.vlans:
+            self.write_line("vlan {}".format(vlan.number))
+
+
+class CachedOutputTest(unittest.TestCase):
+    def setUp(self):
+        self.conf = SwitchConfiguration("127.0.0.1", vlans=[Vlan(1), Vlan(2)])
+        self.terminal_controller = BufferingTerminalController()
+        self.processor = VlanProcessor()
+        self.processor.init(self.conf, self.terminal_controller, None, PipingProcessor(None))
+
+    def test_output_is_rendered_once_per_configuration_version(self):
+        self.processor.show_vlans()
+        self.processor.show_vlans()
+
+        assert_that(self.terminal_controller.pop(), is_("vlan 1\nvlan 2\n" * 2))
+        assert_that(self.processor.renders, is_(1))
+
+        self.conf.get_vlan(2).number = 3
+        self.processor.show_vlans()
+
+        assert_that(self.terminal_controller.pop(), is_("vlan 1\nvlan 3\n"))
+        assert_that(self.processor.renders, is_(2))
+
+    def test_piped_output_is_filtered_each_time(self):
+        self.processor.show_vlans()
+        self.terminal_controller.pop()
+
+        outputs = []
+        for _ in range(2):
+            self.processor.activate_piping("include 2")
+            self.processor.show_vlans()
+            self.processor.finish_piping()
+            outputs.append(self.terminal_controller.pop())
+
+        assert_that(outputs, contains("vlan 2\n", "vlan 2\n"))
+        assert_that(self.processor.renders, is_(1))
@@ -0,0 +1,75 @@
+import unittest
+
+from hamcrest import assert_that, is_, contains, has_length
+
+from fake_switches.command_processing.base_command_processor import BaseCommandProcessor
+from fake_switches.command_processing.piping_processor_base import NotPipingProcessor
+from fake_switches.switch_factory import SwitchFactory
+from fake_switches.terminal import BufferingTerminalController
+
+
+class NumbersProcessor(BaseCommandProcessor):
+    def __init__(self):
+        self.generated = []
+
+    def get_prompt(self):
+        return "#"
+
+    def numbers(self, count):
+        for i in range(count):
+            self.generated.append(i)
+            yield str(i)
+
+    def do_count(self, count):
+        self.show_paged(self.numbers(int(count)), 2, header=["numbers:"], page_break=[""])
+
+
+class PagerTest(unittest.TestCase):
+    def setUp(self):
+        self.terminal_controller = BufferingTerminalController()
+        self.processor = NumbersProcessor()
+        self.processor.init(None, self.terminal_controller, None, NotPipingProcessor())
+
+    def press(self, key):
+        callback, params = self.terminal_controller.any_key_handler
+        callback(*(params + (key,)))
+
+    def test_pages_are_generated_as_they_are_shown(self):
+        self.processor.process_command("count 5")
+
+        assert_that(self.terminal_controller.pop(), is_("numbers:\n0\n1\n--More-- or (q)uit"))
+        assert_that(self.processor.generated, contains(0, 1, 2))
+
+        self.press("m")
+        self.press("m")
+
+        assert_that(self.terminal_controller.pop(), is_("\nnumbers:\n2\n3\n--More-- or (q)uit\nnumbers:\n4\n#"))
+
+    def test_quitting_stops_the_generation(self):
+        self.processor.process_command("count 1000")
+        self.terminal_controller.pop()
+
+        self.press("q")
+
+        assert_that(self.terminal_controller.pop(), is_("\n#"))
+        assert_that(self.processor.generated, contains(0, 1, 2))
+        assert_that(self.processor.awaiting_keystroke, is_(False))
+
+    def test_a_terminal_length_of_0_disables_paging(self):
+        self.processor.apply_terminal_setting("length", "0")
+        self.processor.process_command("count 3")
+
+        assert_that(self.terminal_controller.pop(), is_("numbers:\n0\n1\n2\n#"))
+
+
+class DellPagingTest(unittest.TestCase):
+    def test_terminal_length_applies_to_the_session(self):
+        switch = SwitchFactory().get("dell_generic", hostname="my_switch")
+        switch.execute(["enable", "root", "configure", "vlan database"] +
+                       ["vlan {}".format(v) for v in range(10, 14)] + ["exit", "exit"])
+
+        outputs = switch.execute(["enable", "root", "terminal length 2", "show vlan", "q"])
+
+        assert_that(outputs[3].split("\n"), has_length(7))
+        assert_that(outputs[3].split("\n")[-1], is_("--More-- or (q)uit"))
+        assert_that(outputs[4], is_("\n"))
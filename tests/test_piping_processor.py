@@ -0,0 +1,49 @@
+import logging
+import unittest
+
+from hamcrest import assert_that, is_
+
+from fake_switches.cisco.command_processor.piping import PipingProcessor
+
+RUNNING_CONFIG = "hostname my_switch\n!\nvlan 10\n name ten\n!\nvlan 20\n name twenty\n!\nend\n"
+
+
+class PipingProcessorTest(unittest.TestCase):
+    def setUp(self):
+        self.piping_processor = PipingProcessor(logging.getLogger(__name__))
+
+    def pipe(self, command, *chunks):
+        assert_that(self.piping_processor.start_listening(command), is_(True))
+        output = [self.piping_processor.pipe(chunk) for chunk in chunks]
+        output.append(self.piping_processor.stop_listening())
+        return "".join(o for o in output if o is not False)
+
+    def test_include_filters_each_line_of_a_chunk(self):
+        assert_that(self.pipe("include ^ name", RUNNING_CONFIG), is_(" name ten\n name twenty\n"))
+
+    def test_lines_split_across_writes_are_filtered_whole(self):
+        assert_that(self.pipe("include ten", "vlan 10\n na", "me ten\nvlan 20", "\n"), is_(" name ten\n"))
+
+    def test_exclude(self):
+        assert_that(self.pipe("exclude !", "vlan 10\n!\nend\n"), is_("vlan 10\nend\n"))
+
+    def test_begin(self):
+        assert_that(self.pipe("begin vlan 20", RUNNING_CONFIG), is_("vlan 20\n name twenty\n!\nend\n"))
+
+    def test_section_keeps_the_indented_lines_of_matching_blocks(self):
+        assert_that(self.pipe("section vlan 10", RUNNING_CONFIG), is_("vlan 10\n name ten\n"))
+
+    def test_count(self):
+        assert_that(self.pipe("count ^vlan", RUNNING_CONFIG), is_("Number of lines which match regexp = 2\n"))
+
+    def test_patterns_are_regular_expressions(self):
+        assert_that(self.pipe("include ^vlan [0-9]0$", RUNNING_CONFIG), is_("vlan 10\nvlan 20\n"))
+        assert_that(self.pipe("include (", "a (\nb\n"), is_("a (\n"))
+
+    def test_filters_can_be_chained(self):
+        assert_that(self.pipe("section vlan | exclude twenty | count name", RUNNING_CONFIG),
+                    is_("Number of lines which match regexp = 1\n"))
+
+    def test_unknown_filters_are_refused(self):
+        assert_that(self.piping_processor.start_listening("include vlan | unknown"), is_(False))
+        assert_that(self.piping_processor.is_listening(), is_(False))
@@ -0,0 +1,31 @@
+import unittest
+
+from hamcrest import assert_that, is_, contains
+
+from fake_switches.command_processing.running_config import RunningConfig
+
+
+class RunningConfigTest(unittest.TestCase):
+    def test_size_counts_every_line_with_its_newline(self):
+        running_config = RunningConfig([["version 12.1", "!"], ["end", ""]])
+
+        assert_that(running_config.size(), is_(len("version 12.1\n!\nend\n\n")))
+
+    def test_fragments_are_rendered_once(self):
+        rendered = []
+
+        def fragments():
+            for i in range(3):
+                rendered.append(i)
+                yield ["vlan {}".format(i)]
+
+        running_config = RunningConfig(fragments())
+        running_config.size()
+
+        assert_that("".join(running_config.chunks()), is_("vlan 0\nvlan 1\nvlan 2\n"))
+        assert_that(rendered, contains(0, 1, 2))
+
+    def test_chunks_group_whole_fragments(self):
+        running_config = RunningConfig([["a" * 5], ["b" * 5], ["c" * 5]])
+
+        assert_that(list(running_config.chunks(chunk_size=10)), contains("aaaaa\nbbbbb\n", "ccccc\n"))
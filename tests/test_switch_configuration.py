@@ -0,0 +1,294 @@
+import unittest
+
+import copy
+
+from hamcrest import assert_that, is_, none, same_instance, contains, empty, not_
+
+from fake_switches.switch_configuration import SwitchConfiguration, Port, Vlan, VRF, Route, VlanPort, VRRP, \
+    CopyOnWriteConfiguration, SharedObjectModified
+
+
+class SwitchConfigurationTest(unittest.TestCase):
+    def setUp(self):
+        self.conf = SwitchConfiguration("127.0.0.1", ports=[Port("FastEthernet0/1"), Port("FastEthernet0/2")])
+
+    def test_get_port(self):
+        assert_that(self.conf.get_port("FastEthernet0/2"), is_(same_instance(self.conf.ports[1])))
+        assert_that(self.conf.get_port("FastEthernet0/3"), is_(none()))
+
+    def test_removed_port_is_no_longer_found(self):
+        port = self.conf.get_port("FastEthernet0/1")
+        self.conf.remove_port(port)
+
+        assert_that(self.conf.get_port("FastEthernet0/1"), is_(none()))
+
+    def test_get_vlan_follows_number_and_name_changes(self):
+        vlan = Vlan(1000, "old-name")
+        self.conf.add_vlan(vlan)
+
+        vlan.number = 2000
+        vlan.name = "new-name"
+
+        assert_that(self.conf.get_vlan(1000), is_(none()))
+        assert_that(self.conf.get_vlan_by_name("old-name"), is_(none()))
+        assert_that(self.conf.get_vlan(2000), is_(same_instance(vlan)))
+        assert_that(self.conf.get_vlan_by_name("new-name"), is_(same_instance(vlan)))
+
+    def test_get_vlan_returns_the_first_added_on_duplicates(self):
+        first = Vlan(name="first")
+        second = Vlan(name="second")
+        self.conf.add_vlan(first)
+        self.conf.add_vlan(second)
+
+        assert_that(self.conf.get_vlan(None), is_(same_instance(first)))
+        self.conf.remove_vlan(first)
+        assert_that(self.conf.get_vlan(None), is_(same_instance(second)))
+
+    def test_vlans_not_added_are_not_indexed(self):
+        vlan = Vlan(1000, switch_configuration=self.conf)
+        vlan.number = 2000
+
+        assert_that(self.conf.get_vlan(2000), is_(none()))
+
+    def test_vrfs(self):
+        assert_that(self.conf.get_vrf("DEFAULT-LAN").name, is_("DEFAULT-LAN"))
+
+        vrf = VRF("MY-VRF")
+        self.conf.add_vrf(vrf)
+        self.conf.add_vrf(VRF("MY-VRF"))
+        assert_that(self.conf.get_vrf("MY-VRF"), is_(same_instance(vrf)))
+        assert_that(len(self.conf.vrfs), is_(2))
+
+        self.conf.remove_vrf("MY-VRF")
+        assert_that(self.conf.get_vrf("MY-VRF"), is_(none()))
+
+    def test_remove_static_route(self):
+        self.conf.add_static_route(Route("10.0.0.0", "255.255.255.0", "1.1.1.1"))
+        self.conf.add_static_route(Route("10.0.1.0", "255.255.255.0", "1.1.1.1"))
+
+        self.conf.remove_static_route("10.0.0.0", "255.255.255.0")
+
+        assert_that(len(self.conf.static_routes), is_(1))
+        with self.assertRaises(StopIteration):
+            self.conf.remove_static_route("10.0.0.0", "255.255.255.0")
+
+    def test_indexes_work_with_objects_overrides(self):
+        class MyVlan(Vlan):
+            pass
+
+        conf = SwitchConfiguration("127.0.0.1", objects_overrides={"Vlan": MyVlan})
+        vlan = conf.new("Vlan", 10)
+        conf.add_vlan(vlan)
+        vlan.number = 11
+
+        assert_that(conf.get_vlan(11), is_(same_instance(vlan)))
+
+    def test_get_port_by_partial_name(self):
+        conf = SwitchConfiguration("127.0.0.1", ports=[Port("FastEthernet0/11"), Port("FastEthernet0/1"),
+                                                       Port("GigabitEthernet0/2"), Port("ethernet 1/g1")])
+
+        assert_that(conf.get_port_by_partial_name("fa0/1").name, is_("FastEthernet0/1"))
+        assert_that(conf.get_port_by_partial_name("FastEthernet 0/11").name, is_("FastEthernet0/11"))
+        assert_that(conf.get_port_by_partial_name("gi0/2").name, is_("GigabitEthernet0/2"))
+        assert_that(conf.get_port_by_partial_name("ethernet 1/g1").name, is_("ethernet 1/g1"))
+        assert_that(conf.get_port_by_partial_name("fa1").name, is_("FastEthernet0/11"))
+        assert_that(conf.get_port_by_partial_name("gi0/1"), is_(none()))
+
+    def test_get_port_by_partial_name_follows_add_and_remove(self):
+        port = self.conf.get_port("FastEthernet0/1")
+        self.conf.remove_port(port)
+        assert_that(self.conf.get_port_by_partial_name("fa0/1"), is_(none()))
+
+        self.conf.add_port(port)
+        assert_that(self.conf.get_port_by_partial_name("fa0/1"), is_(same_instance(port)))
+
+    def test_vlan_members_follow_port_changes(self):
+        port1, port2 = self.conf.ports
+        port2.access_vlan = 10
+        port1.access_vlan = 10
+
+        assert_that(self.conf.get_vlan_members(("access", 10)), contains(port1, port2))
+
+        port1.access_vlan = None
+        assert_that(self.conf.get_vlan_members(("access", 10)), contains(port2))
+        assert_that(self.conf.get_vlan_members(("access", None)), contains(port1))
+
+    def test_vlan_members_follow_trunk_vlans_mutations(self):
+        port1, port2 = self.conf.ports
+        port1.trunk_native_vlan = 1
+        port1.trunk_vlans = [10, 20]
+        port1.trunk_vlans.append(30)
+        port1.trunk_vlans += [40]
+        port1.trunk_vlans.remove(20)
+        port2.trunk_vlans = [20, 30]
+
+        assert_that(self.conf.get_vlan_members(("tagged", 20)), contains(port2))
+        assert_that(self.conf.get_vlan_members(("tagged", 30)), contains(port1, port2))
+        assert_that(self.conf.get_vlan_members(("tagged", 40), ("native", 1)), contains(port1))
+
+        port1.trunk_vlans = None
+        assert_that(self.conf.get_vlan_members(("tagged", 10)), is_(empty()))
+
+    def test_vlan_members_follow_add_and_remove_port(self):
+        port = Port("FastEthernet0/3")
+        port.access_vlan = 10
+        self.conf.add_port(port)
+        assert_that(self.conf.get_vlan_members(("access", 10)), contains(port))
+
+        self.conf.remove_port(port)
+        assert_that(self.conf.get_vlan_members(("access", 10)), is_(empty()))
+
+    def test_vlan_members_survive_deepcopy(self):
+        self.conf.ports[0].trunk_vlans = [10]
+
+        conf_copy = copy.deepcopy(self.conf)
+        conf_copy.ports[0].trunk_vlans.append(20)
+
+        assert_that(conf_copy.get_vlan_members(("tagged", 20)), contains(conf_copy.ports[0]))
+        assert_that(self.conf.get_vlan_members(("tagged", 20)), is_(empty()))
+        assert_that(self.conf.ports[0].trunk_vlans, is_([10]))
+
+    def test_deepcopy_keeps_slotted_attributes(self):
+        port = VlanPort(1000, "vlan1000")
+        port.vrrps.append(VRRP(1))
+        port.access_group_in = "IN"
+
+        port_copy = copy.deepcopy(port)
+
+        assert_that(port_copy.name, is_("vlan1000"))
+        assert_that(port_copy.access_group_in, is_("IN"))
+        assert_that(port_copy.vrrps[0].group_id, is_(1))
+        assert_that(port_copy.vrrps[0], is_(not_(same_instance(port.vrrps[0]))))
+
+    def test_overridden_objects_can_add_attributes(self):
+        class MyPort(Port):
+            def reset(self):
+                super(MyPort, self).reset()
+                self.link_name = None
+
+        conf = SwitchConfiguration("127.0.0.1", objects_overrides={"Port": MyPort})
+        port = conf.new("Port", "FastEthernet0/1")
+        port.link_name = "server1"
+
+        assert_that(copy.deepcopy(port).link_name, is_("server1"))
+
+    def test_journal_records_additions_and_removals(self):
+        changes = []
+        self.conf.subscribe(changes.append)
+        vlan = Vlan(10)
+
+        self.conf.add_vlan(vlan)
+        self.conf.remove_vlan(vlan)
+
+        assert_that([(c.action, c.target) for c in changes], contains(("added", vlan), ("removed", vlan)))
+        assert_that(changes[-1].version, is_(self.conf.version))
+
+    def test_journal_records_attribute_and_container_changes(self):
+        changes = []
+        self.conf.subscribe(changes.append)
+        port = self.conf.ports[0]
+        vlan_port = self.conf.new("VlanPort", 10, "vlan10")
+        self.conf.add_port(vlan_port)
+        vrrp = self.conf.new("VRRP", 1)
+        vlan_port.vrrps.append(vrrp)
+
+        port.description = "hello"
+        port.vendor_specific["key"] = "value"
+        port.trunk_vlans = [10]
+        port.trunk_vlans.append(20)
+        vrrp.ip_addresses = []
+        vrrp.ip_addresses.append("1.1.1.1")
+
+        assert_that([(c.target, c.attribute) for c in changes if c.action == "changed"], contains(
+            (vlan_port, "vrrps"),
+            (port, "description"),
+            (port, "vendor_specific"),
+            (port, "trunk_vlans"),
+            (port, "trunk_vlans"),
+            (vrrp, "ip_addresses"),
+            (vrrp, "ip_addresses"),
+        ))
+
+    def test_unsubscribe(self):
+        changes = []
+        self.conf.subscribe(changes.append)
+        self.conf.unsubscribe(changes.append)
+
+        self.conf.name = "my-switch"
+
+        assert_that(changes, is_(empty()))
+
+    def test_deepcopy_starts_a_new_journal(self):
+        changes = []
+        self.conf.subscribe(changes.append)
+
+        conf_copy = copy.deepcopy(self.conf)
+        conf_copy.ports[0].description = "hello"
+        conf_copy.ports[0].ip_helpers.append("1.1.1.1")
+
+        assert_that(changes, is_(empty()))
+        assert_that(conf_copy.version, is_(self.conf.version + 2))
+
+
+class CopyOnWriteConfigurationTest(unittest.TestCase):
+    def setUp(self):
+        self.base = SwitchConfiguration("127.0.0.1", name="my-switch",
+                                        ports=[Port("FastEthernet0/1"), Port("FastEthernet0/2")],
+                                        vlans=[Vlan(10, "ten")])
+        self.candidate = CopyOnWriteConfiguration(self.base)
+
+    def test_objects_are_shared_until_looked_up(self):
+        assert_that(self.candidate.name, is_("my-switch"))
+        assert_that(self.candidate.ports[0], is_(same_instance(self.base.ports[0])))
+
+        port = self.candidate.get_port("FastEthernet0/1")
+        port.description = "modified"
+        port.trunk_vlans = [10]
+
+        assert_that(port, is_(not_(same_instance(self.base.ports[0]))))
+        assert_that(self.candidate.ports[0], is_(same_instance(port)))
+        assert_that(self.candidate.ports[1], is_(same_instance(self.base.ports[1])))
+        assert_that(self.base.ports[0].description, is_(none()))
+        assert_that(self.candidate.get_vlan_members(("tagged", 10)), contains(port))
+        assert_that(self.base.get_vlan_members(("tagged", 10)), is_(empty()))
+
+    def test_structural_changes_do_not_affect_the_base(self):
+        self.candidate.remove_vlan(self.candidate.get_vlan(10))
+        self.candidate.add_port(Port("FastEthernet0/3"))
+
+        assert_that(self.candidate.get_vlan(10), is_(none()))
+        assert_that(self.base.get_vlan(10).name, is_("ten"))
+        assert_that(self.base.get_port("FastEthernet0/3"), is_(none()))
+
+    def test_clone_brings_an_object_back_into_the_base(self):
+        port = Port("FastEthernet0/3")
+        self.candidate.add_port(port)
+
+        port_copy = self.base.clone(port)
+        self.base.add_port(port_copy)
+
+        assert_that(port_copy, is_(not_(same_instance(port))))
+        assert_that(port_copy.switch_configuration, is_(same_instance(self.base)))
+
+    def test_objects_created_for_the_candidate_are_not_journaled_on_the_base(self):
+        version = self.base.version
+
+        vrrp = self.candidate.new("VRRP", 1)
+        vrrp.priority = 110
+        vlan = self.candidate.new("Vlan", name="twenty")
+        vlan.number = 20
+        self.candidate.add_vlan(vlan)
+
+        assert_that(vrrp.switch_configuration, is_(same_instance(self.candidate)))
+        assert_that(self.base.version, is_(version))
+        assert_that(self.base.get_vlan(20), is_(none()))
+
+    def test_guarding_base_catches_changes_to_shared_objects(self):
+        with self.candidate.guarding_base():
+            self.candidate.get_port("FastEthernet0/1").description = "private copy"
+            self.candidate.add_vlan(self.candidate.new("Vlan", 20))
+
+            with self.assertRaises(SharedObjectModified):
+                self.candidate.ports[1].description = "shared"
+
+        self.base.ports[1].description = "outside of the block"
@@ -0,0 +1,139 @@
+import logging
+import unittest
+
+from hamcrest import assert_that, is_, contains, contains_string, has_length, same_instance, none, not_
+from twisted.internet import defer
+
+from fake_switches.clock import VirtualClock
+from fake_switches.switch_core import CommandStillRunning
+from fake_switches.switch_factory import SwitchFactory
+from fake_switches.terminal import BufferingTerminalController
+
+
+class SwitchCoreExecuteTest(unittest.TestCase):
+    def setUp(self):
+        self.factory = SwitchFactory()
+
+    def test_returns_the_output_of_each_line_without_prompts(self):
+        switch = self.factory.get("cisco_generic", hostname="my_switch")
+
+        outputs = switch.execute(["enable", "root", "configure terminal", "vlan 10", "name ten", "exit", "exit",
+                                  "show running-config vlan 10"])
+
+        assert_that(outputs, contains(
+            "Password: ",
+            "",
+            "Enter configuration commands, one per line.  End with CNTL/Z.\n",
+            "",
+            "",
+            "",
+            "",
+            "Building configuration...\n\nCurrent configuration:\n!\nvlan 10\n name ten\nend\n\n"))
+        assert_that(switch.switch_configuration.get_vlan(10).name, is_("ten"))
+
+    def test_lines_answer_keystroke_prompts(self):
+        switch = self.factory.get("dell_generic", hostname="my_switch")
+
+        outputs = switch.execute(["enable", "root", "copy running-config startup-config", "y"])
+
+        assert_that(outputs[2], contains_string("Are you sure you want to save? (y/n) "))
+        assert_that(outputs[3], is_("\n\nConfiguration Saved!\n"))
+
+    def test_delayed_commands_advance_the_virtual_clock(self):
+        clock = VirtualClock()
+        switch = self.factory.get("arista_generic", hostname="my_arista", commit_delay=30, clock=clock)
+
+        outputs = switch.execute(["enable", "write memory", "show vlan 1"])
+
+        assert_that(outputs[1], is_("Copy completed successfully.\n"))
+        assert_that(outputs[2], contains_string("default"))
+        assert_that(clock.seconds(), is_(30))
+
+    def test_delayed_commands_require_a_virtual_clock(self):
+        switch = self.factory.get("brocade_generic", hostname="my_switch", commit_delay=30)
+
+        with self.assertRaises(CommandStillRunning):
+            switch.execute(["enable", "root", "write memory"])
+
+    def test_failed_commits_are_reported_before_the_prompt(self):
+        switch = self.factory.get("cisco_generic", hostname="my_switch")
+        commit = defer.Deferred()
+        switch.switch_configuration.commit = lambda: commit
+        terminal_controller = BufferingTerminalController()
+        session = switch.launch("api", terminal_controller)
+        session.receive("enable")
+        session.receive("root")
+        terminal_controller.pop()
+
+        session.receive("write memory")
+        assert_that(terminal_controller.pop(), is_("Building configuration...\n"))
+
+        commit.errback(IOError("disk full"))
+        assert_that(terminal_controller.pop(), is_("% Error: disk full\nmy_switch#"))
+        assert_that(session.command_in_progress(), is_(none()))
+
+    def test_stops_when_the_session_ends(self):
+        switch = self.factory.get("cisco_generic", hostname="my_switch")
+
+        assert_that(switch.execute(["enable", "root", "exit", "show vlan"]), has_length(3))
+
+
+class ProcessorStackPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.factory = SwitchFactory()
+
+    def test_closed_sessions_hand_their_reset_processors_to_the_next_one(self):
+        switch = self.factory.get("cisco_generic", hostname="my_switch")
+        session = switch.launch("api", BufferingTerminalController())
+        session.receive("enable")
+        session.receive("root")
+        session.receive("configure terminal")
+        session.close()
+
+        terminal_controller = BufferingTerminalController()
+        next_session = switch.launch("api", terminal_controller)
+
+        assert_that(next_session.command_processor, is_(same_instance(session.command_processor)))
+        assert_that(next_session.command_processor.sub_processor, is_(none()))
+        assert_that(terminal_controller.pop(), is_("my_switch>"))
+
+    def test_processors_with_a_command_in_progress_are_not_reused(self):
+        switch = self.factory.get("brocade_generic", hostname="my_switch", commit_delay=30, clock=VirtualClock())
+        session = switch.launch("api", BufferingTerminalController())
+        session.receive("enable")
+        session.receive("root")
+        session.receive("write memory")
+        session.close()
+
+        next_session = switch.launch("api", BufferingTerminalController())
+
+        assert_that(next_session.command_processor, is_(not_(same_instance(session.command_processor))))
+
+
+class ConnectionLoggerTest(unittest.TestCase):
+    def test_connections_share_the_switch_logger_and_records_identify_them(self):
+        switch = SwitchFactory().get("cisco_generic", hostname="my_switch", auto_enabled=True)
+        switch_logger = logging.getLogger("fake_switches.cisco.my_switch")
+        records = []
+        handler = logging.Handler(level=logging.DEBUG)
+        handler.emit = records.append
+        switch_logger.addHandler(handler)
+        self.addCleanup(switch_logger.removeHandler, handler)
+        switch_logger.setLevel(logging.DEBUG)
+        self.addCleanup(switch_logger.setLevel, logging.NOTSET)
+
+        first = switch.launch("ssh", BufferingTerminalController())
+        second = switch.launch("telnet", BufferingTerminalController())
+        second.receive("show vlan")
+
+        assert_that(first.command_processor.logger.logger, is_(same_instance(switch_logger)))
+        assert_that(second.command_processor.logger.logger, is_(same_instance(switch_logger)))
+        assert_that([(r.connection_id, r.protocol) for r in records], contains(
+            (1, "ssh"), (2, "telnet"), (2, "telnet"), (2, "telnet"), (2, "telnet")))
+        assert_that(records[2].getMessage(), is_("[2.telnet] received: show vlan"))
+
+    def test_switches_can_have_their_own_log_level(self):
+        switch = SwitchFactory().get("cisco_generic", hostname="quiet_switch", log_level="WARNING")
+        switch.launch("ssh", BufferingTerminalController())
+
+        assert_that(logging.getLogger("fake_switches.cisco.quiet_switch").level, is_(logging.WARNING))
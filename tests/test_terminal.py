@@ -0,0 +1,145 @@
+import unittest
+
+from hamcrest import assert_that, is_, contains
+from twisted.test.proto_helpers import StringTransport
+
+from fake_switches.switch_factory import SwitchFactory
+from fake_switches.terminal import CrlfTranslator, lf_to_crlf, CoalescingTerminalController
+from fake_switches.terminal.ssh import SwitchSSHShell, SwitchSSHServerProtocol
+from fake_switches.terminal.telnet import SwitchTelnetShell
+
+
+class CrlfTranslatorTest(unittest.TestCase):
+    def test_lone_line_feeds_are_translated(self):
+        assert_that(lf_to_crlf("\n\na\r\nb\n"), is_("\r\n\r\na\r\nb\r\n"))
+        assert_that(CrlfTranslator().translate("\n\na\r\nb\n"), is_("\r\n\r\na\r\nb\r\n"))
+
+    def test_bytes_are_translated_as_bytes(self):
+        assert_that(CrlfTranslator().translate(b"a\nb\r\n"), is_(b"a\r\nb\r\n"))
+
+    def test_a_crlf_split_between_writes_is_kept(self):
+        translator = CrlfTranslator()
+
+        assert_that(translator.translate("a\r"), is_("a\r"))
+        assert_that(translator.translate("\nb\n"), is_("\nb\r\n"))
+        assert_that(translator.translate("\n"), is_("\r\n"))
+
+
+class RecordingTerminalController(CoalescingTerminalController):
+    def __init__(self):
+        super(RecordingTerminalController, self).__init__()
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data)
+
+    def add_any_key_handler(self, callback, *params):
+        self.flush()
+
+    def remove_any_key_handler(self):
+        pass
+
+
+class CoalescingTerminalControllerTest(unittest.TestCase):
+    def test_writes_are_sent_when_flushed_or_past_the_flush_size(self):
+        terminal_controller = RecordingTerminalController()
+        terminal_controller.flush_size = 4
+
+        terminal_controller.write("a")
+        terminal_controller.write_bytes(b"b")
+        terminal_controller.flush()
+        terminal_controller.flush()
+        terminal_controller.write("cdef")
+
+        assert_that(terminal_controller.sent, contains(b"ab", b"cdef"))
+
+    def test_a_command_output_is_sent_at_once_with_its_prompt(self):
+        switch = SwitchFactory().get("cisco_generic", hostname="my_switch", auto_enabled=True)
+        terminal_controller = RecordingTerminalController()
+        session = switch.launch("ssh", terminal_controller)
+
+        session.receive("show vlan")
+
+        assert_that(terminal_controller.sent[0], is_(b"my_switch#"))
+        assert_that(len(terminal_controller.sent), is_(2))
+        assert_that(terminal_controller.sent[1].endswith(b"my_switch#"), is_(True))
+
+
+class RecordingTransport(StringTransport):
+    def __init__(self):
+        StringTransport.__init__(self)
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(data)
+        StringTransport.write(self, data)
+
+
+class BatchedInputTest(unittest.TestCase):
+    def setUp(self):
+        self.switch = SwitchFactory().get("cisco_generic", hostname="my_switch", auto_enabled=True)
+        self.transport = RecordingTransport()
+
+    def test_telnet_handles_a_pasted_block_in_a_single_write(self):
+        shell = SwitchTelnetShell(self.switch)
+        shell.makeConnection(self.transport)
+        shell.applicationDataReceived(b"root\nroot\n")
+        self.transport.clear()
+        del self.transport.writes[:]
+
+        shell.applicationDataReceived(b"conf t\nvlan 123\nname one\nexit\nexit\n")
+
+        assert_that(len(self.transport.writes), is_(1))
+        assert_that(self.transport.value(), is_(
+            b"conf t\r\n"
+            b"Enter configuration commands, one per line.  End with CNTL/Z.\r\n"
+            b"my_switch(config)#vlan 123\r\n"
+            b"my_switch(config-vlan)#name one\r\n"
+            b"my_switch(config-vlan)#exit\r\n"
+            b"my_switch(config)#exit\r\n"
+            b"my_switch#"))
+        assert_that(self.switch.switch_configuration.get_vlan(123).name, is_("one"))
+
+    def test_telnet_keystroke_wait_takes_the_next_key_of_the_block(self):
+        shell = SwitchTelnetShell(self.switch)
+        shell.makeConnection(self.transport)
+        shell.applicationDataReceived(b"root\nroot\n")
+        keys = []
+        shell.session.command_processor.on_keystroke(keys.append)
+
+        shell.applicationDataReceived(b"qshow\n")
+
+        assert_that(keys, contains("q"))
+        assert_that(b"#show\r\n" in self.transport.value(), is_(True))
+
+    def test_telnet_keystroke_wait_discards_the_line_end_sent_with_the_key(self):
+        shell = SwitchTelnetShell(self.switch)
+        shell.makeConnection(self.transport)
+        shell.applicationDataReceived(b"root\nroot\n")
+        keys = []
+        shell.session.command_processor.on_keystroke(keys.append)
+        self.transport.clear()
+
+        shell.applicationDataReceived(b"y\r")
+
+        assert_that(keys, contains("y"))
+        assert_that(self.transport.value(), is_(b""))
+
+    def test_ssh_handles_a_pasted_block_in_a_single_write(self):
+        protocol = SwitchSSHServerProtocol(SwitchSSHShell, None, switch_core=self.switch)
+        protocol.makeConnection(self.transport)
+        self.transport.clear()
+        del self.transport.writes[:]
+
+        protocol.dataReceived(b"conf t\rvlan 123\rname one\rexit\rexit\r")
+
+        assert_that(len(self.transport.writes), is_(1))
+        assert_that(self.transport.value(), is_(
+            b"conf t\r\n"
+            b"Enter configuration commands, one per line.  End with CNTL/Z.\r\n"
+            b"my_switch(config)#vlan 123\r\n"
+            b"my_switch(config-vlan)#name one\r\n"
+            b"my_switch(config-vlan)#exit\r\n"
+            b"my_switch(config)#exit\r\n"
+            b"my_switch#"))
+        assert_that(protocol.terminalProtocol.historyLines, contains(b"conf t", b"vlan 123", b"name one", b"exit", b"exit"))
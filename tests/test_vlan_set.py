@@ -0,0 +1,71 @@
+import copy
+import unittest
+
+from hamcrest import assert_that, is_, contains, equal_to
+
+from fake_switches.vlan_set import VlanSet
+
+
+class VlanSetTest(unittest.TestCase):
+    def test_iterates_in_order_without_duplicates(self):
+        vlans = VlanSet([30, 10, 20, 10])
+
+        assert_that(list(vlans), contains(10, 20, 30))
+        assert_that(len(vlans), is_(3))
+
+    def test_membership(self):
+        vlans = VlanSet([1, 4094])
+
+        assert_that(1 in vlans, is_(True))
+        assert_that(4094 in vlans, is_(True))
+        assert_that(2 in vlans, is_(False))
+        assert_that("1" in vlans, is_(False))
+
+    def test_ranges(self):
+        vlans = VlanSet()
+        vlans.add_range(1, 4094)
+        vlans.remove_range(100, 199)
+
+        assert_that(len(vlans), is_(3994))
+        assert_that(vlans.to_range_string(), is_("1-99,200-4094"))
+
+    def test_rejects_numbers_outside_of_the_vlan_range(self):
+        vlans = VlanSet([4095])
+
+        for invalid in (-1, 4096, 10 ** 9):
+            with self.assertRaises(ValueError):
+                vlans.add(invalid)
+            assert_that(invalid in vlans, is_(False))
+        with self.assertRaises(ValueError):
+            vlans.add_range(4000, 10 ** 9)
+        with self.assertRaises(ValueError):
+            VlanSet([1, 5000])
+        assert_that(list(vlans), contains(4095))
+
+    def test_to_range_string(self):
+        vlans = VlanSet([1, 2, 5, 7, 8, 9])
+
+        assert_that(vlans.to_range_string(), is_("1-2,5,7-9"))
+        assert_that(vlans.to_range_string(min_range_length=3), is_("1,2,5,7-9"))
+        assert_that(VlanSet().to_range_string(), is_(""))
+
+    def test_behaves_like_a_list(self):
+        vlans = VlanSet([10])
+        vlans.append(5)
+        vlans += [20, 21]
+        vlans.remove(21)
+
+        assert_that(vlans, equal_to([5, 10, 20]))
+        assert_that(vlans[0], is_(5))
+        assert_that(vlans.index(20), is_(2))
+        assert_that(vlans + [1], is_([5, 10, 20, 1]))
+        assert_that(sorted(set(vlans + [1])), is_([1, 5, 10, 20]))
+        with self.assertRaises(ValueError):
+            vlans.remove(21)
+
+    def test_copies_are_independent(self):
+        vlans = VlanSet([10])
+        vlans_copy = copy.deepcopy(vlans)
+        vlans_copy.append(20)
+
+        assert_that(list(vlans), contains(10))
@@ -14,13 +14,15 @@
 
 import threading
 
+from fake_switches.clock import VirtualClock
 from fake_switches.switch_factory import SwitchFactory
 from fake_switches.transports.http_service import SwitchHttpService
 from fake_switches.transports.ssh_service import SwitchSshService
 from fake_switches.transports.telnet_service import SwitchTelnetService
 from tests.util import _juniper_ports_with_less_ae, _unique_port
 
-COMMIT_DELAY = 1
+COMMIT_DELAY = 60
+VIRTUAL_CLOCK = VirtualClock(auto_advance=True)
 
 TEST_SWITCHES = {
     "arista": {
@@ -108,7 +110,8 @@ TEST_SWITCHES = {
         "hostname": "my_arista",
         "ssh": _unique_port(),
         "extra": {
-            "commit_delay": COMMIT_DELAY
+            "commit_delay": COMMIT_DELAY,
+            "clock": VIRTUAL_CLOCK
         },
     },
     "commit-delayed-brocade": {
@@ -116,7 +119,8 @@ TEST_SWITCHES = {
         "hostname": "my_switch",
         "ssh": _unique_port(),
         "extra": {
-            "commit_delay": COMMIT_DELAY
+            "commit_delay": COMMIT_DELAY,
+            "clock": VIRTUAL_CLOCK
         },
     },
     "commit-delayed-cisco": {
@@ -124,7 +128,8 @@ TEST_SWITCHES = {
         "hostname": "my_switch",
         "ssh": _unique_port(),
         "extra": {
-            "commit_delay": COMMIT_DELAY
+            "commit_delay": COMMIT_DELAY,
+            "clock": VIRTUAL_CLOCK
         },
     },
     "commit-delayed-dell": {
@@ -132,7 +137,8 @@ TEST_SWITCHES = {
         "hostname": "my_switch",
         "ssh": _unique_port(),
         "extra": {
-            "commit_delay": COMMIT_DELAY
+            "commit_delay": COMMIT_DELAY,
+            "clock": VIRTUAL_CLOCK
         },
     },
     "commit-delayed-dell10g": {
@@ -140,7 +146,8 @@ TEST_SWITCHES = {
         "hostname": "my_switch",
         "ssh": _unique_port(),
         "extra": {
-            "commit_delay": COMMIT_DELAY
+            "commit_delay": COMMIT_DELAY,
+            "clock": VIRTUAL_CLOCK
         },
     },
     "commit-delayed-juniper": {
@@ -148,7 +155,8 @@ TEST_SWITCHES = {
         "hostname": "ju_ju_ju_juniper",
         "ssh": _unique_port(),
         "extra": {
-            "commit_delay": COMMIT_DELAY
+            "commit_delay": COMMIT_DELAY,
+            "clock": VIRTUAL_CLOCK
         },
     }
 }